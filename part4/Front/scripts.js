@@ -1,4 +1,4 @@
-document.addEventListener('DOMContentLoaded', () => {
+document.addEventListener('DOMContentLoaded', async () => {
     const loginForm = document.getElementById('login-form');
 
     if (loginForm) {
@@ -38,7 +38,8 @@ document.addEventListener('DOMContentLoaded', () => {
     if (document.body.classList.contains('place-detail-page')) {
         const placeId = getPlaceIdFromURL();
         console.log('PlaceId:', placeId);
-        const token = getCookie('access_token');
+        // Jeton d'accès valide, renouvelé si besoin avec le jeton de rafraîchissement
+        const token = await getAccessToken();
         console.log('Token JWT trouvé :', token);
         console.log('ID du logement extrait de l’URL :', placeId);
 
@@ -54,7 +55,7 @@ document.addEventListener('DOMContentLoaded', () => {
     // Ecouteur d’événement du formulaire
     const reviewForm = document.getElementById('review-form');
     if (reviewForm) {
-        const token = getCookie('access_token');
+        const token = await getAccessToken();
 
     if (token) {
         reviewForm.addEventListener('submit', async (event) => {
@@ -63,6 +64,8 @@ document.addEventListener('DOMContentLoaded', () => {
             const textReview = document.getElementById('review').value;
             const note = document.getElementById('rating').value;
             const idPlace = getPlaceIdFromURL();
+            // Le jeton lu au chargement a pu expirer depuis (5 minutes)
+            const token = await getAccessToken();
 
             if (textReview.trim() === '' || note === '' || token === null || idPlace === null) {
                 displayMessage('Tous les champs doivent être remplis');
@@ -144,19 +147,16 @@ async function loginUser (email, password) {
         throw new Error('Réponse JSON invalide.');
     }
 
-    // Vérification de la présence du token
-    if (!data.access_token) {
+    // Vérification de la présence des tokens
+    if (!data.access_token || !data.refresh_token) {
         throw new Error('Token JWT manquant dans la réponse.');
     }
 
-    // Préparation du cookie JWT via fonction dédiée
-    const cookie = buildAuthCookie(data.access_token);
-
-    // Stockage du cookie dans le navigateur
-    document.cookie = cookie;
+    // Stockage des cookies (accès et rafraîchissement) dans le navigateur
+    storeAuthTokens(data);
 
     // journalisation du cookie pour debug
-    console.log('Connexion réussie. JWT stocké dans un cookie.');
+    console.log('Connexion réussie. JWT stockés dans des cookies.');
     console.log('Cookies : ', document.cookie);
 
     // Redirection vers la page principale
@@ -168,14 +168,15 @@ async function loginUser (email, password) {
  * Génère une chaîne de cookie JWT bien formée.
  * @param {string} token - Le JWT à stocker
  * @param {number} maxAgeSeconds - Durée de vie en secondes (défaut : 3600)
+ * @param {string} name - Nom du cookie (défaut : 'access_token')
  * @returns {string} - La chaîne du cookie prête à être assignée à document.cookie
  */
-function buildAuthCookie(token, maxAgeSeconds = 3600) {
+function buildAuthCookie(token, maxAgeSeconds = 3600, name = 'access_token') {
     const encodedToken = encodeURIComponent(token);
     const expiry = new Date(Date.now() + maxAgeSeconds * 1000).toUTCString();
     const isLocalhost = ['localhost', '127.0.0.1'].includes(window.location.hostname);
 
-    let cookie = `access_token=${encodedToken}; path=/; expires=${expiry}; SameSite=Lax`;
+    let cookie = `${name}=${encodedToken}; path=/; expires=${expiry}; SameSite=Lax`;
     if (!isLocalhost) {
         cookie += '; Secure';
     }
@@ -242,9 +243,91 @@ function getCookie(name) {
     return null;
 }
 
+/**
+ * Stocke les jetons renvoyés par /auth/login ou /auth/refresh, chacun dans
+ * un cookie qui expire en même temps que lui.
+ * @param {{access_token: string, refresh_token: string}} data - Réponse de l'API
+ */
+function storeAuthTokens(data) {
+    const now = Date.now() / 1000;
+    for (const name of ['access_token', 'refresh_token']) {
+        const payload = parseJwt(data[name]);
+        const maxAge = payload && payload.exp ? Math.max(0, payload.exp - now) : 3600;
+        document.cookie = buildAuthCookie(data[name], maxAge, name);
+    }
+}
+
+/**
+ * Supprime les cookies des jetons (déconnexion, session expirée ou fermée).
+ */
+function clearAuthCookies() {
+    for (const name of ['access_token', 'refresh_token']) {
+        document.cookie = `${name}=; path=/; expires=Thu, 01 Jan 1970 00:00:00 UTC; SameSite=Lax`;
+    }
+}
+
+// Renouvellement en cours, partagé par les appels simultanés de la page
+let refreshInFlight = null;
+
+/**
+ * Renouvelle les jetons via /auth/refresh avec le jeton de rafraîchissement.
+ * L'API change ce jeton à chaque appel et ferme la session si un ancien
+ * est présenté à nouveau : un seul renouvellement à la fois, y compris
+ * entre onglets (Web Locks), et un onglet qui attendait réutilise les
+ * jetons obtenus par un autre.
+ * @returns {Promise<string|null>} - Le nouveau jeton d'accès, ou null si la session est terminée
+ */
+function refreshAccessToken() {
+    if (!refreshInFlight) {
+        const startedWith = getCookie('refresh_token');
+        const run = async () => {
+            const current = getCookie('refresh_token');
+            if (!current) return null;
+            if (current !== startedWith && getCookie('access_token')) {
+                return getCookie('access_token'); // renouvelé par un autre onglet
+            }
+            try {
+                const response = await fetch('http://localhost:5000/api/v1/auth/refresh', {
+                    method: 'POST',
+                    headers: { 'Authorization': `Bearer ${current}` }
+                });
+                if (!response.ok) {
+                    clearAuthCookies();
+                    return null;
+                }
+                const data = await response.json();
+                storeAuthTokens(data);
+                return data.access_token;
+            } catch (error) {
+                console.warn('Renouvellement du jeton impossible :', error);
+                return null;
+            }
+        };
+        const locked = navigator.locks
+            ? navigator.locks.request('hbnb-token-refresh', run)
+            : run();
+        refreshInFlight = locked.finally(() => { refreshInFlight = null; });
+    }
+    return refreshInFlight;
+}
+
+/**
+ * Retourne un jeton d'accès utilisable : celui du cookie s'il n'expire pas
+ * dans les 30 secondes, sinon un jeton renouvelé (sans mot de passe).
+ * @returns {Promise<string|null>} - Le JWT d'accès, ou null si l'utilisateur n'est pas connecté
+ */
+async function getAccessToken() {
+    const token = getCookie('access_token');
+    const payload = token ? parseJwt(token) : null;
+    if (payload && payload.exp - 30 > Date.now() / 1000) {
+        return token;
+    }
+    return getCookie('refresh_token') ? refreshAccessToken() : null;
+}
+
 // Vérification du token
-function checkAuthentication() {
-  const token = getCookie('access_token');
+async function checkAuthentication() {
+  const token = await getAccessToken();
   const loginLink = document.getElementById('login-link');
   const logoutButton = document.getElementById('logout-button');
 
@@ -271,15 +354,37 @@ function checkAuthentication() {
 }
 
 
+// Nombre de logements demandés par page à l'API
+const PLACES_PAGE_SIZE = 12;
+
+// Prix maximal sélectionné dans le filtre ('all' : aucun filtre)
+let currentMaxPrice = 'all';
+
 /**
- * Récupère les données des logements via l'API.
+ * Récupère une page de logements via l'API (pagination par curseur).
  * @param {string} token - Le JWT à inclure dans la requête
- * Cette fonction appelle ensuite displayPlaces(data) pour afficher les logements.
+ * @param {string|null} after - Curseur renvoyé par la page précédente (null pour la première page)
+ * Cette fonction appelle ensuite displayPlaces(data) pour afficher les logements,
+ * puis met à jour le bouton "Voir plus" avec le curseur de la page suivante.
  */
-async function fetchPlaces(token) {
+async function fetchPlaces(token, after = null) {
     try {
+        const url = new URL('http://localhost:5000/api/v1/places/');
+        url.searchParams.set('limit', PLACES_PAGE_SIZE);
+        // Les cartes n'affichent que ces champs : ni propriétaire, ni
+        // commodités, ni avis ne sont chargés côté serveur
+        url.searchParams.set('fields', 'id,title,description,price,image_url');
+        // Filtre de prix appliqué côté serveur, avec un tri par prix croissant
+        if (currentMaxPrice !== 'all') {
+            url.searchParams.set('max_price', currentMaxPrice);
+            url.searchParams.set('sort', 'price');
+        }
+        if (after) {
+            url.searchParams.set('after', after);
+        }
+
         // Appel API pour Places
-        const response = await fetch('http://localhost:5000/api/v1/places/', {
+        const response = await fetch(url, {
             method: 'GET',
             headers: token
                 ? {
@@ -317,8 +422,10 @@ async function fetchPlaces(token) {
             displayMessage('Erreur : données de logements invalides.');
             throw new Error('La clé "places" est absente ou incorrecte dans la réponse.');
         }
-        
-        displayPlaces(data.places);
+
+        // La première page remplace la liste, les suivantes s'y ajoutent
+        displayPlaces(data.places, Boolean(after));
+        updateLoadMoreButton(data.next_cursor);
 
     } catch (error) {
         console.error('Erreur lors de la récupération des logements : ', error);
@@ -326,17 +433,39 @@ async function fetchPlaces(token) {
     }    
 }
 
+/**
+ * Affiche ou masque le bouton "Voir plus" selon qu'il reste des pages.
+ * @param {string|null} nextCursor - Curseur de la page suivante (null si dernière page)
+ */
+function updateLoadMoreButton(nextCursor) {
+    const loadMoreButton = document.getElementById('load-more');
+    if (!loadMoreButton) return;
+
+    if (!nextCursor) {
+        loadMoreButton.style.display = 'none';
+        loadMoreButton.onclick = null;
+        return;
+    }
+
+    loadMoreButton.style.display = 'inline-block';
+    // Jeton relu au clic : celui de la première page a pu expirer
+    loadMoreButton.onclick = async () => fetchPlaces(await getAccessToken(), nextCursor);
+}
+
 /**
  * Affiche dynamiquement les logements dans la section #places-list
  * @param {Array} places - Liste des logements à afficher
+ * @param {boolean} append - true pour ajouter à la liste existante (page suivante)
  */
-function displayPlaces(places) {
+function displayPlaces(places, append = false) {
     // Sélectionner l'élément #places-list
     const placesList = document.getElementById('places-list');
     if (!placesList) return;
 
     // Vider le contenu existant pour éviter les doublons
-    placesList.textContent = '';
+    if (!append) {
+        placesList.textContent = '';
+    }
 
     // Vérifier que places est bien un tableau
     if (!Array.isArray(places)) {
@@ -416,26 +545,14 @@ function populatePriceFilter() {
 }
 
 /**
- * Filtre les logements affichés selon le prix maximal sélectionné.
+ * Filtre les logements selon le prix maximal sélectionné.
+ * Le filtre est appliqué par l'API (?max_price=) : la liste est rechargée
+ * depuis la première page avec uniquement les logements correspondants.
  * @param {string} maxPrice - Valeur sélectionnée dans le menu (ex: '10', '50', 'all')
  */
-function filterPlacesByPrice(maxPrice) {
-  const cards = document.querySelectorAll('.place-card');
-
-  cards.forEach(card => {
-    const priceText = card.querySelector('p').textContent;
-    const match = priceText.match(/(\d+)/); // extrait le premier nombre (le prix)
-    
-    if (!match) return; // sécurité : ignore si aucun prix trouvé
-
-    const price = parseInt(match[1]);
-
-    if (maxPrice === 'all' || price <= parseInt(maxPrice)) {
-      card.style.display = 'flex';
-    } else {
-      card.style.display = 'none';
-    }
-  });
+async function filterPlacesByPrice(maxPrice) {
+  currentMaxPrice = maxPrice;
+  fetchPlaces(await getAccessToken());
 }
 
 /**
@@ -619,11 +736,26 @@ function displayPlaceDetails(place) {
         reviewTitle.textContent = 'Avis des utilisateurs';
         reviewsBlock.appendChild(reviewTitle);
 
-        // Affichage des avis
-        for (const review of place.reviews) {
-            const item = document.createElement('p');
-            item.textContent = `${review.user?.first_name || 'Auteur'} ${review.user?.last_name || ''} : ${review.text || 'Aucun avis'}`;
-            reviewsBlock.appendChild(item);
+        // Affichage des avis (seuls les plus récents sont inclus dans le détail)
+        appendReviews(reviewsBlock, place.reviews);
+
+        // Bouton "Voir plus d'avis" tant que l'API signale une page suivante
+        if (place.reviews_next_cursor) {
+            const moreButton = document.createElement('button');
+            moreButton.classList.add('details-button');
+            moreButton.textContent = 'Voir plus d’avis';
+            let nextCursor = place.reviews_next_cursor;
+
+            moreButton.addEventListener('click', async () => {
+                const page = await fetchPlaceReviews(await getAccessToken(), place.id, nextCursor);
+                if (!page) return;
+                appendReviews(reviewsBlock, page.reviews, moreButton);
+                nextCursor = page.next_cursor;
+                if (!nextCursor) {
+                    moreButton.remove();
+                }
+            });
+            reviewsBlock.appendChild(moreButton);
         }
 
         // Ajout du bloc des avis dans la nouvelle div
@@ -635,6 +767,48 @@ function displayPlaceDetails(place) {
     }
 }
 
+/**
+ * Ajoute des avis au bloc des avis.
+ * @param {HTMLElement} reviewsBlock - Le bloc des avis
+ * @param {Array} reviews - Les avis à afficher
+ * @param {HTMLElement|null} before - Élément avant lequel insérer (ex : bouton "Voir plus")
+ */
+function appendReviews(reviewsBlock, reviews, before = null) {
+    for (const review of reviews) {
+        const item = document.createElement('p');
+        item.textContent = `${review.user?.first_name || 'Auteur'} ${review.user?.last_name || ''} : ${review.text || 'Aucun avis'}`;
+        reviewsBlock.insertBefore(item, before);
+    }
+}
+
+
+/**
+ * Récupère la page suivante des avis d’un logement (pagination par curseur).
+ * @param {string} token - Le JWT pour l'autorisation
+ * @param {string} placeId - L'ID du logement
+ * @param {string} after - Curseur renvoyé par la page précédente
+ * @returns {Promise<Object|null>} - { reviews, next_cursor } ou null en cas d’erreur
+ */
+async function fetchPlaceReviews(token, placeId, after) {
+    try {
+        const url = new URL(`http://localhost:5000/api/v1/reviews/places/${placeId}/reviews`);
+        url.searchParams.set('after', after);
+
+        const response = await fetch(url, {
+            method: 'GET',
+            headers: token ? { 'Authorization': `Bearer ${token}` } : {}
+        });
+        if (!response.ok) {
+            throw new Error(`Erreur HTTP ${response.status}`);
+        }
+        return await response.json();
+    } catch (error) {
+        console.error('Erreur lors de la récupération des avis : ', error);
+        displayMessage('Erreur lors du chargement des avis');
+        return null;
+    }
+}
+
 /**
  * Envoie un avis utilisateur pour un logement donné à l’API.
  * @param {string} token - Le token JWT pour l’authentification
@@ -707,15 +881,28 @@ async function submitReview(token, placeId, reviewText, rating) {
 }
 
 /**
- * Déconnecte l'utilisateur en supprimant le cookie JWT
- * puis redirige vers la page de connexion.
+ * Déconnecte l'utilisateur : révoque le JWT côté serveur, supprime le
+ * cookie puis redirige vers la page de connexion.
  */
-function logoutUser() {
-    // Expire le cookie immédiatement
-    document.cookie = 'access_token=; path=/; expires=Thu, 01 Jan 1970 00:00:00 UTC; SameSite=Lax';
+async function logoutUser() {
+    // Révocation du jeton et fermeture de la session de rafraîchissement
+    const token = await getAccessToken();
+    if (token) {
+        try {
+            await fetch('http://localhost:5000/api/v1/auth/logout', {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${token}` }
+            });
+        } catch (error) {
+            console.warn('Révocation du jeton impossible :', error);
+        }
+    }
+
+    // Expire les cookies immédiatement
+    clearAuthCookies();
 
     // journalisation
-    console.log('Déconnexion effectuée. Cookie supprimé.');
+    console.log('Déconnexion effectuée. Cookies supprimés.');
 
     // Redirection vers la page de login
     window.location.href = 'login.html';
@@ -0,0 +1,13 @@
+-- Pagination par curseur : index ordonné (created_at, id) sur chaque table
+
+-- Les lignes insérées à la main (data.sql) n'ont pas de created_at :
+-- on leur en donne un pour qu'elles aient une place dans l'ordre keyset
+UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+UPDATE places SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+UPDATE reviews SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+UPDATE amenities SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_created_at_id ON reviews (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_amenities_created_at_id ON amenities (created_at, id);
@@ -0,0 +1,7 @@
+-- Index des recherches faites par la facade (lieux d'un propriétaire,
+-- recherche par titre, avis d'un lieu, avis d'un utilisateur)
+
+CREATE INDEX IF NOT EXISTS ix_places_user_id ON places (user_id);
+CREATE INDEX IF NOT EXISTS ix_places_title ON places (title);
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id ON reviews (place_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id);
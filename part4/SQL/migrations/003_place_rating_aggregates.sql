@@ -0,0 +1,19 @@
+-- Agrégats des avis dénormalisés sur places (nombre, somme, histogramme)
+
+ALTER TABLE places ADD COLUMN review_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN rating_sum INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN rating_count_1 INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN rating_count_2 INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN rating_count_3 INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN rating_count_4 INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN rating_count_5 INTEGER NOT NULL DEFAULT 0;
+
+-- Initialisation à partir des avis existants
+UPDATE places SET
+    review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id),
+    rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.place_id = places.id),
+    rating_count_1 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 1),
+    rating_count_2 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 2),
+    rating_count_3 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 3),
+    rating_count_4 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 4),
+    rating_count_5 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 5);
@@ -0,0 +1,13 @@
+-- Requêtes conditionnelles HTTP (ETag / Last-Modified) : max(updated_at)
+-- de chaque table lu par l'index plutôt que par un parcours complet
+
+-- Les lignes insérées à la main (data.sql) n'ont pas de updated_at
+UPDATE users SET updated_at = created_at WHERE updated_at IS NULL;
+UPDATE places SET updated_at = created_at WHERE updated_at IS NULL;
+UPDATE reviews SET updated_at = created_at WHERE updated_at IS NULL;
+UPDATE amenities SET updated_at = created_at WHERE updated_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users (updated_at);
+CREATE INDEX IF NOT EXISTS ix_places_updated_at ON places (updated_at);
+CREATE INDEX IF NOT EXISTS ix_reviews_updated_at ON reviews (updated_at);
+CREATE INDEX IF NOT EXISTS ix_amenities_updated_at ON amenities (updated_at);
@@ -0,0 +1,4 @@
+-- Avis d'un lieu paginés par curseur, triés par date ou par note
+
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_created_at ON reviews (place_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_rating ON reviews (place_id, rating, created_at);
@@ -0,0 +1,9 @@
+-- Recherche géographique : geohash des coordonnées de chaque lieu,
+-- indexé (B-tree) pour lire une zone comme quelques plages de l'index.
+
+ALTER TABLE places ADD COLUMN geohash VARCHAR(12);
+CREATE INDEX IF NOT EXISTS ix_places_geohash ON places (geohash);
+
+-- Le geohash ne se calcule pas en SQL : une fois la colonne ajoutée,
+-- lancer depuis part4/ :
+--     flask --app run backfill-geohash
@@ -0,0 +1,3 @@
+-- Listes de lieux filtrées par fourchette de prix ou triées par prix
+
+CREATE INDEX IF NOT EXISTS ix_places_price_id ON places (price, id);
@@ -0,0 +1,10 @@
+-- Recherche plein texte des lieux (SQLite FTS5), remplie à partir des lieux existants
+
+CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+    place_id UNINDEXED, title, description,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+INSERT INTO places_fts (place_id, title, description)
+SELECT id, title, description FROM places
+WHERE id NOT IN (SELECT place_id FROM places_fts);
@@ -0,0 +1,11 @@
+-- Jetons JWT révoqués (déconnexion, révocation par un admin), purgés à leur expiration
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(36) PRIMARY KEY,
+    user_id CHAR(36),
+    expires_at INTEGER NOT NULL,
+    revoked_at FLOAT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_revoked_at ON revoked_tokens (revoked_at);
@@ -0,0 +1,11 @@
+-- Sessions de rafraîchissement des jetons JWT (une ligne par connexion)
+
+CREATE TABLE IF NOT EXISTS refresh_sessions (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id VARCHAR(36) NOT NULL,
+    current_jti VARCHAR(36) NOT NULL,
+    expires_at INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_refresh_sessions_user_id ON refresh_sessions (user_id);
+CREATE INDEX IF NOT EXISTS ix_refresh_sessions_expires_at ON refresh_sessions (expires_at);
@@ -0,0 +1,9 @@
+-- Index plein texte des lieux indexé par la rowid des lieux : la mise à
+-- jour d'un lieu retrouve sa ligne FTS par la clé de la table virtuelle
+-- au lieu de parcourir place_id (UNINDEXED). À relancer après un VACUUM,
+-- qui peut renuméroter les rowid de places.
+
+DELETE FROM places_fts;
+
+INSERT INTO places_fts (rowid, place_id, title, description)
+SELECT rowid, id, title, description FROM places;
@@ -17,6 +17,21 @@ from app.api.v1.places import api as places_ns
 from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.auth import api as auth_ns
+from app.api.v1.metrics import api as metrics_ns
+from app.api.v1.suggest import api as suggest_ns
+
+# Facade partagée et construction du backend de cache
+from app.services import facade
+from app.services.cache import build_cache_backend
+from app.services.passwords import password_hasher
+from app.services.throttle import login_throttle
+from app.api.v1.authz import user_status
+from app.persistence.search import build_search_index
+from app.persistence.suggest import SuggestIndex
+from app.persistence.trigram import TrigramIndex
+from app.models.types import configure_id_storage
+from app.persistence.sqlite import configure_engine_options, apply_pragmas
+from app.cli import register_commands
 
 # Instanciation manuelle de bcrypt (conforme à ta structure)
 bcrypt = Bcrypt()
@@ -33,11 +48,44 @@ def create_app(config_class=DevelopmentConfig):
     # Désactive les warnings inutiles de SQLAlchemy (si pas déjà dans config.py)
     app.config.setdefault('SQLALCHEMY_TRACK_MODIFICATIONS', False)
 
+    # Profil SQLite (SQLITE_PROFILE) : options du pool avant la création du moteur
+    configure_engine_options(app.config)
+
     # Initialisation des extensions
     bcrypt.init_app(app)
     db.init_app(app)
     jwt.init_app(app)
 
+    # Stockage des clés (ID_STORAGE) et PRAGMA SQLite, fixés avant toute
+    # requête sur le moteur
+    with app.app_context():
+        configure_id_storage(db.engine, app.config.get('ID_STORAGE', 'text'))
+        apply_pragmas(db.engine, app.config)
+
+    # Cache de lecture de la facade (CACHE_TYPE, CACHE_MAX_SIZE, CACHE_TTL...)
+    facade.cache.configure(build_cache_backend(app.config))
+    facade.amenity_index.configure(app.config.get('AMENITY_INDEX_MAX_AGE', 300))
+    facade.search_index = build_search_index(app.config)
+    facade.suggest_index = SuggestIndex(app.config.get('SUGGEST_INDEX_MAX_AGE', 300))
+    facade.fuzzy_index = TrigramIndex(app.config.get('FUZZY_INDEX_MAX_AGE', 300))
+    facade.revoked_tokens.configure(app.config.get('REVOKED_TOKENS_CAPACITY', 100000),
+                                    app.config.get('REVOKED_TOKENS_ERROR_RATE', 0.001),
+                                    app.config.get('REVOKED_TOKENS_SYNC_INTERVAL', 2),
+                                    app.config.get('REVOKED_TOKENS_MAX_AGE', 300))
+    facade.refresh_sessions.reset_stats()
+    if app.config.get('CHECK_SCHEMA_ON_STARTUP'):
+        with app.app_context():
+            facade.revoked_tokens.load()
+            facade.refresh_sessions.check_schema()
+            db.session.remove()
+
+    # Politique de hachage des mots de passe (coût, pool de processus)
+    password_hasher.configure(app.config)
+    # Limitation des tentatives de connexion (LOGIN_THROTTLE_*)
+    login_throttle.configure(app.config)
+    # Contrôle du statut des utilisateurs authentifiés (USER_STATUS_TTL)
+    user_status.configure(app.config.get('USER_STATUS_TTL', 0))
+
     # Définition de l'API avec Swagger + auth JWT
     api = Api(
         app,
@@ -62,6 +110,17 @@ def create_app(config_class=DevelopmentConfig):
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(metrics_ns, path='/api/v1/metrics')
+    api.add_namespace(suggest_ns, path='/api/v1/suggest')
+
+    # Commandes d'administration (flask --app run <commande>)
+    register_commands(app)
+
+    # Jetons révoqués (déconnexion, révocation par un admin) refusés par
+    # toutes les routes JWT : 401 "Token has been revoked"
+    @jwt.token_in_blocklist_loader
+    def check_token_revoked(jwt_header, jwt_payload):
+        return facade.is_token_revoked(jwt_payload["jti"])
 
     @app.after_request
     def add_cors_headers(response):
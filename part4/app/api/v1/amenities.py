@@ -1,8 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt
+from app.api.v1.authz import admin_required
 from app.services import facade
+from app.api.v1.params import PAGINATION_PARAMS, parse_pagination_args
+from app.api.v1.params import parse_batch_payload, batch_response
 from flask_cors import cross_origin
+from app.api.v1.conditional import conditional
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -14,7 +17,7 @@ amenity_model = api.model('Amenity', {
 
 @api.route('/')
 class AmenityList(Resource):
-    @jwt_required()
+    @admin_required
     @api.expect(amenity_model)
     @api.response(201, 'Amenity successfully created')
     @api.response(400, 'Invalid input data')
@@ -22,23 +25,49 @@ class AmenityList(Resource):
     @cross_origin()
     def post(self):
         """Register a new amenity"""
-        claims = get_jwt()
-        if not claims.get('is_admin', False):
-            return {'error': 'Admin privileges required'}, 403
-
         data = request.json
         if not data or 'name' not in data or not isinstance(data['name'], str):
             api.abort(400, "Invalid input data: 'name' is required and must be a string")
         amenity = facade.create_amenity(data)
         return {'id': amenity.id, 'name': amenity.name}, 201
 
+    @api.doc(params=PAGINATION_PARAMS)
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     @cross_origin()
+    @conditional(facade.get_amenities_version)
     def get(self):
-        """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
+        """Retrieve a page of amenities (?limit=&after=)"""
+        try:
+            limit, after = parse_pagination_args(request.args)
+            amenities, next_cursor = facade.get_amenities_page(limit, after)
+        except ValueError as e:
+            api.abort(400, str(e))
         result = [{'id': a.id, 'name': a.name} for a in amenities]
-        return result, 200
+        return {'amenities': result, 'next_cursor': next_cursor}, 200
+
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    @admin_required
+    @api.expect([amenity_model])
+    @api.response(201, 'All amenities successfully created')
+    @api.response(207, 'Some amenities created, see errors')
+    @api.response(400, 'Invalid batch or no amenity created')
+    @api.response(403, 'Admin privileges required')
+    @cross_origin()
+    def post(self):
+        """Register several amenities at once (errors reported per item)"""
+        try:
+            items = parse_batch_payload(request.get_json(silent=True))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # Réponse construite avant le COMMIT du lot (pas de rechargement)
+        with facade.unit_of_work():
+            created, errors = facade.create_amenities_bulk(items)
+            result = [{'id': a.id, 'name': a.name} for a in created]
+        return batch_response(result, errors)
 
 
 @api.route('/<string:amenity_id>')
@@ -46,6 +75,7 @@ class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
     @api.response(404, 'Amenity not found')
     @cross_origin()
+    @conditional(facade.get_amenity_version)
     def get(self, amenity_id):
         """Get amenity details by ID"""
         amenity = facade.get_amenity(amenity_id)
@@ -53,7 +83,7 @@ class AmenityResource(Resource):
             api.abort(404, "Amenity not found")
         return {'id': amenity.id, 'name': amenity.name}, 200
 
-    @jwt_required()
+    @admin_required
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
     @api.response(404, 'Amenity not found')
@@ -62,10 +92,6 @@ class AmenityResource(Resource):
     @cross_origin()
     def put(self, amenity_id):
         """Update an amenity's information"""
-        claims = get_jwt()
-        if not claims.get('is_admin', False):  # ✅ Vérification du privilège admin
-            return {'error': 'Admin privileges required'}, 403
-
         data = request.json
         if not data or 'name' not in data or not isinstance(data['name'], str):
             api.abort(400, "Invalid input data: 'name' is required and must be a string")
@@ -1,13 +1,28 @@
 """api/v1/auth.py
 
 Définit les routes d'authentification pour l'application HBnB.
-Comprend le point de terminaison /login pour la génération de jetons JWT,
-et un exemple de route protégée par JWT (/protected).
+Comprend le point de terminaison /login pour la génération de jetons JWT
+(accès et rafraîchissement), /refresh pour les renouveler sans mot de
+passe, /logout et /revoke (admin) pour les révoquer avant leur
+expiration, et un exemple de route protégée par JWT (/protected).
+
+Chaque connexion ouvre une session de rafraîchissement (claim family,
+portée par tous ses jetons) : /refresh remplace le jeton de
+rafraîchissement à chaque appel et ferme la session si un ancien jeton
+est présenté à nouveau (voir persistence/refresh_sessions.py).
 """
 
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
-from app.services.facade import HBnBFacade
+from flask_jwt_extended import create_refresh_token, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from app.api.v1.authz import authenticated, admin_required, current_user_id
+from app.models.base import generate_id
+from app.services import facade
+from app.services.passwords import PasswordHasherBusy
+from app.services.throttle import login_throttle
 from flask_cors import cross_origin
 
 # Création du namespace pour l'authentification
@@ -19,34 +34,125 @@ login_model = api.model('Login', {
     'password': fields.String(required=True, description='User password')
 })
 
-# Instanciation de la façade métier
-facade = HBnBFacade()
+# Modèle d'entrée pour la révocation d'un jeton par un admin
+revoke_model = api.model('Revoke', {
+    'token': fields.String(required=True, description='JWT to revoke')
+})
+
+
+def issue_tokens(user_id, is_admin, family):
+    """
+    Émet un jeton d'accès et un jeton de rafraîchissement de la session
+    family. Retour : (réponse JSON, claims du jeton de rafraîchissement)
+    """
+    access_token = create_access_token(
+        identity=user_id,
+        additional_claims={"is_admin": bool(is_admin), "family": family}
+    )
+    refresh_token = create_refresh_token(identity=user_id, additional_claims={"family": family})
+    tokens = {'access_token': access_token, 'refresh_token': refresh_token}
+    return tokens, decode_token(refresh_token)
 
 
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model)
-    @api.response(200, 'JWT token returned')
+    @api.response(200, 'Access and refresh tokens returned')
     @api.response(401, 'Invalid credentials')
+    @api.response(429, 'Too many login attempts for this address or account')
+    @api.response(503, 'Too many logins in progress, retry later')
     @cross_origin()
     def post(self):
         """Authentifie l'utilisateur et renvoie un jeton JWT"""
         credentials = api.payload
-        user = facade.get_user_by_email(credentials['email'])
 
-        # Vérification des identifiants
-        if not user or not user.verify_password(credentials['password']):
+        # Limitation par IP et par e-mail, avant toute requête SQL ou bcrypt
+        retry_after = login_throttle.check(request.remote_addr, credentials.get('email'))
+        if retry_after is not None:
+            return ({'error': 'Too many login attempts, retry later'}, 429,
+                    {'Retry-After': str(retry_after)})
+
+        # Vérification des identifiants (bcrypt dans le pool de hachage)
+        try:
+            user = facade.authenticate(credentials['email'], credentials['password'])
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+        if not user:
             return {'error': 'Invalid credentials'}, 401
 
-        # Encodage avec identité str + claims admin
-        access_token = create_access_token(
-            identity=str(user.id),
-            additional_claims={
-                "is_admin": bool(user.is_admin)
-            }
-        )
+        # Identité str + claims admin, dans une nouvelle session
+        family = generate_id()
+        tokens, refresh_claims = issue_tokens(str(user.id), user.is_admin, family)
+        facade.start_refresh_session(family, str(user.id), refresh_claims['jti'],
+                                     refresh_claims['exp'])
+        return tokens, 200
+
+
+@api.route('/refresh')
+class Refresh(Resource):
+    @jwt_required(refresh=True)
+    @api.response(200, 'New access and refresh tokens returned')
+    @api.response(401, 'Missing, expired, revoked or reused refresh token')
+    @cross_origin()
+    def post(self):
+        """Échange le jeton de rafraîchissement contre une nouvelle paire de jetons"""
+        claims = get_jwt()
+        user_id, family = claims['sub'], claims.get('family')
+        if family is None:
+            return {'error': 'Invalid refresh token'}, 401
+
+        # Rôle relu en base : les droits du nouveau jeton d'accès suivent
+        # les changements faits depuis la connexion
+        is_admin = facade.get_user_status(user_id)
+        if is_admin is None:
+            facade.end_refresh_session(family)
+            return {'error': 'Unauthorized'}, 401
+
+        tokens, refresh_claims = issue_tokens(user_id, is_admin, family)
+        if not facade.rotate_refresh_token(family, claims['jti'], refresh_claims['jti'],
+                                           refresh_claims['exp']):
+            return {'error': 'Invalid refresh token'}, 401
+        return tokens, 200
+
+
+@api.route('/logout')
+class Logout(Resource):
+    @authenticated
+    @api.response(200, 'Token revoked')
+    @api.response(401, 'Missing or invalid token')
+    @cross_origin()
+    def post(self):
+        """Révoque le jeton de la requête et ferme sa session (déconnexion)"""
+        claims = get_jwt()
+        with facade.unit_of_work():
+            facade.revoke_token(claims['jti'], claims.get('exp'), current_user_id())
+            if claims.get('family'):
+                facade.end_refresh_session(claims['family'])
+        return {'message': 'Successfully logged out'}, 200
+
+
+@api.route('/revoke')
+class Revoke(Resource):
+    @admin_required
+    @api.expect(revoke_model)
+    @api.response(200, 'Token revoked')
+    @api.response(400, 'Invalid token')
+    @api.response(403, 'Admin privileges required')
+    @cross_origin()
+    def post(self):
+        """Révoque un jeton quelconque et ferme sa session (admin uniquement)"""
+        token = (api.payload or {}).get('token')
+        try:
+            # Signature vérifiée ; un jeton déjà expiré n'a rien à révoquer
+            claims = decode_token(token, allow_expired=True)
+        except (PyJWTError, JWTExtendedException, AttributeError, TypeError, ValueError):
+            return {'error': 'Invalid token'}, 400
 
-        return {'access_token': access_token}, 200
+        with facade.unit_of_work():
+            facade.revoke_token(claims['jti'], claims.get('exp'), claims.get('sub'))
+            if claims.get('family'):
+                facade.end_refresh_session(claims['family'])
+        return {'message': 'Token revoked', 'jti': claims['jti']}, 200
 
 
 @api.route('/protected')
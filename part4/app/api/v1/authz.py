@@ -0,0 +1,118 @@
+"""api/v1/authz.py
+
+Autorisation des routes protégées à partir du JWT.
+
+Le jeton est signé par le serveur : son identité (sub) et sa claim
+is_admin, posées par Login.post, suffisent à décider des droits sans
+relire l'utilisateur en base à chaque requête.
+
+- @authenticated : remplace @jwt_required() ; l'utilisateur courant est
+  disponible via current_user_id() et current_user_is_admin()
+- @admin_required : idem, et répond 403 si l'utilisateur n'est pas admin
+
+Révocation : un jeton reste valide jusqu'à son expiration, même si son
+utilisateur est supprimé ou perd ses droits d'admin. Avec USER_STATUS_TTL
+> 0, l'existence et le rôle de l'utilisateur sont relus au plus une fois
+par TTL et par utilisateur (cache du processus) : un utilisateur supprimé
+est refusé (401), un admin rétrogradé perd ses droits, au plus TTL
+secondes après le changement. Avec 0, les claims font seules foi.
+
+À placer en premier décorateur de la méthode (au-dessus de @api.expect
+et de @api.marshal_with) : les réponses d'erreur ne sont pas sérialisées
+par le modèle de l'endpoint.
+"""
+
+import threading
+import time
+from functools import wraps
+from flask import g
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from app.services import facade
+
+
+class UserStatusCache:
+    """
+    Statut (is_admin, ou None si l'utilisateur n'existe plus) des
+    utilisateurs authentifiés, relu au plus une fois par ttl secondes.
+    """
+
+    def __init__(self, ttl=0, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}   # user_id -> (expiration, statut)
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+
+    def configure(self, ttl):
+        with self._lock:
+            self.ttl = ttl
+            self._entries.clear()
+            self._counts = {"hits": 0, "misses": 0}
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._counts["hits"] += 1
+                return entry[1]
+            self._counts["misses"] += 1
+
+        status = facade.get_user_status(user_id)
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_size:
+                    self._entries.clear()
+            self._entries[user_id] = (now + self.ttl, status)
+        return status
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"ttl": self.ttl, "size": len(self._entries), **self._counts}
+
+
+user_status = UserStatusCache()
+
+
+def current_user_id():
+    """Identifiant de l'utilisateur du jeton."""
+    return g.current_user_id
+
+
+def current_user_is_admin():
+    """Droits d'admin du jeton (confirmés par le statut si USER_STATUS_TTL > 0)."""
+    return g.current_user_is_admin
+
+
+def authenticated(view):
+    """Exige un JWT valide dont l'utilisateur existe toujours (si contrôlé)."""
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        user_id = get_jwt_identity()
+        is_admin = bool(get_jwt().get("is_admin", False))
+        if user_status.ttl > 0:
+            status = user_status.get(user_id)
+            if status is None:
+                return {"error": "Unauthorized"}, 401
+            is_admin = is_admin and status
+        g.current_user_id = user_id
+        g.current_user_is_admin = is_admin
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def admin_required(view):
+    """Exige un JWT valide portant les droits d'admin."""
+    @wraps(view)
+    @authenticated
+    def wrapper(*args, **kwargs):
+        if not current_user_is_admin():
+            return {"error": "Admin privileges required"}, 403
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,97 @@
+"""api/v1/conditional.py
+
+Requêtes conditionnelles HTTP (If-None-Match / If-Modified-Since).
+
+Le décorateur conditional() calcule, avant d'exécuter l'endpoint, un
+« validateur » de la ressource : un tuple de valeurs bon marché à obtenir
+(max(updated_at), nombre de lignes...) lu par une requête d'agrégat, sans
+charger les lignes. Il en dérive un ETag faible et une date Last-Modified :
+
+- si le client possède déjà cette version, on répond 304 sans exécuter
+  l'endpoint (ni chargement des objets, ni sérialisation) ;
+- sinon l'endpoint s'exécute normalement et sa réponse 200 reçoit les
+  en-têtes ETag et Last-Modified. Le validateur est aussi disponible dans
+  g.resource_version : un endpoint qui sert un corps mis en cache le
+  compare à celui de l'entrée, pour ne pas associer un ETag récent à un
+  corps périmé.
+
+À placer sous @cross_origin() et au-dessus de @api.marshal_with.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import Response, after_this_request, g, request
+
+
+def _as_utc(value):
+    """Les dates lues en base (SQLite) sont naïves et exprimées en UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def make_etag(version):
+    """ETag (valeur sans guillemets) d'une version de ressource.
+    L'URL complète en fait partie : chaque page ou filtre a son propre ETag."""
+    payload = repr((request.full_path, version)).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def last_modified_of(version):
+    """Date la plus récente contenue dans le validateur (ou None)."""
+    dates = [_as_utc(v) for v in version if isinstance(v, datetime)]
+    return max(dates).replace(microsecond=0) if dates else None
+
+
+def is_not_modified(etag, last_modified):
+    """
+    Indique si la version du client est à jour. If-None-Match prime sur
+    If-Modified-Since (RFC 9110, section 13.2.2).
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(validator):
+    """
+    Décorateur d'endpoint GET.
+
+    Paramètres :
+    - validator : fonction appelée avec les variables de l'URL (arguments
+      nommés de l'endpoint, ex : place_id=...), qui retourne un tuple
+      décrivant la version de la ressource, ou None si elle n'existe pas
+      (l'endpoint s'exécute alors et répond 404).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = validator(**kwargs)
+            if version is None:
+                return view(*args, **kwargs)
+
+            g.resource_version = version
+            etag = make_etag(version)
+            last_modified = last_modified_of(version)
+
+            if is_not_modified(etag, last_modified):
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                if last_modified:
+                    response.last_modified = last_modified
+                return response
+
+            @after_this_request
+            def add_validators(response):
+                if response.status_code == 200:
+                    response.set_etag(etag, weak=True)
+                    if last_modified:
+                        response.last_modified = last_modified
+                return response
+
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
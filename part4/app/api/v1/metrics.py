@@ -0,0 +1,39 @@
+"""api/v1/metrics.py
+
+Expose les compteurs de fonctionnement de l'application (réservé aux
+administrateurs) : hits/misses du cache de lecture de la facade, taille
+des index en mémoire (commodités, plein texte, autocomplétion, trigrammes)
+file d'attente du service de hachage des mots de passe et tentatives de
+connexion refusées par la limitation.
+"""
+
+from flask_restx import Namespace, Resource
+from app.api.v1.authz import admin_required, user_status
+from app.services import facade
+from app.services.passwords import password_hasher
+from app.services.throttle import login_throttle
+from flask_cors import cross_origin
+
+api = Namespace('metrics', description='Runtime metrics (admin only)')
+
+
+@api.route('/')
+class Metrics(Resource):
+    @admin_required
+    @api.response(200, 'Metrics returned')
+    @api.response(403, 'Admin privileges required')
+    @cross_origin()
+    def get(self):
+        """Return cache, search index, password hashing and login throttling counters"""
+        return {
+            'cache': facade.cache.stats(),
+            'amenity_index': facade.amenity_index.stats(),
+            'search_index': facade.search_index.stats(),
+            'suggest_index': facade.suggest_index.stats(),
+            'fuzzy_index': facade.fuzzy_index.stats(),
+            'revoked_tokens': facade.revoked_tokens.stats(),
+            'refresh_sessions': facade.refresh_sessions.stats(),
+            'passwords': password_hasher.stats(),
+            'login_throttle': login_throttle.stats(),
+            'user_status': user_status.stats()
+        }, 200
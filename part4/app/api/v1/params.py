@@ -0,0 +1,267 @@
+"""api/v1/params.py
+
+Lecture et validation des paramètres communs aux endpoints :
+- pagination par curseur (?limit=&after=)
+- corps des endpoints de création par lots (POST .../batch)
+- représentation des lieux (?fields=&embed=)
+- tri des avis d'un lieu (?sort=)
+- filtre par prix et commodités, tri des lieux (?min_price=&max_price=&amenities=&sort=)
+- seuil de la recherche approximative (?threshold=)
+- recherche géographique (?lat=&lon=&radius_km= ou ?bbox=)
+"""
+
+from app.persistence.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.persistence.repository import PLACE_RELATIONS, REVIEW_ORDERS, DEFAULT_REVIEW_SORT
+from app.persistence.repository import PLACE_ORDERS, DEFAULT_PLACE_SORT
+from app.persistence.trigram import DEFAULT_SIMILARITY_THRESHOLD
+
+# Documentation Swagger des paramètres de pagination
+PAGINATION_PARAMS = {
+    'limit': f'Page size (1-{MAX_PAGE_SIZE}, default {DEFAULT_PAGE_SIZE})',
+    'after': 'Cursor returned as next_cursor by the previous page'
+}
+
+
+def parse_pagination_args(args):
+    """
+    Extrait (limit, after) des paramètres de la requête.
+
+    Lève une ValueError si limit n'est pas un entier entre 1 et MAX_PAGE_SIZE.
+    """
+    raw_limit = args.get('limit')
+    if raw_limit in (None, ''):
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError("'limit' must be an integer")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+
+    after = args.get('after') or None
+    return limit, after
+
+
+# Champs simples d'un lieu exposés par l'API (id est toujours inclus)
+PLACE_FIELDS = ("id", "title", "description", "price", "latitude",
+                "longitude", "image_url", "rating")
+
+# Documentation Swagger des paramètres de représentation des lieux
+PLACE_VIEW_PARAMS = {
+    'fields': f'Comma-separated fields to return ({", ".join(PLACE_FIELDS)}); '
+              'relations listed here are embedded',
+    'embed': f'Comma-separated relations to embed ({", ".join(PLACE_RELATIONS)}); '
+             'all by default'
+}
+
+
+def _split(raw):
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+
+def parse_place_view_args(args):
+    """
+    Extrait (fields, embed) des paramètres ?fields= et ?embed=.
+
+    - Sans aucun des deux : tous les champs et toutes les relations
+      (fields vaut alors None).
+    - ?fields= seul : les champs demandés, et seulement les relations
+      nommées dans fields.
+    - ?embed= seul : tous les champs et les relations demandées.
+
+    Retour :
+    - (fields, embed) : tuples dans l'ordre canonique, fields à None
+      pour « tous les champs »
+
+    Lève une ValueError si un nom est inconnu.
+    """
+    raw_fields = args.get('fields')
+    raw_embed = args.get('embed')
+
+    fields, embed = None, set(PLACE_RELATIONS)
+    if raw_fields is not None:
+        requested = set(_split(raw_fields))
+        unknown = requested - set(PLACE_FIELDS) - set(PLACE_RELATIONS)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        fields = tuple(name for name in PLACE_FIELDS if name in requested or name == 'id')
+        embed = requested & set(PLACE_RELATIONS)
+
+    if raw_embed is not None:
+        requested = set(_split(raw_embed))
+        unknown = requested - set(PLACE_RELATIONS)
+        if unknown:
+            raise ValueError(f"Unknown relation(s) to embed: {', '.join(sorted(unknown))}")
+        embed = (embed | requested) if raw_fields is not None else requested
+
+    return fields, tuple(name for name in PLACE_RELATIONS if name in embed)
+
+
+# Documentation Swagger du tri des avis d'un lieu
+REVIEW_SORT_PARAMS = {
+    'sort': f'Order of the reviews ({", ".join(REVIEW_ORDERS)}), '
+            f'default {DEFAULT_REVIEW_SORT} (latest first)'
+}
+
+
+def parse_review_sort(args):
+    """
+    Extrait le tri demandé par ?sort= (par défaut, les plus récents d'abord).
+
+    Lève une ValueError si le tri est inconnu.
+    """
+    sort = args.get('sort') or DEFAULT_REVIEW_SORT
+    if sort not in REVIEW_ORDERS:
+        raise ValueError(f"'sort' must be one of: {', '.join(REVIEW_ORDERS)}")
+    return sort
+
+
+# Documentation Swagger du filtre par prix et du tri des lieux
+PLACE_LISTING_PARAMS = {
+    'min_price': 'Minimum price per night (inclusive)',
+    'max_price': 'Maximum price per night (inclusive)',
+    'amenities': 'Comma-separated amenity IDs; only places with all of them are returned',
+    'sort': f'Order of the places ({", ".join(PLACE_ORDERS)}), '
+            f'default {DEFAULT_PLACE_SORT} (creation order)'
+}
+
+
+def parse_place_listing_args(args):
+    """
+    Extrait (min_price, max_price, sort, amenity_ids) des paramètres de la
+    liste des lieux ; les bornes absentes valent None, amenity_ids est un
+    tuple (vide sans filtre de commodités).
+
+    Lève une ValueError si une borne n'est pas un nombre positif ou si le
+    tri est inconnu.
+    """
+    bounds = []
+    for name in ('min_price', 'max_price'):
+        raw = args.get(name)
+        if raw in (None, ''):
+            bounds.append(None)
+            continue
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValueError(f"'{name}' must be a number")
+        if not 0 <= value < float('inf'):
+            raise ValueError(f"'{name}' must be a non-negative number")
+        bounds.append(value)
+
+    sort = args.get('sort') or DEFAULT_PLACE_SORT
+    if sort not in PLACE_ORDERS:
+        raise ValueError(f"'sort' must be one of: {', '.join(PLACE_ORDERS)}")
+    amenity_ids = tuple(dict.fromkeys(_split(args.get('amenities') or '')))
+    return bounds[0], bounds[1], sort, amenity_ids
+
+
+def parse_threshold(args):
+    """
+    Extrait le seuil de similarité de la recherche approximative
+    (?threshold=, 0.3 par défaut).
+
+    Lève une ValueError s'il n'est pas un nombre de ]0, 1].
+    """
+    raw = args.get('threshold')
+    if raw in (None, ''):
+        return DEFAULT_SIMILARITY_THRESHOLD
+    try:
+        threshold = float(raw)
+    except ValueError:
+        raise ValueError("'threshold' must be a number")
+    if not 0 < threshold <= 1:
+        raise ValueError("'threshold' must be greater than 0 and at most 1")
+    return threshold
+
+
+# Rayon maximal d'une recherche autour d'un point
+MAX_RADIUS_KM = 1000
+
+# Documentation Swagger des paramètres de recherche géographique
+NEARBY_PARAMS = {
+    'lat': 'Latitude of the center (-90 to 90)',
+    'lon': 'Longitude of the center (-180 to 180)',
+    'radius_km': f'Search radius in km (max {MAX_RADIUS_KM})',
+    'bbox': 'Alternative to lat/lon/radius_km: min_lon,min_lat,max_lon,max_lat '
+            '(min_lon > max_lon crosses the antimeridian)'
+}
+
+
+def _parse_float(raw, name, minimum, maximum):
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be a number")
+    if not minimum <= value <= maximum:
+        raise ValueError(f"'{name}' must be between {minimum} and {maximum}")
+    return value
+
+
+def parse_nearby_args(args):
+    """
+    Extrait la zone de recherche : soit ?bbox=min_lon,min_lat,max_lon,max_lat,
+    soit un cercle ?lat=&lon=&radius_km=.
+
+    Retour :
+    - (latitude, longitude, radius_km, bbox) : bbox vaut None pour un
+      cercle, les trois autres valent None pour un rectangle
+
+    Lève une ValueError si les paramètres sont absents ou invalides.
+    """
+    if args.get('bbox'):
+        parts = args['bbox'].split(',')
+        if len(parts) != 4:
+            raise ValueError("'bbox' must be min_lon,min_lat,max_lon,max_lat")
+        min_lon = _parse_float(parts[0], 'min_lon', -180, 180)
+        min_lat = _parse_float(parts[1], 'min_lat', -90, 90)
+        max_lon = _parse_float(parts[2], 'max_lon', -180, 180)
+        max_lat = _parse_float(parts[3], 'max_lat', -90, 90)
+        if min_lat > max_lat:
+            raise ValueError("'bbox' min_lat must not exceed max_lat")
+        return None, None, None, (min_lon, min_lat, max_lon, max_lat)
+
+    for name in ('lat', 'lon', 'radius_km'):
+        if args.get(name) in (None, ''):
+            raise ValueError("Provide either 'bbox' or 'lat', 'lon' and 'radius_km'")
+    latitude = _parse_float(args['lat'], 'lat', -90, 90)
+    longitude = _parse_float(args['lon'], 'lon', -180, 180)
+    radius_km = _parse_float(args['radius_km'], 'radius_km', 0, MAX_RADIUS_KM)
+    return latitude, longitude, radius_km, None
+
+
+# Nombre maximal d'éléments acceptés par un endpoint /batch
+MAX_BATCH_SIZE = 500
+
+
+def parse_batch_payload(data):
+    """
+    Vérifie le corps d'une requête de création par lots : un tableau JSON
+    non vide d'au plus MAX_BATCH_SIZE éléments.
+
+    Lève une ValueError sinon.
+    """
+    if not isinstance(data, list) or not data:
+        raise ValueError("Request body must be a non-empty JSON array")
+    if len(data) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch cannot contain more than {MAX_BATCH_SIZE} items")
+    return data
+
+
+def batch_response(created, errors):
+    """
+    Construit la réponse d'un endpoint /batch.
+
+    Code HTTP :
+    - 201 si tous les éléments ont été créés
+    - 207 si une partie seulement a été créée
+    - 400 si aucun élément n'a été créé
+    """
+    if not errors:
+        status = 201
+    elif created:
+        status = 207
+    else:
+        status = 400
+    return {"created": created, "errors": errors}, status
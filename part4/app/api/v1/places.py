@@ -10,11 +10,17 @@ HBnBFacade.
 """
 
 from flask_restx import Namespace, Resource, fields
-from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import g, request
+from app.api.v1.authz import authenticated, current_user_id, current_user_is_admin
 from app.services import facade  # Accès à la couche métier
 from app.api.v1.reviews import review_model
+from app.api.v1.params import PAGINATION_PARAMS, parse_pagination_args
+from app.api.v1.params import parse_batch_payload, batch_response
+from app.api.v1.params import PLACE_FIELDS, PLACE_RELATIONS, PLACE_VIEW_PARAMS
+from app.api.v1.params import parse_place_view_args, NEARBY_PARAMS, parse_nearby_args
+from app.api.v1.params import PLACE_LISTING_PARAMS, parse_place_listing_args, parse_threshold
 from flask_cors import cross_origin
+from app.api.v1.conditional import conditional
 
 # ===================================================
 # Définition du Namespace pour les opérations Place
@@ -55,6 +61,58 @@ place_model = api.model('Place', {
 })
 
 
+# ===================================================
+# Sérialisation d'un lieu (?fields= et ?embed=)
+# ===================================================
+def serialize_place(place, fields=None, embed=PLACE_RELATIONS, reviews_page=None):
+    """
+    Construit la représentation d'un lieu.
+
+    Paramètres :
+    - fields : champs simples à inclure (None : tous, voir PLACE_FIELDS)
+    - embed : relations à inclure (owner, amenities, reviews) ; les autres
+      ne sont pas lues, et ne sont donc pas chargées depuis la base
+    - reviews_page : (reviews, next_cursor) pour n'inclure qu'une page
+      d'avis, suivie de reviews_next_cursor ; sinon tous les avis du lieu
+    """
+    data = {}
+    for name in fields or PLACE_FIELDS:
+        data[name] = place.rating_summary() if name == "rating" else getattr(place, name)
+
+    if "owner" in embed:
+        data["owner"] = {
+            "id": place.owner.id,
+            "first_name": place.owner.first_name,
+            "last_name": place.owner.last_name,
+            "email": place.owner.email
+        }
+    if "amenities" in embed:
+        data["amenities"] = [
+            {
+                "id": amenity.id,
+                "name": amenity.name
+            } for amenity in place.amenities
+        ]
+    if "reviews" in embed:
+        reviews = place.reviews if reviews_page is None else reviews_page[0]
+        data["reviews"] = [
+            {
+                "id": review.id,
+                "text": review.text,
+                "rating": review.rating,
+                "user": {
+                    "id": review.author.id,
+                    "first_name": review.author.first_name,
+                    "last_name": review.author.last_name,
+                    "email": review.author.email
+                }
+            } for review in reviews
+        ]
+        if reviews_page is not None:
+            data["reviews_next_cursor"] = reviews_page[1]
+    return data
+
+
 # ===================================================
 # /api/v1/places/
 # Ressource pour créer ou lister tous les lieux
@@ -62,7 +120,7 @@ place_model = api.model('Place', {
 @api.route('/', strict_slashes=False)
 class PlaceList(Resource):
 
-    @jwt_required()
+    @authenticated
     @api.expect(place_model)
     @api.response(201, 'Place successfully created')
     @api.response(400, 'Invalid input data')
@@ -81,7 +139,7 @@ class PlaceList(Resource):
 
         try:
             # Récupération de l'identité de l'utilisateur connecté
-            current_user = get_jwt_identity()
+            current_user = current_user_id()
 
             # Ajout de l'ID du propriétaire dans les données reçues
             data['owner_id'] = current_user
@@ -127,126 +185,182 @@ class PlaceList(Resource):
             traceback.print_exc()
             return {"error": "Internal server error"}, 500
 
+    @api.doc(params={**PAGINATION_PARAMS, **PLACE_VIEW_PARAMS, **PLACE_LISTING_PARAMS})
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination, filter or sort parameters')
     @api.response(500, 'Internal server error')
     @cross_origin()
+    @conditional(facade.get_places_version)
     def get(self):
         """
-        Récupère la liste de tous les lieux enregistrés.
+        Récupère une page de lieux (pagination par curseur : ?limit=&after=),
+        filtrée par prix (?min_price=&max_price=) et par commodités
+        (?amenities=id1,id2 : toutes requises), triée selon ?sort=.
+        Le curseur de la page suivante est renvoyé dans next_cursor.
         """
         try:
-            places = facade.get_all_places()
+            limit, after = parse_pagination_args(request.args)
+            fields, embed = parse_place_view_args(request.args)
+            min_price, max_price, sort, amenity_ids = parse_place_listing_args(request.args)
+            places, next_cursor = facade.get_places_page(limit, after, embed, fields,
+                                                         min_price, max_price, sort,
+                                                         amenity_ids)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        try:
             if not places:
                 return {
                     "message": "No places found",
-                    "places": []
+                    "places": [],
+                    "next_cursor": None
                 }, 200
 
-            result = []
-            for place in places:
-                result.append({
-                    "id": place.id,
-                    "title": place.title,
-                    "description": place.description,
-                    "price": place.price,
-                    "latitude": place.latitude,
-                    "longitude": place.longitude,
-                    "image_url": place.image_url,
-                    "owner": {
-                        "id": place.owner.id,
-                        "first_name": place.owner.first_name,
-                        "last_name": place.owner.last_name,
-                        "email": place.owner.email
-                    },
-                    "amenities": [
-                        {
-                            "id": amenity.id,
-                            "name": amenity.name
-                        }
-                        for amenity in place.amenities
-                    ],
-                    "reviews": [
-                        {
-                            "id": review.id,
-                            "text": review.text,
-                            "rating": review.rating,
-                            "user": {
-                                "id": review.author.id,
-                                "first_name": review.author.first_name,
-                                "last_name": review.author.last_name,
-                                "email": review.author.email
-                            }
-                        }
-                        for review in place.reviews
-                    ]
-                })
+            result = [serialize_place(place, fields, embed) for place in places]
 
             return {
                 "message": "Places retrieved successfully",
-                "places": result
+                "places": result,
+                "next_cursor": next_cursor
             }, 200
 
         except Exception:
             return {"error": "Internal server error"}, 500
 
 
+# ===================================================
+# /api/v1/places/batch
+# Ressource pour créer plusieurs lieux en une requête
+# ===================================================
+@api.route('/batch')
+class PlaceBatch(Resource):
+
+    @authenticated
+    @api.expect([place_model])
+    @api.response(201, 'All places successfully created')
+    @api.response(207, 'Some places created, see errors')
+    @api.response(400, 'Invalid batch or no place created')
+    @cross_origin()
+    def post(self):
+        """
+        Crée plusieurs lieux à partir d'un tableau JSON.
+        Les lieux appartiennent à l'utilisateur connecté ; un admin peut
+        préciser owner_id pour chacun. Les erreurs sont rapportées par
+        élément (index dans le tableau) sans annuler le reste du lot.
+        """
+        try:
+            items = parse_batch_payload(request.get_json(silent=True))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # La réponse est construite avant le COMMIT unique du lot, pour ne
+        # pas recharger chaque lieu depuis la base après validation
+        with facade.unit_of_work():
+            created, errors = facade.create_places_bulk(
+                items, current_user_id(), current_user_is_admin()
+            )
+            result = [
+                {
+                    "id": place.id,
+                    "title": place.title,
+                    "owner_id": place.user_id
+                } for place in created
+            ]
+        return batch_response(result, errors)
+
+
 # ===================================================
 # /api/v1/places/search
-# Ressource pour rechercher un lieu par son titre exact
+# Ressource pour rechercher des lieux (plein texte) ou un titre exact
 # ===================================================
 @api.route('/search')
 class PlaceSearch(Resource):
-    @api.doc(params={'title': 'Exact title of the place to search'})
-    @api.response(200, 'Place found')
-    @api.response(400, 'Missing title parameter')
+    @api.doc(params={'q': 'Words to search in titles and descriptions (all required)',
+                     'fuzzy': 'true: typo-tolerant search of q in titles (trigram similarity)',
+                     'threshold': 'Minimum similarity for fuzzy search (0-1, default 0.3)',
+                     'limit': PAGINATION_PARAMS['limit'],
+                     'title': 'Exact title of the place to search (if q is not given)',
+                     **PLACE_VIEW_PARAMS})
+    @api.response(200, 'Places found, most relevant first (q) or place found (title)')
+    @api.response(400, 'Missing or invalid search parameters')
     @api.response(404, 'Place not found')
     @cross_origin()
     def get(self):
         """
-        Recherche un lieu par son titre exact (sensible à la casse).
+        Recherche plein texte (?q=) dans les titres et descriptions, les
+        lieux les plus pertinents d'abord (chacun avec son score) ; avec
+        ?fuzzy=true, recherche approximative de q dans les titres (score :
+        similarité de trigrammes, au moins ?threshold=). À défaut de q, un
+        lieu par son titre exact (?title=, sensible à la casse).
         """
+        query = request.args.get('q')
         title = request.args.get('title')
-        if not title:
-            return {"error": "Missing 'title' query parameter"}, 400
+        if not query and not title:
+            return {"error": "Missing 'q' or 'title' query parameter"}, 400
+
+        try:
+            fields, embed = parse_place_view_args(request.args)
+            if query:
+                limit, _ = parse_pagination_args(request.args)
+                if request.args.get('fuzzy', '').lower() in ('1', 'true'):
+                    threshold = parse_threshold(request.args)
+                    results = facade.search_places_fuzzy(query, limit, threshold, embed, fields)
+                else:
+                    results = facade.search_places(query, limit, embed, fields)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        if query:
+            places = []
+            for place, score in results:
+                data = serialize_place(place, fields, embed)
+                data["score"] = round(score, 4)
+                places.append(data)
+            return {"places": places}, 200
 
-        place = facade.get_place_by_title(title)
+        place = facade.get_place_by_title(title, embed, fields)
         if not place:
             return {"error": "Place not found"}, 404
 
-        return {
-            "id": place.id,
-            "title": place.title,
-            "description": place.description,
-            "price": place.price,
-            "latitude": place.latitude,
-            "longitude": place.longitude,
-            "image_url": place.image_url,
-            "owner": {
-                "id": place.owner.id,
-                "first_name": place.owner.first_name,
-                "last_name": place.owner.last_name,
-                "email": place.owner.email
-            },
-            "amenities": [
-                {
-                    "id": amenity.id,
-                    "name": amenity.name
-                } for amenity in place.amenities
-            ],
-            "reviews": [
-                {
-                    "id": review.id,
-                    "text": review.text,
-                    "rating": review.rating,
-                    "user": {
-                        "id": review.author.id,
-                        "first_name": review.author.first_name,
-                        "last_name": review.author.last_name,
-                        "email": review.author.email
-                    }
-                } for review in place.reviews
-            ]
-        }, 200
+        return serialize_place(place, fields, embed), 200
+
+
+# ===================================================
+# /api/v1/places/nearby
+# Ressource pour rechercher les lieux autour d'un point ou dans un rectangle
+# ===================================================
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.doc(params={**NEARBY_PARAMS, **PAGINATION_PARAMS, **PLACE_VIEW_PARAMS})
+    @api.response(200, 'Places retrieved successfully, nearest first')
+    @api.response(400, 'Invalid search area or pagination parameters')
+    @cross_origin()
+    @conditional(facade.get_places_version)
+    def get(self):
+        """
+        Recherche les lieux situés à moins de radius_km de (lat, lon), ou
+        dans le rectangle bbox, du plus proche au plus éloigné (du centre du
+        rectangle pour bbox). Chaque lieu porte sa distance (distance_km).
+        """
+        try:
+            latitude, longitude, radius_km, bbox = parse_nearby_args(request.args)
+            limit, after = parse_pagination_args(request.args)
+            fields, embed = parse_place_view_args(request.args)
+            if bbox is None:
+                results, next_cursor = facade.get_places_nearby(
+                    latitude, longitude, radius_km, limit, after, embed, fields)
+            else:
+                results, next_cursor = facade.get_places_in_bbox(
+                    bbox, limit, after, embed, fields)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        places = []
+        for place, distance in results:
+            data = serialize_place(place, fields, embed)
+            data["distance_km"] = round(distance, 3)
+            places.append(data)
+        return {"places": places, "next_cursor": next_cursor}, 200
 
 
 # ===================================================
@@ -255,6 +369,7 @@ class PlaceSearch(Resource):
 # ===================================================
 @api.route('/user/<user_id>')
 class PlacesByUser(Resource):
+    @api.doc(params=PLACE_VIEW_PARAMS)
     @api.response(200, 'Places retrieved successfully for the user')
     @api.response(404, 'User not found or has no places')
     @cross_origin()
@@ -263,48 +378,16 @@ class PlacesByUser(Resource):
         Récupère tous les lieux associés à un utilisateur (propriétaire) donné.
         """
         try:
-            places = facade.get_places_by_user(user_id)
+            fields, embed = parse_place_view_args(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        try:
+            places = facade.get_places_by_user(user_id, embed, fields)
             if not places:
                 return {"error": "No places found for this user"}, 404
 
-            result = []
-            for place in places:
-                result.append({
-                    "id": place.id,
-                    "title": place.title,
-                    "description": place.description,
-                    "price": place.price,
-                    "latitude": place.latitude,
-                    "longitude": place.longitude,
-                    "image_url": place.image_url,
-                    "owner": {
-                        "id": place.owner.id,
-                        "first_name": place.owner.first_name,
-                        "last_name": place.owner.last_name,
-                        "email": place.owner.email
-                    },
-                    "amenities": [
-                        {
-                            "id": amenity.id,
-                            "name": amenity.name
-                        }
-                        for amenity in place.amenities
-                    ],
-                    "reviews": [
-                        {
-                            "id": review.id,
-                            "text": review.text,
-                            "rating": review.rating,
-                            "user": {
-                                "id": review.author.id,
-                                "first_name": review.author.first_name,
-                                "last_name": review.author.last_name,
-                                "email": review.author.email
-                            }
-                        }
-                        for review in place.reviews
-                    ]
-                })
+            result = [serialize_place(place, fields, embed) for place in places]
 
             return {
                 "message": "Places retrieved successfully for this user",
@@ -322,58 +405,35 @@ class PlacesByUser(Resource):
 @api.route('/<place_id>')
 class PlaceResource(Resource):
 
+    @api.doc(params=PLACE_VIEW_PARAMS)
     @api.response(200, 'Place details retrieved successfully')
     @api.response(404, 'Place not found')
     @api.response(500, 'Internal server error')
     @cross_origin()
+    @conditional(facade.get_place_version)
     def get(self, place_id):
         """
         Récupère les détails d’un lieu spécifique par son ID.
+        Seuls les avis les plus récents sont inclus : reviews_next_cursor
+        permet de lire la suite sur /reviews/places/<place_id>/reviews.
         """
         try:
-            place = facade.get_place(place_id)
+            fields, embed = parse_place_view_args(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        try:
+            place = facade.get_place_view(place_id, serialize_place, embed, fields,
+                                          version=g.get('resource_version'))
             if not place:
                 return {'error': 'Place not found'}, 404
 
-            return {
-                "id": place.id,
-                "title": place.title,
-                "description": place.description,
-                "price": place.price,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "image_url": place.image_url,
-                "owner": {
-                    "id": place.owner.id,
-                    "first_name": place.owner.first_name,
-                    "last_name": place.owner.last_name,
-                    "email": place.owner.email
-                },
-                "amenities": [
-                    {
-                        "id": amenity.id,
-                        "name": amenity.name
-                    } for amenity in place.amenities
-                ],
-                "reviews": [
-                    {
-                        "id": review.id,
-                        "text": review.text,
-                        "rating": review.rating,
-                        "user": {
-                            "id": review.author.id,
-                            "first_name": review.author.first_name,
-                            "last_name": review.author.last_name,
-                            "email": review.author.email
-                        }
-                    } for review in place.reviews
-                ]
-            }, 200
+            return place, 200
 
         except Exception:
             return {"error": "Internal server error"}, 500
 
-    @jwt_required()
+    @authenticated
     @api.expect(place_model)
     @api.response(200, 'Place updated successfully')
     @api.response(400, 'Invalid input data')
@@ -391,11 +451,7 @@ class PlaceResource(Resource):
         if not place:
             return {'error': 'Place not found'}, 404
 
-        current_user = get_jwt_identity()
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
-
-        if not is_admin and str(place.owner.id) != str(current_user["id"]):
+        if not current_user_is_admin() and str(place.owner.id) != current_user_id():
             return {'error': 'Unauthorized action'}, 403
 
         # - Récupération et validation du JSON
@@ -408,23 +464,17 @@ class PlaceResource(Resource):
         if "amenities" in data:
             amenities_ids = data.get("amenities")
 
-            if not isinstance(amenities_ids, list):
+            if not isinstance(amenities_ids, list) or \
+                    not all(isinstance(a, str) for a in amenities_ids):
                 return {"error": "Field 'amenities' must be a list of IDs"}, 400
 
-            amenities = []
-            for amenity_id in amenities_ids:
-                amenity = facade.get_amenity(amenity_id)
-                if not amenity:
-                    return {"error": f"Amenity with id '{amenity_id}' not found"}, 400
-                amenities.append(amenity)
-
-            # - Comparaison entre les anciennes et nouvelles amenities
+            # - Comparaison entre les anciennes et nouvelles amenities ;
+            #   les IDs inconnus sont signalés par la facade (une seule requête)
             existing_ids = set(a.id for a in place.amenities)
             incoming_ids = set(amenities_ids)
 
             if existing_ids != incoming_ids:
                 amenities_changed = True
-                place.amenities = amenities  # Mise à jour en mémoire (hors repo)
 
         # - Comparaison combinée (champs simples + amenities)
         base_fields_unchanged = all(
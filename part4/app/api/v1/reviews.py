@@ -1,8 +1,12 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.authz import authenticated, current_user_id, current_user_is_admin
 from flask import request
 from app.services import facade
+from app.api.v1.params import PAGINATION_PARAMS, parse_pagination_args
+from app.api.v1.params import parse_batch_payload, batch_response
+from app.api.v1.params import REVIEW_SORT_PARAMS, parse_review_sort
 from flask_cors import cross_origin
+from app.api.v1.conditional import conditional
 
 api = Namespace('reviews', description='Review operations')
 
@@ -22,6 +26,27 @@ review_output_model = api.model('ReviewOut', {
     'place_id': fields.String(attribute='place_id', description='ID of the place')
 })
 
+review_page_model = api.model('ReviewPage', {
+    'reviews': fields.List(fields.Nested(review_output_model)),
+    'next_cursor': fields.String(description='Cursor of the next page, null on the last page')
+})
+
+review_author_model = api.model('ReviewAuthor', {
+    'id': fields.String(description='User ID'),
+    'first_name': fields.String(description='First name of the author'),
+    'last_name': fields.String(description='Last name of the author')
+})
+
+place_review_model = api.inherit('PlaceReview', review_output_model, {
+    'created_at': fields.DateTime(description='Creation date of the review'),
+    'user': fields.Nested(review_author_model, attribute='author')
+})
+
+place_review_page_model = api.model('PlaceReviewPage', {
+    'reviews': fields.List(fields.Nested(place_review_model)),
+    'next_cursor': fields.String(description='Cursor of the next page, null on the last page')
+})
+
 message_model = api.model('Message', {
     'message': fields.String(description='A response message')
 })
@@ -29,25 +54,25 @@ message_model = api.model('Message', {
 
 @api.route('/')
 class ReviewList(Resource):
-    @jwt_required()
+    @authenticated
     @api.expect(review_model, validate=True)
     @api.response(201, 'Review successfully created')
     @api.response(400, 'Invalid input data')
-    @api.marshal_with(review_output_model)
     @cross_origin()
+    @api.marshal_with(review_output_model)
     def post(self):
         """Register a new review"""
         data = api.payload
-        current_user_id = get_jwt_identity()
-        data['user_id'] = current_user_id
+        user_id = current_user_id()
+        data['user_id'] = user_id
 
         place = facade.get_place(data['place_id'])
         if not place:
             api.abort(400, 'Invalid place_id')
-        if place.owner.id == current_user_id:
+        if place.owner.id == user_id:
             api.abort(403, 'You cannot review your own place')
 
-        existing_reviews = facade.get_reviews_by_user(current_user_id)
+        existing_reviews = facade.get_reviews_by_user(user_id)
         if any(r.place_id == data['place_id'] for r in existing_reviews):
             api.abort(409, 'You have already reviewed this place')
 
@@ -57,21 +82,59 @@ class ReviewList(Resource):
         except ValueError as e:
             api.abort(400, str(e))
 
+    @api.doc(params=PAGINATION_PARAMS)
     @api.response(200, 'List of reviews retrieved successfully')
-    @api.marshal_list_with(review_output_model)
+    @api.response(400, 'Invalid pagination parameters')
     @cross_origin()
+    @conditional(facade.get_reviews_version)
+    @api.marshal_with(review_page_model)
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return reviews, 200
+        """Retrieve a page of reviews (?limit=&after=)"""
+        try:
+            limit, after = parse_pagination_args(request.args)
+            reviews, next_cursor = facade.get_reviews_page(limit, after)
+        except ValueError as e:
+            api.abort(400, str(e))
+        return {'reviews': reviews, 'next_cursor': next_cursor}, 200
+
+
+@api.route('/batch')
+class ReviewBatch(Resource):
+    @authenticated
+    @api.expect([review_model])
+    @api.response(201, 'All reviews successfully created')
+    @api.response(207, 'Some reviews created, see errors')
+    @api.response(400, 'Invalid batch or no review created')
+    @cross_origin()
+    def post(self):
+        """Register several reviews of the current user at once (errors reported per item)"""
+        try:
+            items = parse_batch_payload(request.get_json(silent=True))
+            # Réponse construite avant le COMMIT du lot (pas de rechargement)
+            with facade.unit_of_work():
+                created, errors = facade.create_reviews_bulk(items, current_user_id())
+                result = [
+                    {
+                        'id': review.id,
+                        'text': review.text,
+                        'rating': review.rating,
+                        'user_id': review.author.id,
+                        'place_id': review.place.id
+                    } for review in created
+                ]
+        except ValueError as e:
+            api.abort(400, str(e))
+
+        return batch_response(result, errors)
 
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
     @api.response(404, 'Review not found')
-    @api.marshal_with(review_output_model)
     @cross_origin()
+    @conditional(facade.get_review_version)
+    @api.marshal_with(review_output_model)
     def get(self, review_id):
         """Get review details by ID"""
         review = facade.get_review(review_id)
@@ -79,23 +142,18 @@ class ReviewResource(Resource):
             api.abort(404, 'Review not found')
         return review, 200
 
-    @jwt_required()
+    @authenticated
     @api.expect(review_model, validate=True)
     @api.response(200, 'Review updated successfully')
     @api.response(404, 'Review not found')
     @api.response(400, 'Invalid input data')
-    @api.marshal_with(review_output_model)
     @cross_origin()
+    @api.marshal_with(review_output_model)
     def put(self, review_id):
         """Update a review's information"""
 
-        # Récupération de l'identité de l'utilisateur via le JWT
-        user_id = get_jwt_identity()
-
-        # Récupération de l'objet User correspondant
-        user = facade.get_user(user_id)
-        if not user:
-            api.abort(401, "Unauthorized")
+        # Identité et rôle lus dans le JWT (sans requête sur l'utilisateur)
+        user_id = current_user_id()
 
         # Récupération de la review ciblée
         review = facade.get_review(review_id)
@@ -103,7 +161,7 @@ class ReviewResource(Resource):
             api.abort(404, 'Review not found')
 
         # Vérifie que seul l'auteur ou un admin peut modifier la review
-        if not user.is_admin and review.user_id != user_id:
+        if not current_user_is_admin() and review.user_id != user_id:
             api.abort(403, 'You can only edit your own reviews')
 
         # Mise à jour de la review
@@ -118,23 +176,20 @@ class ReviewResource(Resource):
                 api.abort(404, msg)
             api.abort(400, msg)
 
-    @jwt_required()
+    @authenticated
     @api.response(200, 'Review deleted successfully')
     @api.response(404, 'Review not found')
     @api.response(403, 'Unauthorized')
     @cross_origin()
     def delete(self, review_id):
         """Delete a review"""
-        user_id = get_jwt_identity()
-        user = facade.get_user(user_id)
-        if not user:
-            api.abort(401, "Unauthorized")
+        user_id = current_user_id()
 
         review = facade.get_review(review_id)
         if not review:
             api.abort(404, 'Review not found')
 
-        if not user.is_admin and review.user_id != user_id:
+        if not current_user_is_admin() and review.user_id != user_id:
             api.abort(403, 'You can only delete your own reviews')
 
         try:
@@ -149,25 +204,37 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
+    @api.doc(params={**PAGINATION_PARAMS, **REVIEW_SORT_PARAMS})
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid pagination or sort parameters')
     @api.response(404, 'Place not found')
-    @api.marshal_list_with(review_output_model)
     @cross_origin()
+    @conditional(facade.get_place_reviews_version)
+    @api.marshal_with(place_review_page_model)
     def get(self, place_id):
-        """Get all reviews for a specific place"""
+        """Get a page of reviews for a specific place (?limit=&after=&sort=)"""
         try:
-            reviews = facade.get_reviews_by_place(place_id)
-            return reviews, 200
+            limit, after = parse_pagination_args(request.args)
+            sort = parse_review_sort(request.args)
         except ValueError as e:
-            api.abort(404, str(e))
+            api.abort(400, str(e))
+
+        try:
+            reviews, next_cursor = facade.get_place_reviews_page(place_id, limit, after, sort)
+        except ValueError as e:
+            if str(e) == 'Place not found':
+                api.abort(404, str(e))
+            api.abort(400, str(e))
+        return {'reviews': reviews, 'next_cursor': next_cursor}, 200
 
 
 @api.route('/users/<string:user_id>/reviews')
 class UserReviewList(Resource):
     @api.response(200, 'List of reviews for the user retrieved successfully')
     @api.response(404, 'User not found or no reviews found')
-    @api.marshal_list_with(review_output_model)
     @cross_origin()
+    @conditional(facade.get_reviews_version)
+    @api.marshal_list_with(review_output_model)
     def get(self, user_id):
         """Get all reviews written by a specific user"""
         try:
@@ -0,0 +1,55 @@
+"""api/v1/suggest.py
+
+Autocomplétion (type-ahead) des titres de lieux et des noms de commodités,
+servie par l'index en mémoire de la facade (voir persistence/suggest.py).
+"""
+
+from flask import request
+from flask_restx import Namespace, Resource
+from flask_cors import cross_origin
+from app.services import facade
+from app.persistence.suggest import SUGGESTION_KINDS
+
+api = Namespace('suggest', description='Prefix autocomplete for place titles and amenity names')
+
+# Nombre de suggestions par défaut et maximal
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+MAX_PREFIX_LENGTH = 100
+
+
+@api.route('/', strict_slashes=False)
+class Suggest(Resource):
+    @api.doc(params={
+        'prefix': 'Beginning of a word of the title or name (case and accent insensitive)',
+        'limit': f'Number of suggestions (1-{MAX_SUGGESTIONS}, default {DEFAULT_SUGGESTIONS})',
+        'type': f'Restrict to one kind of label ({", ".join(SUGGESTION_KINDS)})'
+    })
+    @api.response(200, 'Suggestions returned')
+    @api.response(400, 'Missing or invalid parameters')
+    @cross_origin()
+    def get(self):
+        """
+        Retourne les titres de lieux et noms de commodités dont un mot
+        commence par ?prefix=, dans l'ordre alphabétique.
+        """
+        prefix = request.args.get('prefix', '')
+        if not prefix.strip():
+            return {"error": "Missing 'prefix' query parameter"}, 400
+        if len(prefix) > MAX_PREFIX_LENGTH:
+            return {"error": f"'prefix' must be at most {MAX_PREFIX_LENGTH} characters"}, 400
+
+        try:
+            limit = int(request.args.get('limit') or DEFAULT_SUGGESTIONS)
+        except ValueError:
+            return {"error": "'limit' must be an integer"}, 400
+        if not 1 <= limit <= MAX_SUGGESTIONS:
+            return {"error": f"'limit' must be between 1 and {MAX_SUGGESTIONS}"}, 400
+
+        kinds = SUGGESTION_KINDS
+        if request.args.get('type'):
+            if request.args['type'] not in SUGGESTION_KINDS:
+                return {"error": f"'type' must be one of: {', '.join(SUGGESTION_KINDS)}"}, 400
+            kinds = (request.args['type'],)
+
+        return {"suggestions": facade.suggest(prefix, limit, kinds)}, 200
@@ -1,11 +1,15 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.params import PAGINATION_PARAMS, parse_pagination_args
 from flask import request
 from flask_cors import cross_origin
-from flask_jwt_extended import (
-    jwt_required,
-    get_jwt_identity,
-    get_jwt
+from app.api.v1.conditional import conditional
+from app.api.v1.authz import (
+    authenticated,
+    admin_required,
+    current_user_id,
+    current_user_is_admin,
+    user_status
 )
 
 api = Namespace('users', description='User operations')
@@ -27,22 +31,24 @@ user_output_model = api.model('UserOutput', {
     'is_admin': fields.Boolean(description='Whether the user is an admin')
 })
 
+# Modèle de sortie paginé (liste + curseur de la page suivante)
+user_page_model = api.model('UserPage', {
+    'users': fields.List(fields.Nested(user_output_model)),
+    'next_cursor': fields.String(description='Cursor of the next page, null on the last page')
+})
+
 
 @api.route('/')
 class UserList(Resource):
-    @jwt_required()
+    @admin_required
     @api.expect(user_input_model, validate=True)
     @api.response(201, 'User successfully created')
     @api.response(400, 'Email already registered')
     @api.response(400, 'Invalid input data')
-    @api.marshal_with(user_output_model)
     @cross_origin()
+    @api.marshal_with(user_output_model)
     def post(self):
         """Create a new user (admin only)"""
-        claims = get_jwt()
-        if not claims.get('is_admin'):
-            return {'error': 'Admin privileges required'}, 403
-
         user_data = api.payload
 
         # Vérifie l'unicité de l'email
@@ -56,21 +62,29 @@ class UserList(Resource):
         except (ValueError, TypeError) as e:
             api.abort(400, str(e))
 
-    @api.marshal_list_with(user_output_model)
+    @api.doc(params=PAGINATION_PARAMS)
+    @api.response(400, 'Invalid pagination parameters')
     @cross_origin()
+    @conditional(facade.get_users_version)
+    @api.marshal_with(user_page_model)
     def get(self):
-        """List all users"""
-        return facade.get_all_users(), 200
+        """List users, one page at a time (?limit=&after=)"""
+        try:
+            limit, after = parse_pagination_args(request.args)
+            users, next_cursor = facade.get_users_page(limit, after)
+        except ValueError as e:
+            api.abort(400, str(e))
+        return {'users': users, 'next_cursor': next_cursor}, 200
 
 
 @api.route('/search')
 class UserSearch(Resource):
     @api.doc(params={'email': 'Email address of the user'})
+    @cross_origin()
     @api.marshal_with(user_output_model)
     @api.response(200, 'User found')
     @api.response(400, 'Missing email query parameter')
     @api.response(404, 'User not found')
-    @cross_origin()
     def get(self):
         """Search a user by email"""
         email = request.args.get('email')
@@ -86,10 +100,11 @@ class UserSearch(Resource):
 
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @cross_origin()
+    @conditional(facade.get_user_version)
     @api.marshal_with(user_output_model)
     @api.response(200, 'User retrieved')
     @api.response(404, 'User not found')
-    @cross_origin()
     def get(self, user_id):
         """Get a user by ID"""
         user = facade.get_user(user_id)
@@ -98,26 +113,23 @@ class UserResource(Resource):
 
         return user, 200
 
-    @jwt_required()
+    @authenticated
     @api.expect(user_input_model, validate=False)
+    @cross_origin()
     @api.marshal_with(user_output_model)
     @api.response(200, 'User successfully updated')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Forbidden')
     @api.response(404, 'User not found')
-    @cross_origin()
     def put(self, user_id):
         """Update a user (admin or self)"""
-        identity = get_jwt_identity()  # str(user.id)
-        claims = get_jwt()
-        current_user_id = identity
-        is_admin = claims.get("is_admin", False)
+        is_admin = current_user_is_admin()
 
         user = facade.get_user(user_id)
         if not user:
             api.abort(404, "User not found")
 
-        if not is_admin and user.id != current_user_id:
+        if not is_admin and user.id != current_user_id():
             api.abort(403, "Unauthorized action")
 
         user_data = api.payload
@@ -137,6 +149,9 @@ class UserResource(Resource):
 
         try:
             updated_user = facade.update_user(user_id, user_data)
+            # Rôle éventuellement modifié : pris en compte tout de suite dans
+            # ce processus, au plus USER_STATUS_TTL secondes après ailleurs
+            user_status.invalidate(user_id)
             return updated_user, 200
         except ValueError as e:
             api.abort(400, str(e))
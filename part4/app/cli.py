@@ -0,0 +1,34 @@
+"""cli.py
+
+Commandes d'administration de la base, lancées depuis part4/ :
+
+    flask --app run backfill-geohash
+    flask --app run convert-ids binary|text
+"""
+
+import click
+from app.extensions import db
+from app.models.types import convert_key_columns, ID_STORAGES
+from app.services import facade
+
+
+def register_commands(app):
+    """Enregistre les commandes `flask ...` de l'application."""
+
+    @app.cli.command("backfill-geohash")
+    @click.option("--batch-size", default=1000, show_default=True,
+                  help="Nombre de lieux mis à jour par COMMIT")
+    def backfill_geohash(batch_size):
+        """Calcule le geohash des lieux créés avant la migration 006."""
+        updated = facade.backfill_geohashes(batch_size)
+        click.echo(f"{updated} place(s) updated")
+
+    @app.cli.command("convert-ids")
+    @click.argument("storage", type=click.Choice(ID_STORAGES))
+    def convert_ids(storage):
+        """Réécrit les clés de la base en texte ou sur 16 octets (SQLite)."""
+        try:
+            converted = convert_key_columns(db.engine, db.metadata, storage)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"{converted} key value(s) converted, set ID_STORAGE = \"{storage}\"")
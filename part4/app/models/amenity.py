@@ -6,12 +6,13 @@ Contient également la table d'association many-to-many avec Place.
 
 from app.extensions import db
 from app.models.base import BaseModel
+from app.models.types import UUIDKey
 
 # Table d'association many-to-many entre Place et Amenity
 place_amenity = db.Table(
     'place_amenity',
-    db.Column('place_id', db.String(60), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(60), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('place_id', UUIDKey, db.ForeignKey('places.id'), primary_key=True),
+    db.Column('amenity_id', UUIDKey, db.ForeignKey('amenities.id'), primary_key=True)
 )
 
 
@@ -32,11 +33,12 @@ class Amenity(BaseModel):
     name = db.Column(db.String(50), nullable=False)
 
     # Relation vers Place (many-to-many, via table d'association)
+    # Chargée à la demande : charger une commodité ne charge pas ses lieux
     places = db.relationship(
         "Place",
         secondary=place_amenity,
         back_populates="amenities",
-        lazy="subquery"
+        lazy="select"
     )
 
     def validate_name(self, value, field_name):
@@ -6,18 +6,71 @@ Cette classe est commune à toutes les entités métiers (User, Place, Review, A
 Elle est conçue pour être compatible avec SQLAlchemy et ne génère pas de table directe.
 
 Rôles :
-- Fournir un identifiant UUID
+- Fournir un identifiant UUID (version 7, ordonné dans le temps)
 - Gérer les timestamps created_at / updated_at
 - Fournir des méthodes utilitaires : save(), update(), to_dict()
 """
 
 # 🔧 Imports nécessaires
-# uuid : pour générer un identifiant unique
+# uuid, secrets, time : pour générer un identifiant unique ordonné dans le temps
 # datetime : pour stocker des horodatages
 # db : instance SQLAlchemy (importée depuis app/extensions)
+import secrets
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
+from sqlalchemy.orm import declared_attr
 from app.extensions import db
+from app.models.types import UUIDKey
+
+
+# État du générateur UUIDv7 : dernier horodatage (ms) et compteur associé
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+
+def uuid7():
+    """
+    Génère un UUID version 7 (RFC 9562) : les 48 premiers bits sont
+    l'horodatage Unix en millisecondes, les suivants sont aléatoires.
+
+    Les UUID générés par le processus sont strictement croissants : dans
+    une même milliseconde, les 12 bits suivant l'horodatage servent de
+    compteur (initialisé au hasard) ; s'il déborde, l'horodatage est
+    avancé d'une milliseconde.
+    """
+    global _uuid7_last_ms, _uuid7_counter
+    with _uuid7_lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _uuid7_last_ms:
+            _uuid7_last_ms = timestamp_ms
+            _uuid7_counter = secrets.randbits(11)  # marge pour incrémenter
+        else:
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                _uuid7_last_ms += 1
+                _uuid7_counter = secrets.randbits(11)
+        timestamp_ms, counter = _uuid7_last_ms, _uuid7_counter
+
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76                      # version
+    value |= counter << 64
+    value |= 0b10 << 62                     # variante RFC 9562
+    value |= secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+
+def generate_id():
+    """
+    Génère un nouvel identifiant d'entité (UUIDv7 sous forme de chaîne).
+
+    Triés comme chaînes, ces identifiants suivent l'ordre de création :
+    les insertions se font en fin d'index de clé primaire. Les identifiants
+    UUIDv4 déjà en base restent valides (même format, 36 caractères).
+    """
+    return str(uuid7())
 
 
 class BaseModel(db.Model):
@@ -33,10 +86,23 @@ class BaseModel(db.Model):
     # Indique à SQLAlchemy de ne pas créer de table pour ce modèle
     __abstract__ = True
 
+    @declared_attr.directive
+    def __table_args__(cls):
+        """
+        Index ordonné (created_at, id) sur chaque table, utilisé par la
+        pagination keyset des listes (voir persistence/pagination.py), et
+        index sur updated_at pour lire max(updated_at) sans parcourir la
+        table (versions des requêtes conditionnelles HTTP).
+        """
+        return (
+            db.Index(f"ix_{cls.__tablename__}_created_at_id", "created_at", "id"),
+            db.Index(f"ix_{cls.__tablename__}_updated_at", "updated_at"),
+        )
+
     # colonne id
-    id = db.Column(db.String(36),
+    id = db.Column(UUIDKey,
                    primary_key=True,
-                   default=lambda: str(uuid.uuid4()))
+                   default=generate_id)
     # created_at
     created_at = db.Column(db.DateTime,
                            default=lambda: datetime.now(timezone.utc))
@@ -45,6 +111,13 @@ class BaseModel(db.Model):
                            default=lambda: datetime.now(timezone.utc),
                            onupdate=lambda: datetime.now(timezone.utc))
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # L'identifiant est attribué dès la construction, et non au flush :
+        # il est connu avant le COMMIT différé d'une unité de travail.
+        if self.id is None:
+            self.id = generate_id()
+
     def save(self):
         """
         Met à jour manuellement la date de dernière modification (updated_at).
@@ -4,8 +4,13 @@ Modèle SQLAlchemy enrichi représentant un lieu (hébergement) dans HBnB.
 Hérite de BaseModel qui fournit id, created_at, updated_at.
 """
 
+from sqlalchemy import case, cast, event, func, inspect, Float
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
 from app.models.base import BaseModel
+from app.models.types import UUIDKey
+from app.persistence.geo import encode_geohash, GEOHASH_PRECISION
 # Import requis pour les ForeignKey vers User et la table d'association Place-Amenity
 from app.models.amenity import place_amenity
 
@@ -21,20 +26,41 @@ class Place(BaseModel):
     - latitude (float) : latitude géographique (facultatif)
     - longitude (float) : longitude géographique (facultatif)
     - image_url (string) : url de l'image (facultatif)
+    - geohash (str) : geohash des coordonnées, calculé à l'écriture (index
+      de la recherche géographique, voir persistence/geo.py)
+
+    Agrégats des avis (dénormalisés, tenus à jour par la facade dans la même
+    transaction que l'avis) :
+    - review_count (int) : nombre d'avis
+    - rating_sum (int) : somme des notes
+    - rating_count_1 ... rating_count_5 (int) : histogramme des notes
     """
 
+    # Notes possibles pour un avis
+    RATING_VALUES = range(1, 6)
+
     __tablename__ = "places"
 
     # Colonnes de base
-    title = db.Column(db.String(100), nullable=False)
+    title = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.String, nullable=False)
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
     image_url = db.Column(db.String(255), nullable=True)
+    geohash = db.Column(db.String(GEOHASH_PRECISION), nullable=True, index=True)
+
+    # Agrégats des avis (lecture de la moyenne et de la distribution en O(1))
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_count_1 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_count_2 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_count_3 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_count_4 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_count_5 = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # Clé étrangère vers User (relation User → Place)
-    user_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(UUIDKey, db.ForeignKey('users.id'), nullable=False, index=True)
 
     # Relation Place → Review (un-à-plusieurs)
     reviews = db.relationship(
@@ -94,6 +120,92 @@ class Place(BaseModel):
             raise ValueError(f"{field_name} must be between -180.0 and 180.0")
         return value
 
+    # ========== AGRÉGATS DES AVIS ==========
+
+    @hybrid_property
+    def average_rating(self):
+        """Note moyenne du lieu, ou None s'il n'a aucun avis."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @average_rating.expression
+    def average_rating(cls):
+        # Même calcul côté SQL : utilisable dans ORDER BY / WHERE
+        return case(
+            (cls.review_count > 0, cast(cls.rating_sum, Float) / cls.review_count),
+            else_=None
+        )
+
+    @hybrid_property
+    def rating_score(self):
+        """Note moyenne, 0 pour un lieu sans avis (clé de tri ?sort=rating)."""
+        return self.average_rating or 0.0
+
+    @rating_score.expression
+    def rating_score(cls):
+        return func.coalesce(cls.average_rating, 0.0)
+
+    @property
+    def rating_distribution(self):
+        """Histogramme des notes : {"1": n1, ..., "5": n5}."""
+        return {
+            str(value): getattr(self, f"rating_count_{value}") or 0
+            for value in self.RATING_VALUES
+        }
+
+    def rating_summary(self):
+        """Résumé des notes exposé par l'API."""
+        return {
+            "average": self.average_rating,
+            "count": self.review_count or 0,
+            "distribution": self.rating_distribution
+        }
+
+    def record_rating_change(self, added=None, removed=None):
+        """
+        Répercute l'ajout, la suppression ou la modification d'une note
+        sur les agrégats du lieu.
+
+        Les incréments sont écrits sous forme d'expressions SQL
+        (review_count = review_count + 1) : deux avis enregistrés en même
+        temps sur le même lieu ne s'écrasent pas.
+
+        Paramètres :
+        - added (int) : note ajoutée (nouvel avis ou nouvelle note)
+        - removed (int) : note retirée (avis supprimé ou ancienne note)
+        """
+        for value in (added, removed):
+            if value is not None and value not in self.RATING_VALUES:
+                raise ValueError("Rating must be between 1 and 5")
+        if added == removed:
+            return
+
+        count_delta = (added is not None) - (removed is not None)
+        self._increment("review_count", count_delta)
+        self._increment("rating_sum", (added or 0) - (removed or 0))
+        if added is not None:
+            self._increment(f"rating_count_{added}", 1)
+        if removed is not None:
+            self._increment(f"rating_count_{removed}", -1)
+
+    def _increment(self, column, delta):
+        """
+        Ajoute delta à une colonne d'agrégat :
+        - lieu déjà en base : expression SQL (colonne = colonne + delta),
+          composée avec un incrément encore en attente du même flush ;
+        - lieu pas encore inséré : simple addition en Python.
+        """
+        if not delta:
+            return
+        pending = self.__dict__.get(column)
+        if isinstance(pending, ClauseElement):
+            setattr(self, column, pending + delta)
+        elif inspect(self).has_identity:
+            setattr(self, column, getattr(type(self), column) + delta)
+        else:
+            setattr(self, column, (pending or 0) + delta)
+
     # ========== MÉTHODES MÉTIER ==========
 
     def update(self, **kwargs):
@@ -122,3 +234,22 @@ class Place(BaseModel):
             f"Price: {self.price} credits/night\n"
             f"Location: ({self.latitude}, {self.longitude})"
         )
+
+
+@event.listens_for(Place, "before_insert")
+@event.listens_for(Place, "before_update")
+def _sync_geohash(mapper, connection, place):
+    """Recalcule le geohash quand les coordonnées d'un lieu changent."""
+    state = inspect(place)
+    if state.has_identity and not (state.attrs.latitude.history.has_changes()
+                                   or state.attrs.longitude.history.has_changes()):
+        return
+    if place.latitude is None or place.longitude is None:
+        place.geohash = None
+    else:
+        place.geohash = encode_geohash(place.latitude, place.longitude)
+
+
+# Index des listes de lieux filtrées (?min_price=&max_price=) ou triées
+# par prix (?sort=price), dans l'ordre de la pagination keyset
+db.Index("ix_places_price_id", Place.price, Place.id)
@@ -0,0 +1,29 @@
+"""models/refresh_session.py
+
+Sessions ouvertes par une connexion : chacune est une famille de jetons
+de rafraîchissement dont un seul, le dernier émis (current_jti), est
+utilisable. Voir persistence/refresh_sessions.py.
+"""
+
+from app.extensions import db
+from app.models.types import UUIDKey
+
+
+class RefreshSession(db.Model):
+    """
+    Session de rafraîchissement.
+
+    Attributs :
+    - id (str) : identifiant de la famille (claim family des jetons)
+    - user_id (str) : utilisateur de la session
+    - current_jti (str) : jti du seul jeton de rafraîchissement valide
+    - expires_at (int) : expiration de ce jeton (secondes depuis l'epoch) ;
+      la session est purgée au-delà
+    """
+
+    __tablename__ = "refresh_sessions"
+
+    id = db.Column(UUIDKey, primary_key=True)
+    user_id = db.Column(UUIDKey, nullable=False, index=True)
+    current_jti = db.Column(db.String(36), nullable=False)
+    expires_at = db.Column(db.Integer, nullable=False, index=True)
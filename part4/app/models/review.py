@@ -6,6 +6,7 @@ Hérite de BaseModel. Cette version mappe les relations avec User et Place.
 
 from app import db
 from app.models.base import BaseModel
+from app.models.types import UUIDKey
 
 
 class Review(BaseModel):
@@ -29,14 +30,16 @@ class Review(BaseModel):
     text = db.Column(db.String(500), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
 
-    user_id = db.Column(db.String(60), db.ForeignKey("users.id"), nullable=False)
-    place_id = db.Column(db.String(60), db.ForeignKey("places.id"), nullable=False)
+    user_id = db.Column(UUIDKey, db.ForeignKey("users.id"), nullable=False, index=True)
+    place_id = db.Column(UUIDKey, db.ForeignKey("places.id"), nullable=False, index=True)
 
     # Les relations sont gérées via backref (dans User et Place), donc rien à définir ici
 
     # ========== VALIDATIONS ==========
 
-    def validate_text(self, value, field_name):
+    # Sans instance : la facade valide les données avant de créer l'avis
+    @staticmethod
+    def validate_text(value, field_name):
         if not isinstance(value, str):
             raise TypeError(f"{field_name} must be a string")
         value = value.strip()
@@ -46,7 +49,8 @@ class Review(BaseModel):
             raise ValueError(f"{field_name} must be at most 500 characters")
         return value
 
-    def validate_rating(self, value, field_name):
+    @staticmethod
+    def validate_rating(value, field_name):
         if not isinstance(value, int):
             raise TypeError(f"{field_name} must be an integer")
         if not (1 <= value <= 5):
@@ -101,3 +105,9 @@ class Review(BaseModel):
                 "last_name": self.author.last_name,
             } if self.author else None
         }
+
+
+# Index des avis d'un lieu dans l'ordre de la pagination keyset :
+# du plus récent au plus ancien, ou par note
+db.Index("ix_reviews_place_id_created_at", Review.place_id, Review.created_at, Review.id)
+db.Index("ix_reviews_place_id_rating", Review.place_id, Review.rating, Review.created_at)
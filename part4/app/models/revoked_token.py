@@ -0,0 +1,32 @@
+"""models/revoked_token.py
+
+Jetons JWT révoqués avant leur expiration (déconnexion, révocation par un
+admin), identifiés par leur claim jti.
+
+Une ligne n'a plus d'utilité après l'expiration du jeton (expires_at,
+claim exp) : elle est alors purgée. Voir persistence/revocation.py.
+"""
+
+from app.extensions import db
+from app.models.types import UUIDKey
+
+
+class RevokedToken(db.Model):
+    """
+    Jeton révoqué.
+
+    Attributs :
+    - jti (str) : identifiant unique du jeton
+    - user_id (str) : utilisateur du jeton, pour information (texte, sans
+      clé étrangère : la révocation survit à la suppression de l'utilisateur)
+    - expires_at (int) : expiration du jeton (secondes depuis l'epoch)
+    - revoked_at (float) : date de la révocation (secondes depuis l'epoch),
+      utilisée pour la synchronisation entre processus
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(UUIDKey, nullable=True)
+    expires_at = db.Column(db.Integer, nullable=False, index=True)
+    revoked_at = db.Column(db.Float, nullable=False, index=True)
@@ -0,0 +1,152 @@
+"""models/types.py
+
+Type SQLAlchemy des clés (primaires et étrangères) de l'application HBnB.
+
+Côté Python, un identifiant est toujours la chaîne UUID canonique
+("0192a3b4-...") : c'est elle qui circule dans la facade, l'API et les
+jetons. Le stockage en base dépend de la configuration ID_STORAGE :
+
+- "text"   : chaîne de 36 caractères (stockage historique)
+- "binary" : 16 octets (index et jointures plus compacts)
+
+Le mode est propre à chaque moteur (voir configure_id_storage) : il est
+fixé dans create_app, avant toute requête. Une base existante passe d'un
+mode à l'autre avec `flask --app run convert-ids binary|text`.
+"""
+
+import uuid
+from sqlalchemy import LargeBinary, String, inspect, text
+from sqlalchemy.types import BINARY, TypeDecorator
+
+ID_STORAGES = ("text", "binary")
+
+# Attribut posé sur le dialecte du moteur : le mode de stockage des clés
+_STORAGE_ATTRIBUTE = "hbnb_id_storage"
+
+
+def configure_id_storage(engine, storage):
+    """Choisit le stockage des clés ("text" ou "binary") pour un moteur."""
+    if storage not in ID_STORAGES:
+        raise ValueError(f"ID_STORAGE must be one of: {', '.join(ID_STORAGES)}")
+    setattr(engine.dialect, _STORAGE_ATTRIBUTE, storage)
+
+
+def is_binary(dialect):
+    return getattr(dialect, _STORAGE_ATTRIBUTE, "text") == "binary"
+
+
+def id_to_bytes(value):
+    """Chaîne UUID -> 16 octets (None si la chaîne n'est pas un UUID)."""
+    try:
+        return uuid.UUID(value).bytes
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def id_to_string(value):
+    """16 octets -> chaîne UUID canonique."""
+    return str(uuid.UUID(bytes=bytes(value)))
+
+
+class UUIDKey(TypeDecorator):
+    """
+    Identifiant UUID stocké en texte ou sur 16 octets selon le moteur.
+
+    En mode binaire, une chaîne qui n'est pas un UUID est liée comme NULL :
+    une recherche ne trouve rien (404 côté API) et une écriture échoue sur
+    la contrainte NOT NULL de la colonne.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if not is_binary(dialect):
+            return dialect.type_descriptor(String(36))
+        if dialect.name in ("mysql", "mariadb"):
+            return dialect.type_descriptor(BINARY(16))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not is_binary(dialect):
+            return value
+        return id_to_bytes(value)
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return id_to_string(value)
+        return value
+
+
+# Copies de clés hors des modèles (ex : place_id de l'index FTS5 des
+# lieux), remises à jour depuis les tables converties à la fin de la
+# conversion si leur table existe : [(table, requête SQL)]
+KEY_COPIES = []
+
+
+def key_columns(metadata):
+    """Colonnes de type UUIDKey de toutes les tables : [(table, colonne)]."""
+    return [(table.name, column.name)
+            for table in metadata.sorted_tables
+            for column in table.columns
+            if isinstance(column.type, UUIDKey)]
+
+
+def convert_key_columns(engine, metadata, storage, batch_size=1000):
+    """
+    Réécrit les clés existantes dans le mode de stockage demandé, en une
+    transaction. Les valeurs déjà converties sont ignorées : la conversion
+    peut être relancée. Réservé à SQLite, où les colonnes acceptent le
+    texte comme les octets sans changement de schéma.
+    Retourne le nombre de valeurs réécrites.
+    """
+    if storage not in ID_STORAGES:
+        raise ValueError(f"ID_STORAGE must be one of: {', '.join(ID_STORAGES)}")
+    if engine.dialect.name != "sqlite":
+        raise ValueError("Key conversion is only supported on SQLite")
+
+    with engine.connect() as connection:
+        # Clés primaires et étrangères changent l'une après l'autre : le
+        # contrôle est suspendu (hors transaction, seul moment où le PRAGMA
+        # agit) puis refait en entier avant le COMMIT
+        foreign_keys = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        try:
+            converted = _convert(connection, metadata, storage, batch_size)
+            existing = set(inspect(connection).get_table_names())
+            for table, statement in KEY_COPIES:
+                if table in existing:
+                    connection.exec_driver_sql(statement)
+            if connection.exec_driver_sql("PRAGMA foreign_key_check").first() is not None:
+                raise ValueError("Foreign key check failed after conversion")
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.exec_driver_sql(f"PRAGMA foreign_keys = {foreign_keys}")
+    return converted
+
+
+def _convert(connection, metadata, storage, batch_size):
+    converted = 0
+    for table, column in key_columns(metadata):
+        values = connection.execute(
+            text(f'SELECT DISTINCT "{column}" FROM "{table}" WHERE "{column}" IS NOT NULL')
+        ).scalars().all()
+        changes = []
+        for value in values:
+            if storage == "binary" and isinstance(value, str):
+                new = id_to_bytes(value)
+                if new is None:
+                    raise ValueError(f"{table}.{column}: '{value}' is not a UUID")
+            elif storage == "text" and isinstance(value, bytes):
+                new = id_to_string(value)
+            else:
+                continue
+            changes.append({"old": value, "new": new})
+        statement = text(f'UPDATE "{table}" SET "{column}" = :new WHERE "{column}" = :old')
+        for start in range(0, len(changes), batch_size):
+            connection.execute(statement, changes[start:start + batch_size])
+        converted += len(changes)
+    return converted
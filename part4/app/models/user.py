@@ -9,8 +9,8 @@ liés à l'identité de l'utilisateur.
 import re
 from app.extensions import db
 from app.models.base import BaseModel
-from flask_bcrypt import Bcrypt  # Import nécessaire pour les méthodes de hachage
-bcrypt = Bcrypt()
+# Hachage bcrypt déporté (coût configurable, pool de processus)
+from app.services.passwords import password_hasher
 
 
 class User(BaseModel):
@@ -111,18 +111,19 @@ class User(BaseModel):
         if not re.search(r"[^\w\s]", password):
             raise ValueError("Password must contain at least one special character")
 
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = password_hasher.hash(password)
         self.save()
 
     def verify_password(self, password):
         """
         Vérifie si le mot de passe en clair correspond au hash stocké.
+        Lève PasswordHasherBusy si trop de vérifications sont en attente.
         """
         if not self.password:
             raise ValueError("Password is not set")
         if not isinstance(password, str):
             raise TypeError("Password must be a string")
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
 
     def __repr__(self):
         """Représentation technique de l'utilisateur (debug)."""
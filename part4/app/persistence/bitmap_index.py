@@ -0,0 +1,192 @@
+"""persistence/bitmap_index.py
+
+Index bitmap des commodités des lieux (filtre ?amenities=id1,id2).
+
+Chaque lieu reçoit un numéro de ligne (0, 1, 2...) et chaque commodité
+un bitmap : un entier Python dont le bit n vaut 1 si le lieu n°n possède
+la commodité. « Lieux avec WiFi ET Piscine » se calcule alors par un ET
+binaire entre deux entiers, sans jointure sur place_amenity par lieu.
+
+L'index est construit à la première utilisation à partir de la table
+place_amenity (une requête), puis tenu à jour par les écritures de
+l'ORM : les ajouts/retraits dans Place.amenities (ou Amenity.places)
+et les suppressions de lieux ou de commodités sont relevés au flush et
+appliqués après le COMMIT (rien n'est appliqué en cas de ROLLBACK, ni
+pour un SAVEPOINT annulé).
+
+Il vit dans la mémoire du processus : les écritures faites par un autre
+processus (autre worker, INSERT SQL direct) n'y sont visibles qu'après
+reconstruction, faite au plus tard max_age secondes après la précédente,
+hors du verrou des lectures (voir memory_index.py).
+"""
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.place import Place
+from app.models.amenity import Amenity, place_amenity
+from app.persistence.memory_index import InMemoryIndex
+from app.persistence.unit_of_work import after_commit
+
+# Index dont les modifications sont relevées par les listeners de session
+_indexes = []
+
+
+class AmenityBitmapIndex(InMemoryIndex):
+    """
+    Bitmaps des commodités par lieu.
+
+    Paramètres :
+    - max_age (int) : durée (secondes) au-delà de laquelle l'index est
+      reconstruit depuis la base à la prochaine lecture (None : jamais)
+    """
+
+    def __init__(self, max_age=300):
+        super().__init__(max_age)
+        _indexes.append(self)
+
+    def configure(self, max_age):
+        """Change la durée de vie et vide l'index (appelé par create_app)."""
+        with self._lock:
+            self.max_age = max_age
+            self._reset()
+            self._built_at = None
+
+    def _reset(self):
+        self._rows = {}        # id de lieu -> numéro de ligne
+        self._place_ids = []   # numéro de ligne -> id de lieu (None si supprimé)
+        self._bitmaps = {}     # id de commodité -> bitmap des lignes
+
+    def invalidate(self):
+        """Force la reconstruction de l'index à la prochaine lecture."""
+        with self._lock:
+            self._reset()
+            self._built_at = None
+
+    # ---------- construction ----------
+
+    def _load_rows(self):
+        return db.session.execute(
+            select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+        ).all()
+
+    def _build(self, rows):
+        # Lignes de chaque commodité, converties en entier une seule fois
+        # (un OU par couple recopierait le bitmap entier à chaque fois)
+        rows_by_amenity = {}
+        for place_id, amenity_id in rows:
+            rows_by_amenity.setdefault(amenity_id, []).append(self._row(place_id))
+        size = (len(self._place_ids) + 7) // 8
+        for amenity_id, amenity_rows in rows_by_amenity.items():
+            bits = bytearray(size)
+            for row in amenity_rows:
+                bits[row >> 3] |= 1 << (row & 7)
+            self._bitmaps[amenity_id] = int.from_bytes(bits, "little")
+
+    def _row(self, place_id):
+        row = self._rows.get(place_id)
+        if row is None:
+            row = self._rows[place_id] = len(self._place_ids)
+            self._place_ids.append(place_id)
+        return row
+
+    def _add(self, place_id, amenity_id):
+        self._bitmaps[amenity_id] = self._bitmaps.get(amenity_id, 0) | (1 << self._row(place_id))
+
+    def _remove(self, place_id, amenity_id):
+        row = self._rows.get(place_id)
+        if row is not None and amenity_id in self._bitmaps:
+            self._bitmaps[amenity_id] &= ~(1 << row)
+
+    def _remove_place(self, place_id):
+        row = self._rows.pop(place_id, None)
+        if row is None:
+            return
+        self._place_ids[row] = None
+        mask = ~(1 << row)
+        for amenity_id in self._bitmaps:
+            self._bitmaps[amenity_id] &= mask
+
+    def _remove_amenity(self, amenity_id):
+        self._bitmaps.pop(amenity_id, None)
+
+    # ---------- lecture ----------
+
+    def places_with_all(self, amenity_ids):
+        """
+        Identifiants des lieux qui possèdent toutes les commodités données
+        (intersection des bitmaps), dans l'ordre des numéros de ligne.
+        """
+        self._ensure_built()
+        with self._lock:
+            bitmap = -1
+            for amenity_id in amenity_ids:
+                bitmap &= self._bitmaps.get(amenity_id, 0)
+                if not bitmap:
+                    return []
+            if bitmap == -1:
+                return []
+
+            place_ids = []
+            while bitmap:
+                lowest = bitmap & -bitmap
+                place_ids.append(self._place_ids[lowest.bit_length() - 1])
+                bitmap ^= lowest
+            return place_ids
+
+    def stats(self):
+        """Taille de l'index (exposée par /metrics)."""
+        with self._lock:
+            return {
+                "built": self._built_at is not None,
+                "places": len(self._rows),
+                "amenities": len(self._bitmaps),
+                "bitmap_bytes": sum((b.bit_length() + 7) // 8 for b in self._bitmaps.values())
+            }
+
+    # ---------- maintenance ----------
+
+    def apply(self, changes):
+        """
+        Applique des modifications relevées au flush :
+        ("add" | "remove", place_id, amenity_id), ("remove_place", place_id)
+        ou ("remove_amenity", amenity_id). Sans effet si l'index n'est pas
+        encore construit (il le sera depuis la base, déjà à jour).
+        """
+        self._apply(self._apply_changes, changes)
+
+    def _apply_changes(self, changes):
+        for action, *args in changes:
+            getattr(self, f"_{action}")(*args)
+
+
+def _collection_changes(session):
+    """Modifications de place_amenity contenues dans le flush en cours."""
+    changes = []
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Place):
+            history = inspect(obj).attrs.amenities.history
+            changes += [("add", obj.id, a.id) for a in history.added]
+            changes += [("remove", obj.id, a.id) for a in history.deleted]
+        elif isinstance(obj, Amenity):
+            history = inspect(obj).attrs.places.history
+            changes += [("add", p.id, obj.id) for p in history.added]
+            changes += [("remove", p.id, obj.id) for p in history.deleted]
+    for obj in session.deleted:
+        if isinstance(obj, Place):
+            changes.append(("remove_place", obj.id))
+        elif isinstance(obj, Amenity):
+            changes.append(("remove_amenity", obj.id))
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session, flush_context):
+    changes = _collection_changes(session)
+    if changes:
+        after_commit(lambda: _apply_changes(changes), session)
+
+
+def _apply_changes(changes):
+    for index in _indexes:
+        index.apply(changes)
@@ -0,0 +1,70 @@
+"""persistence/bloom.py
+
+Filtre de Bloom : ensemble probabiliste de taille fixe.
+
+Un élément ajouté est toujours reconnu ; un élément absent est reconnu à
+tort avec une probabilité error_rate (faux positif) tant que le filtre
+contient au plus capacity éléments. Le filtre occupe
+-capacity × ln(error_rate) / ln(2)² bits, quelle que soit la taille des
+éléments (~180 Ko pour 100 000 éléments à 0,1 %), et une recherche lit au
+plus k bits (k = 10 à 0,1 %) ; la plupart des absents sont écartés dès les
+premiers bits lus.
+
+Les positions des bits dérivent de hash() (double hachage de
+Kirsch-Mitzenmacher) : elles changent d'un processus à l'autre
+(PYTHONHASHSEED), le filtre n'est donc jamais partagé ni sauvegardé.
+On ne peut pas retirer un élément : le filtre se reconstruit.
+"""
+
+import math
+
+_MASK_32 = 0xFFFFFFFF
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom de chaînes.
+
+    Paramètres :
+    - capacity (int) : nombre d'éléments prévu
+    - error_rate (float) : taux de faux positifs visé à capacity éléments
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key):
+        h = hash(key)
+        size, bits = self.size, self._bits
+        position, step = (h & _MASK_32) % size, (h >> 32 & _MASK_32) | 1
+        for _ in range(self.hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+            position = (position + step) % size
+        self.count += 1
+
+    def __contains__(self, key):
+        # Chemin critique (appelé à chaque requête authentifiée) : premier
+        # bit testé avant d'entrer dans la boucle
+        h = hash(key)
+        size, bits = self.size, self._bits
+        position = (h & _MASK_32) % size
+        if not bits[position >> 3] >> (position & 7) & 1:
+            return False
+        step = (h >> 32 & _MASK_32) | 1
+        for _ in range(self.hashes - 1):
+            position = (position + step) % size
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def stats(self):
+        return {"capacity": self.capacity, "count": self.count, "bits": self.size,
+                "hashes": self.hashes, "bytes": len(self._bits)}
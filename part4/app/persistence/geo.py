@@ -0,0 +1,112 @@
+"""persistence/geo.py
+
+Outils de recherche géographique des lieux.
+
+Chaque lieu stocke le geohash de ses coordonnées (colonne places.geohash,
+index B-tree). Un geohash découpe la Terre en cellules imbriquées : tous
+les points d'une cellule partagent le même préfixe, et une cellule est donc
+une plage contiguë de l'index (geohash >= 'u09t' AND geohash < 'u09t{').
+Une zone de recherche est couverte par quelques cellules, ce qui limite la
+lecture de l'index aux lieux proches avant le filtrage exact.
+"""
+
+import math
+
+# Alphabet base32 des geohash, dans l'ordre ASCII (ordre de l'index)
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Précision stockée en base (12 caractères : cellule de quelques cm)
+GEOHASH_PRECISION = 12
+
+# Borne supérieure d'une plage de préfixe : '{' suit 'z' en ASCII
+PREFIX_END = "{"
+
+# Rayon moyen de la Terre et longueur d'un degré de latitude
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash d'un point (précision = nombre de caractères)."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """(largeur, hauteur) en degrés d'une cellule de geohash."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 360.0 / 2 ** lon_bits, 180.0 / 2 ** lat_bits
+
+
+def covering_cells(boxes, max_cells=16):
+    """
+    Préfixes de geohash couvrant les rectangles donnés, à la précision la
+    plus fine qui n'en demande pas plus de max_cells.
+
+    Paramètres :
+    - boxes : liste de (min_lon, min_lat, max_lon, max_lat), sans
+      franchissement de l'antiméridien (voir split_bbox)
+    """
+    best = [""]  # précision 0 : toute la Terre
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        width, height = cell_size(precision)
+        cells = set()
+        for min_lon, min_lat, max_lon, max_lat in boxes:
+            x0, x1 = int((min_lon + 180) // width), int(min((max_lon + 180) // width, 360 / width - 1))
+            y0, y1 = int((min_lat + 90) // height), int(min((max_lat + 90) // height, 180 / height - 1))
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > max_cells:
+                return best
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    cells.add(encode_geohash(-90 + (y + 0.5) * height,
+                                             -180 + (x + 0.5) * width, precision))
+        if len(cells) > max_cells:
+            return best
+        best = sorted(cells)
+    return best
+
+
+def split_bbox(min_lon, min_lat, max_lon, max_lat):
+    """Découpe en deux un rectangle qui franchit l'antiméridien (min_lon > max_lon)."""
+    if min_lon <= max_lon:
+        return [(min_lon, min_lat, max_lon, max_lat)]
+    return [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon, max_lat)]
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """Rectangle (min_lon, min_lat, max_lon, max_lat) englobant un cercle."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    cos_lat = math.cos(math.radians(latitude))
+    if min_lat <= -90 or max_lat >= 90 or cos_lat * 180 <= delta_lat:
+        # Le cercle contient un pôle : toutes les longitudes
+        return -180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0)
+    delta_lon = delta_lat / cos_lat
+    min_lon = (longitude - delta_lon + 180) % 360 - 180
+    max_lon = (longitude + delta_lon + 180) % 360 - 180
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distance orthodromique entre deux points, en kilomètres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -0,0 +1,111 @@
+"""persistence/memory_index.py
+
+Cycle de vie commun aux index en mémoire du processus (index inversé,
+autocomplétion, trigrammes) :
+- construction depuis la base à la première lecture ;
+- mises à jour appliquées après le COMMIT (abandonnées en cas de ROLLBACK),
+  ignorées tant que l'index n'est pas construit (il le sera depuis la
+  base, déjà à jour) ;
+- reconstruction au plus tard max_age secondes après la précédente, pour
+  voir les écritures des autres processus (None : jamais).
+
+La reconstruction (lecture de la base et remplissage de structures
+neuves) se fait hors du verrou, par un seul thread à la fois : les
+lectures continuent sur l'ancien index pendant ce temps, et seul
+l'échange des structures les bloque. Les mises à jour validées pendant
+la reconstruction sont rejouées sur les nouvelles structures.
+
+Une sous-classe fournit ses structures (_reset), les lignes lues en base
+(_load_rows) et l'ajout ou le retrait d'une ligne (_add, _remove).
+"""
+
+import threading
+import time
+from app.persistence.unit_of_work import after_commit
+
+
+class InMemoryIndex:
+    """
+    Base des index en mémoire. Les lectures des sous-classes appellent
+    _ensure_built(), puis consultent leurs structures sous self._lock.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()   # une reconstruction à la fois
+        self._built_at = None
+        self._replay = None   # mises à jour à rejouer après la reconstruction
+        self._reset()
+
+    # ---------- à fournir par les sous-classes ----------
+
+    def _reset(self):
+        """(Ré)initialise les structures vides de l'index."""
+        raise NotImplementedError
+
+    def _load_rows(self):
+        """Lignes lues en base, passées une à une à _add."""
+        raise NotImplementedError
+
+    def _add(self, *row):
+        """Ajoute ou remplace une ligne."""
+        raise NotImplementedError
+
+    def _remove(self, *key):
+        """Retire une ligne (sans effet si elle est absente)."""
+        raise NotImplementedError
+
+    def _build(self, rows):
+        """Remplit les structures vides ; redéfini si un chargement groupé est plus rapide."""
+        for row in rows:
+            self._add(*row)
+
+    # ---------- cycle de vie ----------
+
+    def _is_current(self):
+        return self._built_at is not None and (
+            self.max_age is None or time.monotonic() - self._built_at <= self.max_age)
+
+    def _ensure_built(self):
+        """
+        Construit l'index s'il ne l'est pas encore (les lecteurs attendent
+        la construction), ou le reconstruit s'il a expiré (un autre thread
+        qui reconstruit déjà laisse les lecteurs sur l'ancien index).
+        """
+        if self._is_current():
+            return
+        if not self._build_lock.acquire(blocking=self._built_at is None):
+            return
+        try:
+            if self._is_current():
+                return
+            with self._lock:
+                self._replay = []
+            rows = self._load_rows()
+            fresh = object.__new__(type(self))
+            fresh._reset()
+            fresh._build(rows)
+            with self._lock:
+                # Échange des structures, puis rattrapage des COMMIT récents
+                self.__dict__.update(vars(fresh))
+                for action, args in self._replay:
+                    action(*args)
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._replay = None
+            self._build_lock.release()
+
+    def _apply(self, action, *args):
+        with self._lock:
+            if self._built_at is not None:
+                action(*args)
+            if self._replay is not None:
+                self._replay.append((action, args))
+
+    def _add_after_commit(self, *row):
+        after_commit(lambda: self._apply(self._add, *row))
+
+    def _remove_after_commit(self, *key):
+        after_commit(lambda: self._apply(self._remove, *key))
@@ -0,0 +1,117 @@
+"""persistence/pagination.py
+
+Pagination par curseur (keyset) pour les repositories SQLAlchemy.
+
+Au lieu d'un OFFSET (qui oblige la base à parcourir toutes les lignes
+précédentes), chaque page reprend après les valeurs de tri de la dernière
+ligne renvoyée : WHERE (created_at, id) > (:created_at, :id).
+Avec un index sur les colonnes de tri, la page N coûte autant que la page 1.
+
+Le curseur transmis au client est opaque : c'est l'encodage base64 (URL-safe)
+d'une liste JSON des valeurs de tri de la dernière ligne.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_, DateTime
+
+# Taille de page par défaut et maximale acceptée par l'API
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Ordre par défaut : chronologique, id pour départager les ex-aequo
+DEFAULT_ORDER = (("created_at", False), ("id", False))
+
+
+def encode_cursor(values):
+    """
+    Encode une liste de valeurs de tri en curseur opaque.
+    Les datetime sont sérialisés au format ISO 8601.
+    """
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, expressions):
+    """
+    Décode un curseur produit par encode_cursor().
+
+    Paramètres :
+    - cursor (str) : curseur reçu du client
+    - expressions (list) : expressions SQLAlchemy des clés de tri, utilisées
+      pour reconvertir les valeurs (ex : chaîne ISO -> datetime)
+
+    Lève une ValueError si le curseur est invalide.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(expressions):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for expression, value in zip(expressions, values):
+        if value is not None and isinstance(expression.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def keyset_filter(keys, values):
+    """
+    Construit la condition "strictement après (values)" pour un tri
+    multi-colonnes, en respectant le sens (asc/desc) de chaque clé :
+    (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+    """
+    clauses = []
+    for i, (expression, descending) in enumerate(keys):
+        previous = [keys[j][0] == values[j] for j in range(i)]
+        after = expression < values[i] if descending else expression > values[i]
+        clauses.append(and_(*previous, after))
+    return or_(*clauses)
+
+
+def paginate(query, model, limit, after=None, order_by=DEFAULT_ORDER):
+    """
+    Renvoie une page de résultats triés selon order_by.
+
+    Paramètres :
+    - query : requête SQLAlchemy de départ (filtres, options de chargement...)
+    - model : classe du modèle, pour résoudre les noms d'attributs de tri
+    - limit (int) : nombre maximal d'éléments dans la page
+    - after (str) : curseur renvoyé par la page précédente (optionnel)
+    - order_by : séquence de (nom d'attribut, descendant) ; la dernière clé
+      doit être unique (ex : id) pour garantir un ordre total
+
+    Retour :
+    - (items, next_cursor) : next_cursor vaut None s'il n'y a plus de page
+    """
+    keys = [(getattr(model, name), descending) for name, descending in order_by]
+
+    if after:
+        values = decode_cursor(after, [expression for expression, _ in keys])
+        query = query.filter(keyset_filter(keys, values))
+
+    query = query.order_by(*[
+        expression.desc() if descending else expression.asc()
+        for expression, descending in keys
+    ])
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, name) for name, _ in order_by])
+    return rows, next_cursor
@@ -0,0 +1,91 @@
+"""persistence/refresh_sessions.py
+
+Rotation des jetons de rafraîchissement et détection de leur réutilisation.
+
+Une connexion ouvre une session (famille) et reçoit un jeton de
+rafraîchissement. Chaque appel à /auth/refresh l'échange contre un
+nouveau jeton de la même famille : seul le dernier émis est accepté,
+par une mise à jour conditionnelle (UPDATE ... WHERE current_jti = ?)
+atomique entre workers.
+
+Présenter un jeton déjà échangé signifie qu'il a été copié (ou qu'un
+client rejoue une ancienne réponse) : la session entière est fermée,
+pour le voleur comme pour l'utilisateur, qui devra se reconnecter. Les
+jetons d'accès déjà émis restent valides jusqu'à leur expiration
+(courte, JWT_ACCESS_TOKEN_EXPIRES).
+"""
+
+import threading
+import time
+from sqlalchemy import delete, inspect, update
+from app.extensions import db
+from app.models.refresh_session import RefreshSession
+from app.persistence.unit_of_work import commit_unless_in_unit_of_work
+
+
+class RefreshSessionStore:
+    """Sessions de rafraîchissement (table refresh_sessions) et compteurs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def check_schema(self):
+        """Échoue au démarrage (create_app) si la table refresh_sessions manque."""
+        if not inspect(db.engine).has_table(RefreshSession.__tablename__):
+            raise RuntimeError("Table refresh_sessions is missing: "
+                               "apply SQL/migrations/010_refresh_sessions.sql")
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts = {"started": 0, "rotated": 0, "reuse_detected": 0, "ended": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def start(self, family, user_id, jti, expires_at):
+        """
+        Ouvre la session family avec son premier jeton et purge les
+        sessions expirées.
+        """
+        db.session.execute(delete(RefreshSession).where(RefreshSession.expires_at <= time.time()))
+        db.session.add(RefreshSession(id=family, user_id=user_id, current_jti=jti,
+                                      expires_at=int(expires_at)))
+        commit_unless_in_unit_of_work()
+        self._count("started")
+
+    def rotate(self, family, jti, new_jti, expires_at):
+        """
+        Remplace le jeton courant jti de la session par new_jti.
+        Retourne True si jti était le jeton courant. Sinon la session est
+        fermée s'il s'agit d'une réutilisation, et False est retourné.
+        """
+        replaced = db.session.execute(
+            update(RefreshSession)
+            .where(RefreshSession.id == family, RefreshSession.current_jti == jti,
+                   RefreshSession.expires_at > time.time())
+            .values(current_jti=new_jti, expires_at=int(expires_at))
+        ).rowcount == 1
+        if not replaced and db.session.get(RefreshSession, family) is not None:
+            # Jeton déjà échangé : la famille est compromise
+            self.end(family)
+            self._count("reuse_detected")
+            return False
+        commit_unless_in_unit_of_work()
+        if replaced:
+            self._count("rotated")
+        return replaced
+
+    def end(self, family):
+        """Ferme la session family (déconnexion, révocation, réutilisation)."""
+        ended = db.session.execute(
+            delete(RefreshSession).where(RefreshSession.id == family)
+        ).rowcount
+        commit_unless_in_unit_of_work()
+        if ended:
+            self._count("ended")
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
@@ -1,9 +1,47 @@
+import math
 from abc import ABC, abstractmethod
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import joinedload, lazyload, load_only, selectinload
 from app.extensions import db
+from app.persistence.pagination import paginate, DEFAULT_ORDER
+from app.persistence.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.persistence.geo import covering_cells, haversine_km, KM_PER_DEGREE, PREFIX_END
+from app.persistence.unit_of_work import commit_unless_in_unit_of_work
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
-from app.models.amenity import Amenity
+from app.models.amenity import Amenity, place_amenity
+
+# Relations de Place qui peuvent être incluses dans les réponses de l'API
+PLACE_RELATIONS = ("owner", "amenities", "reviews")
+
+# Ordres de tri des avis d'un lieu (?sort=) : clés de pagination keyset,
+# suivies de l'id pour un ordre total
+REVIEW_ORDERS = {
+    "-date": (("created_at", True), ("id", True)),
+    "date": (("created_at", False), ("id", False)),
+    "-rating": (("rating", True), ("created_at", True), ("id", True)),
+    "rating": (("rating", False), ("created_at", True), ("id", True)),
+}
+DEFAULT_REVIEW_SORT = "-date"
+
+# Colonnes de Place lues pour le champ "rating" (agrégats de notes)
+RATING_COLUMNS = ("review_count", "rating_sum",
+                  *(f"rating_count_{value}" for value in Place.RATING_VALUES))
+
+# Ordres de tri des listes de lieux (?sort=) : clés de pagination keyset,
+# suivies de l'id pour un ordre total
+PLACE_ORDERS = {
+    "created": DEFAULT_ORDER,
+    "price": (("price", False), ("id", False)),
+    "-price": (("price", True), ("id", True)),
+    "rating": (("rating_score", False), ("id", False)),
+    "-rating": (("rating_score", True), ("id", True)),
+}
+DEFAULT_PLACE_SORT = "created"
+
+# Nombre maximal d'identifiants passés dans un filtre IN (...)
+MAX_IN_IDS = 900
 
 
 class Repository(ABC):
@@ -15,10 +53,18 @@ class Repository(ABC):
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, limit, after=None):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -36,38 +82,115 @@ class SQLAlchemyRepository(Repository):
     """
     Implémentation générique d’un repository basé sur SQLAlchemy.
     Gère les opérations CRUD standard pour n’importe quel modèle SQLAlchemy.
+
+    Chaque écriture est validée immédiatement, sauf à l'intérieur d'une
+    unité de travail (voir persistence/unit_of_work.py) où le COMMIT est
+    différé à la fin de l'opération métier.
     """
     def __init__(self, model):
         self.model = model
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        commit_unless_in_unit_of_work()
+
+    def add_all(self, objs):
+        """
+        Ajoute plusieurs objets en une fois. Les objets d'un même modèle
+        sont insérés par lots (INSERT multi-lignes) au flush.
+        """
+        db.session.add_all(objs)
+        commit_unless_in_unit_of_work()
 
     def get(self, obj_id):
         return self.model.query.get(obj_id)
 
+    def get_for_update(self, obj_id):
+        """
+        Relit un objet en base avant de le modifier : ses colonnes écrasent
+        celles d'une instance déjà présente dans la session (reconstruite
+        depuis le cache, peut-être périmée), et la ligne est verrouillée
+        jusqu'au COMMIT (SELECT ... FOR UPDATE, sans effet sur SQLite).
+        """
+        return db.session.get(self.model, obj_id, populate_existing=True,
+                              with_for_update=True)
+
+    def get_many(self, obj_ids):
+        """
+        Récupère en une seule requête (WHERE id IN (...)) les objets dont
+        l'id figure dans obj_ids.
+
+        Retour :
+        - dict {id: objet} ; les ids inconnus sont absents du dictionnaire
+        """
+        obj_ids = set(obj_ids)
+        if not obj_ids:
+            return {}
+        objs = self.model.query.filter(self.model.id.in_(obj_ids)).all()
+        return {obj.id: obj for obj in objs}
+
     def get_all(self):
         return self.model.query.all()
 
+    def get_page(self, limit, after=None, query=None, order_by=DEFAULT_ORDER):
+        """
+        Récupère une page d'objets par pagination keyset (curseur).
+
+        Paramètres :
+        - limit (int) : taille de la page
+        - after (str) : curseur de la page précédente (optionnel)
+        - query : requête de départ (par défaut, toute la table)
+        - order_by : clés de tri, par défaut (created_at, id)
+
+        Retour :
+        - (items, next_cursor)
+        """
+        if query is None:
+            query = self.model.query
+        return paginate(query, self.model, limit, after, order_by)
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if not obj:
             return None
         for key, value in data.items():
             setattr(obj, key, value)
-        db.session.commit()
+        commit_unless_in_unit_of_work()
         return obj
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit_unless_in_unit_of_work()
 
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
 
+    def get_version(self, obj_id):
+        """
+        Version d'un objet pour les requêtes conditionnelles HTTP : sa date
+        de dernière modification, lue sans charger la ligne.
+
+        Retour :
+        - (updated_at,) ou None si l'objet n'existe pas
+        """
+        row = db.session.query(self.model.updated_at).filter(self.model.id == obj_id).first()
+        return None if row is None else tuple(row)
+
+    def get_collection_version(self, **filters):
+        """
+        Version d'une collection : (max(updated_at), nombre de lignes), en
+        une requête d'agrégat (index sur updated_at). Le nombre de lignes
+        change aussi quand une ligne est supprimée.
+
+        Paramètres :
+        - filters : égalités restreignant la collection (ex : place_id=...)
+        """
+        return tuple(db.session.query(
+            func.max(self.model.updated_at), func.count(self.model.id)
+        ).filter_by(**filters).one())
+
 
 class UserRepository(SQLAlchemyRepository):
     """
@@ -89,16 +212,294 @@ class UserRepository(SQLAlchemyRepository):
         """
         return self.model.query.filter_by(email=email).first()
 
+    def get_status(self, user_id):
+        """
+        Droits d'un utilisateur, sans charger l'objet : is_admin (bool),
+        ou None si l'utilisateur n'existe pas.
+        """
+        row = db.session.execute(select(User.is_admin).where(User.id == user_id)).first()
+        return None if row is None else bool(row.is_admin)
+
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Place)
 
+    def query_with_relations(self, embed=PLACE_RELATIONS, fields=None, sort=DEFAULT_PLACE_SORT):
+        """
+        Construit une requête sur Place qui charge d'avance les relations
+        demandées, en un nombre fixe de requêtes SQL :
+        - owner : jointure dans la requête principale
+        - amenities : une requête SELECT ... IN
+        - reviews puis review.author : une requête SELECT ... IN chacune
+        Les relations absentes de embed ne sont pas chargées du tout.
+
+        Paramètres :
+        - embed : noms des relations à charger (par défaut, toutes)
+        - fields : champs exposés par l'API (ex : "title", "rating") ; si
+          fourni, seules les colonnes correspondantes sont lues
+        - sort : clé de PLACE_ORDERS, dont les colonnes sont toujours lues
+
+        Retour :
+        - Query SQLAlchemy (peut encore être filtrée/ordonnée)
+        """
+        options = [
+            joinedload(Place.owner) if "owner" in embed else lazyload(Place.owner),
+            selectinload(Place.amenities) if "amenities" in embed else lazyload(Place.amenities),
+            selectinload(Place.reviews).joinedload(Review.author)
+            if "reviews" in embed else lazyload(Place.reviews),
+        ]
+        if fields is not None:
+            # Les clés de tri servent aussi au curseur de pagination
+            columns = {"id", "created_at"}
+            for name in (*fields, *(key for key, _ in PLACE_ORDERS[sort])):
+                columns.update(RATING_COLUMNS if name in ("rating", "rating_score") else (name,))
+            options.append(load_only(*(getattr(Place, name) for name in sorted(columns))))
+        return self.model.query.options(*options)
+
+    def get_with_relations(self, place_id, embed=PLACE_RELATIONS, fields=None):
+        """
+        Récupère un lieu avec les relations demandées (voir
+        query_with_relations), ou None.
+        """
+        return self.query_with_relations(embed, fields).filter(Place.id == place_id).first()
+
+    def get_many_with_relations(self, place_ids, embed=PLACE_RELATIONS, fields=None):
+        """
+        Récupère plusieurs lieux en une requête (WHERE id IN (...)) avec les
+        relations demandées. Retour : dict {id: place}
+        """
+        if not place_ids:
+            return {}
+        places = self.query_with_relations(embed, fields).filter(Place.id.in_(place_ids)).all()
+        return {place.id: place for place in places}
+
+    def get_all_with_relations(self):
+        """
+        Récupère tous les lieux avec owner, amenities, reviews et auteurs
+        des reviews déjà chargés (pas de requête N+1 à la sérialisation).
+        """
+        return self.query_with_relations().all()
+
+    def get_page_with_relations(self, limit, after=None, embed=PLACE_RELATIONS, fields=None,
+                                min_price=None, max_price=None, sort=DEFAULT_PLACE_SORT,
+                                place_ids=None, amenity_ids=()):
+        """
+        Page de lieux (pagination keyset) avec les relations demandées.
+
+        Paramètres :
+        - min_price, max_price : bornes (incluses) du prix par nuit, filtrées
+          en SQL sur l'index (price, id)
+        - sort : clé de PLACE_ORDERS ("created" : ordre de création)
+        - place_ids : lieux à retenir (résultat de l'index des commodités)
+        - amenity_ids : commodités correspondantes ; utilisées à la place de
+          place_ids quand ceux-ci sont plus de MAX_IN_IDS (filtre EXISTS sur
+          place_amenity : les lieux retenus sont alors assez nombreux pour
+          que le parcours dans l'ordre de tri remplisse vite la page)
+        """
+        query = self.query_with_relations(embed, fields, sort)
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        if place_ids is not None and len(place_ids) <= MAX_IN_IDS:
+            query = query.filter(Place.id.in_(place_ids))
+        else:
+            for amenity_id in amenity_ids:
+                query = query.filter(Place.amenities.any(Amenity.id == amenity_id))
+        return self.get_page(limit, after, query=query, order_by=PLACE_ORDERS[sort])
+
+    def get_by_title(self, title, embed=PLACE_RELATIONS, fields=None):
+        """
+        Récupère le premier lieu portant exactement ce titre (index places.title),
+        relations demandées préchargées. Retourne None si aucun lieu ne correspond.
+        """
+        return self.query_with_relations(embed, fields).filter(Place.title == title).first()
+
+    def get_by_owner(self, owner_id, embed=PLACE_RELATIONS, fields=None):
+        """
+        Récupère tous les lieux d'un propriétaire (index places.user_id),
+        relations demandées préchargées.
+        """
+        return self.query_with_relations(embed, fields).filter(Place.user_id == owner_id).all()
+
+    def get_by_owner_and_title(self, owner_id, title):
+        """
+        Récupère le lieu d'un propriétaire portant ce titre, ou None.
+        Sert au contrôle d'unicité du titre par propriétaire.
+        """
+        return self.model.query.filter(
+            Place.user_id == owner_id, Place.title == title
+        ).first()
+
+    def get_owner_titles(self, owner_ids, titles):
+        """
+        Renvoie les couples (user_id, title) déjà utilisés parmi les
+        propriétaires et titres donnés, en une seule requête.
+        """
+        if not owner_ids or not titles:
+            return set()
+        rows = db.session.query(Place.user_id, Place.title).filter(
+            Place.user_id.in_(set(owner_ids)), Place.title.in_(set(titles))
+        ).all()
+        return {(user_id, title) for user_id, title in rows}
+
+    def get_nearby(self, latitude, longitude, boxes, limit, after=None, radius_km=None,
+                   embed=PLACE_RELATIONS, fields=None):
+        """
+        Lieux situés dans les rectangles boxes (et à moins de radius_km du
+        point s'il est fourni), du plus proche au plus éloigné du point
+        (latitude, longitude), par pagination keyset sur (distance, id).
+
+        - Index : les rectangles sont couverts par quelques cellules de
+          geohash, lues comme des plages de l'index places.geohash.
+        - Tri : distance équirectangulaire calculée en SQL (arithmétique
+          simple, précise à moins de 0,5 % sur quelques centaines de km) ;
+          la distance renvoyée est la distance orthodromique exacte.
+
+        Paramètres :
+        - boxes : rectangles (min_lon, min_lat, max_lon, max_lat) sans
+          franchissement de l'antiméridien (voir geo.split_bbox)
+
+        Retour :
+        - ([(place, distance_km)], next_cursor)
+        """
+        delta_lon = func.abs(Place.longitude - longitude)
+        delta_lon = case((delta_lon > 180, 360 - delta_lon), else_=delta_lon) \
+            * math.cos(math.radians(latitude))
+        delta_lat = Place.latitude - latitude
+        distance = delta_lat * delta_lat + delta_lon * delta_lon  # degrés²
+
+        in_cells = or_(*(and_(Place.geohash >= cell, Place.geohash < cell + PREFIX_END)
+                         for cell in covering_cells(boxes)))
+        in_boxes = or_(*(and_(Place.longitude.between(min_lon, max_lon),
+                              Place.latitude.between(min_lat, max_lat))
+                         for min_lon, min_lat, max_lon, max_lat in boxes))
+        query = self.query_with_relations(embed, fields) \
+            .add_columns(distance, Place.latitude, Place.longitude) \
+            .filter(in_cells, in_boxes)
+        if radius_km is not None:
+            query = query.filter(distance <= (radius_km / KM_PER_DEGREE) ** 2)
+
+        keys = [(distance, False), (Place.id, False)]
+        if after:
+            values = decode_cursor(after, [distance, Place.id])
+            query = query.filter(keyset_filter(keys, values))
+        rows = query.order_by(distance, Place.id).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][1], rows[-1][0].id])
+        return [
+            (place, haversine_km(latitude, longitude, place_lat, place_lon))
+            for place, _, place_lat, place_lon in rows
+        ], next_cursor
+
+    def get_missing_geohash(self, batch_size=1000):
+        """
+        Lieux géolocalisés dont le geohash n'est pas encore calculé (bases
+        antérieures à la colonne), par lots de batch_size.
+        """
+        return self.model.query.filter(
+            Place.geohash.is_(None), Place.latitude.isnot(None), Place.longitude.isnot(None)
+        ).limit(batch_size).all()
+
+    def get_detail_version(self, place_id):
+        """
+        Version de la vue détaillée d'un lieu, en une seule requête : dates
+        de modification du lieu, de son propriétaire, de ses avis et de leurs
+        auteurs, de ses commodités, et nombre d'avis.
+        L'ajout ou le retrait d'une commodité met à jour le lieu lui-même.
+
+        Retour :
+        - tuple de valeurs, ou None si le lieu n'existe pas
+        """
+        last_review = select(func.max(Review.updated_at)).where(Review.place_id == place_id)
+        review_count = select(func.count(Review.id)).where(Review.place_id == place_id)
+        authors = select(func.max(User.updated_at)) \
+            .join(Review, Review.user_id == User.id) \
+            .where(Review.place_id == place_id)
+        amenities = select(func.max(Amenity.updated_at)) \
+            .join(place_amenity, place_amenity.c.amenity_id == Amenity.id) \
+            .where(place_amenity.c.place_id == place_id)
+
+        row = db.session.query(
+            Place.updated_at,
+            User.updated_at,
+            last_review.scalar_subquery(),
+            review_count.scalar_subquery(),
+            authors.scalar_subquery(),
+            amenities.scalar_subquery(),
+        ).join(User, Place.user_id == User.id).filter(Place.id == place_id).first()
+        return None if row is None else tuple(row)
+
+    def get_listing_version(self):
+        """
+        Version des listes de lieux, qui incluent propriétaires, commodités,
+        avis et auteurs : (max(updated_at), nombre de lignes) des tables
+        places, users, amenities et reviews, en une seule requête.
+        """
+        columns = []
+        for model in (Place, User, Amenity, Review):
+            columns.append(select(func.max(model.updated_at)).scalar_subquery())
+            columns.append(select(func.count(model.id)).scalar_subquery())
+        return tuple(db.session.execute(select(*columns)).one())
+
 
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Review)
 
+    def get_by_place(self, place_id):
+        """
+        Récupère les avis d'un lieu (index reviews.place_id).
+        """
+        return self.model.query.filter(Review.place_id == place_id).all()
+
+    def get_page_by_place(self, place_id, limit, after=None, sort=DEFAULT_REVIEW_SORT):
+        """
+        Page d'avis d'un lieu (pagination keyset sur l'index
+        (place_id, created_at) ou (place_id, rating)), auteurs chargés
+        par jointure.
+
+        Paramètres :
+        - sort : clé de REVIEW_ORDERS ("-date" : les plus récents d'abord)
+
+        Retour :
+        - (reviews, next_cursor)
+        """
+        query = self.model.query.options(joinedload(Review.author)) \
+            .filter(Review.place_id == place_id)
+        return self.get_page(limit, after, query=query, order_by=REVIEW_ORDERS[sort])
+
+    def get_place_reviews_version(self, place_id):
+        """
+        Version des avis d'un lieu avec leurs auteurs : (max(updated_at) des
+        avis, nombre d'avis, max(updated_at) des auteurs), en une requête.
+        """
+        return tuple(db.session.query(
+            func.max(Review.updated_at), func.count(Review.id), func.max(User.updated_at)
+        ).join(User, Review.user_id == User.id).filter(Review.place_id == place_id).one())
+
+    def get_by_user(self, user_id):
+        """
+        Récupère les avis rédigés par un utilisateur (index reviews.user_id).
+        """
+        return self.model.query.filter(Review.user_id == user_id).all()
+
+    def get_reviewed_place_ids(self, user_id, place_ids):
+        """
+        Renvoie, parmi place_ids, les ids des lieux déjà notés par
+        l'utilisateur, en une seule requête.
+        """
+        if not place_ids:
+            return set()
+        rows = db.session.query(Review.place_id).filter(
+            Review.user_id == user_id, Review.place_id.in_(set(place_ids))
+        ).all()
+        return {place_id for place_id, in rows}
+
 
 class AmenityRepository(SQLAlchemyRepository):
     def __init__(self):
@@ -0,0 +1,154 @@
+"""persistence/revocation.py
+
+Liste des jetons JWT révoqués (denylist), consultée à chaque requête
+authentifiée sans requête SQL dans le cas courant.
+
+La table revoked_tokens fait foi. Chaque processus en garde un filtre de
+Bloom des jti (taille fixe, voir bloom.py) :
+- jti absent du filtre (presque toutes les requêtes) : jeton valide, sans
+  accès à la base ;
+- jti présent : confirmation exacte par une requête sur la clé primaire
+  (le filtre peut se tromper dans ce sens, au taux error_rate).
+
+Les révocations du processus sont ajoutées au filtre après le COMMIT.
+Celles des autres processus sont relues toutes les sync_interval
+secondes (lignes récentes seulement). Un jeton expiré n'a plus besoin
+d'être révoqué : sa ligne est purgée à la révocation suivante et le
+filtre est reconstruit sans elle au plus tard max_age secondes après sa
+construction (ou dès qu'il dépasse sa capacité).
+"""
+
+import threading
+import time
+from sqlalchemy import delete, inspect, select
+from app.extensions import db
+from app.models.revoked_token import RevokedToken
+from app.persistence.bloom import BloomFilter
+from app.persistence.unit_of_work import after_commit, commit_unless_in_unit_of_work
+
+# Recouvrement des synchronisations (secondes) : une révocation validée
+# juste après la lecture précédente, ou datée par un processus dont
+# l'horloge retarde un peu, est relue à la suivante
+SYNC_OVERLAP = 5
+
+# Expiration enregistrée pour un jeton sans claim exp (JWT_*_EXPIRES = False)
+NEVER_EXPIRES = 2 ** 31 - 1
+
+
+class TokenDenylist:
+    """
+    Jetons révoqués : filtre de Bloom du processus et table revoked_tokens.
+
+    Paramètres :
+    - capacity (int), error_rate (float) : dimensionnement du filtre
+    - sync_interval (float) : secondes entre deux lectures des révocations
+      faites par les autres processus
+    - max_age (float) : secondes au-delà desquelles le filtre est reconstruit
+      sans les jetons expirés
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001, sync_interval=2, max_age=300):
+        self._lock = threading.Lock()
+        self.configure(capacity, error_rate, sync_interval, max_age)
+
+    def configure(self, capacity, error_rate, sync_interval, max_age):
+        """Change le dimensionnement et vide le filtre (appelé par create_app)."""
+        with self._lock:
+            self.capacity = capacity
+            self.error_rate = error_rate
+            self.sync_interval = sync_interval
+            self.max_age = max_age
+            self._filter = None
+            self._built_at = None
+            self._next_sync = 0.0
+            self._synced_until = 0.0
+            self._counts = {"filter_hits": 0, "revoked": 0, "rebuilds": 0}
+
+    # ---------- synchronisation ----------
+
+    def load(self):
+        """
+        Construit le filtre depuis la base (appelé par create_app) : une
+        table revoked_tokens absente fait échouer le démarrage plutôt que
+        chaque requête authentifiée.
+        """
+        if not inspect(db.engine).has_table(RevokedToken.__tablename__):
+            raise RuntimeError("Table revoked_tokens is missing: "
+                               "apply SQL/migrations/009_revoked_tokens.sql")
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        now = time.monotonic()
+        wall = time.time()
+        stale = (self._filter is None or now - self._built_at > self.max_age
+                 or len(self._filter) > self.capacity)
+        if stale:
+            jtis = db.session.execute(
+                select(RevokedToken.jti).where(RevokedToken.expires_at > wall)
+            ).scalars().all()
+            bloom = BloomFilter(max(self.capacity, len(jtis)), self.error_rate)
+            for jti in jtis:
+                bloom.add(jti)
+            self._filter, self._built_at = bloom, now
+            self._counts["rebuilds"] += 1
+        else:
+            jtis = db.session.execute(
+                select(RevokedToken.jti).where(RevokedToken.revoked_at >= self._synced_until)
+            ).scalars().all()
+            for jti in jtis:
+                self._filter.add(jti)
+        self._synced_until = wall - SYNC_OVERLAP
+        self._next_sync = now + self.sync_interval
+
+    def _add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    # ---------- lecture ----------
+
+    def is_revoked(self, jti):
+        """Vrai si le jeton jti a été révoqué (et n'a pas encore expiré)."""
+        if time.monotonic() >= self._next_sync:
+            with self._lock:
+                if time.monotonic() >= self._next_sync:
+                    self._sync()
+        if jti not in self._filter:
+            return False
+
+        revoked = db.session.execute(
+            select(RevokedToken.jti)
+            .where(RevokedToken.jti == jti, RevokedToken.expires_at > time.time())
+        ).first() is not None
+        with self._lock:
+            self._counts["filter_hits"] += 1
+            self._counts["revoked"] += revoked
+        return revoked
+
+    def stats(self):
+        """Taille du filtre et compteurs (exposés par /metrics)."""
+        with self._lock:
+            hits = self._counts["filter_hits"]
+            return {"filter": self._filter.stats() if self._filter is not None else None,
+                    **self._counts,
+                    "false_positives": hits - self._counts["revoked"]}
+
+    # ---------- écriture ----------
+
+    def revoke(self, jti, expires_at, user_id=None):
+        """
+        Enregistre la révocation du jeton jti (expiration expires_at, en
+        secondes depuis l'epoch, None si le jeton n'expire pas) et purge les
+        révocations expirées. Sans effet si le jeton est déjà révoqué. Le
+        filtre du processus est mis à jour après le COMMIT.
+        """
+        now = time.time()
+        if expires_at is None:
+            expires_at = NEVER_EXPIRES
+        db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        if expires_at > now and db.session.get(RevokedToken, jti) is None:
+            db.session.add(RevokedToken(jti=jti, user_id=user_id,
+                                        expires_at=int(expires_at), revoked_at=now))
+            after_commit(lambda: self._add(jti))
+        commit_unless_in_unit_of_work()
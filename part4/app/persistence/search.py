@@ -0,0 +1,236 @@
+"""persistence/search.py
+
+Recherche plein texte des lieux (titre et description), classée par
+pertinence (BM25, le titre pesant plus que la description).
+
+- tokenize() : découpage d'un texte en mots (minuscules, sans accents)
+- SearchIndex : interface utilisée par la facade (index_place, search)
+- Fts5SearchIndex : table virtuelle SQLite FTS5 places_fts, écrite dans
+  la même transaction que le lieu
+- InvertedIndex : index inversé en mémoire du processus, pour les autres
+  bases ; mis à jour après le COMMIT, reconstruit au plus tard après
+  max_age secondes (écritures d'autres processus)
+- build_search_index() : choix de l'implémentation (SEARCH_BACKEND)
+
+Une recherche renvoie les lieux contenant tous les mots demandés.
+"""
+
+import math
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from sqlalchemy import DDL, bindparam, event, select, text
+from app.extensions import db
+from app.models.place import Place
+from app.models.types import KEY_COPIES, UUIDKey, id_to_string
+from app.persistence.memory_index import InMemoryIndex
+
+# Poids des colonnes dans le score (mêmes valeurs pour FTS5 et l'index inversé)
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Paramètres de BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(value):
+    """
+    Mots d'un texte, en minuscules et sans accents (même découpage que le
+    tokenizer FTS5 unicode61 remove_diacritics 2).
+    """
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _WORD.findall(stripped.lower())
+
+
+class SearchIndex(ABC):
+    """Index plein texte des lieux."""
+
+    @abstractmethod
+    def index_place(self, place):
+        """Ajoute ou remplace un lieu dans l'index (titre et description)."""
+
+    @abstractmethod
+    def remove_place(self, place_id):
+        """Retire un lieu de l'index."""
+
+    @abstractmethod
+    def search(self, tokens, limit):
+        """
+        Lieux contenant tous les mots de tokens, du plus au moins pertinent.
+        Retour : liste de (place_id, score), score positif
+        """
+
+    def stats(self):
+        return {"backend": type(self).__name__}
+
+
+# ---------- SQLite FTS5 ----------
+
+FTS_TABLE = "places_fts"
+
+_CREATE_FTS = DDL(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "place_id UNINDEXED, title, description, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+_DROP_FTS = DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+# La table virtuelle suit le cycle de vie des autres tables (create_all / drop_all)
+event.listen(db.metadata, "after_create", _CREATE_FTS.execute_if(dialect="sqlite"))
+event.listen(db.metadata, "before_drop", _DROP_FTS.execute_if(dialect="sqlite"))
+
+
+# La ligne FTS d'un lieu a pour rowid celle du lieu dans places : elle est
+# retrouvée par la clé de la table virtuelle, alors qu'un filtre sur
+# place_id (UNINDEXED) la parcourt en entier
+_PLACE_ROWID = "(SELECT rowid FROM places WHERE id = :place_key)"
+
+# place_id est stocké comme places.id (texte ou 16 octets selon ID_STORAGE)
+_INSERT_FTS = text(
+    f"INSERT INTO {FTS_TABLE} (rowid, place_id, title, description) "
+    f"SELECT rowid, id, :title, :description FROM places WHERE id = :place_key"
+).bindparams(bindparam("place_key", type_=UUIDKey()))
+
+_DELETE_FTS = text(
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = {_PLACE_ROWID}"
+).bindparams(bindparam("place_key", type_=UUIDKey()))
+
+# convert-ids : place_id suit le stockage des clés de places
+KEY_COPIES.append((FTS_TABLE, f"UPDATE {FTS_TABLE} SET place_id = "
+                              f"(SELECT id FROM places WHERE places.rowid = {FTS_TABLE}.rowid)"))
+
+
+class Fts5SearchIndex(SearchIndex):
+    """
+    Index FTS5 de SQLite. Les écritures passent par la session : elles
+    sont validées ou annulées avec le reste de la transaction.
+
+    Les lignes sont indexées par la rowid du lieu : un VACUUM pouvant
+    renuméroter les rowid de places, places_fts doit être reconstruite
+    après (SQL/migrations/011_place_fulltext_rowid.sql).
+    """
+
+    def index_place(self, place):
+        db.session.flush()   # le lieu doit exister dans places
+        self.remove_place(place.id)
+        db.session.execute(_INSERT_FTS, {"place_key": place.id, "title": place.title,
+                                         "description": place.description})
+
+    def remove_place(self, place_id):
+        """Retire un lieu de l'index (avant la suppression de sa ligne dans places)."""
+        db.session.execute(_DELETE_FTS, {"place_key": place_id})
+
+    def search(self, tokens, limit):
+        # Chaque mot est cité : la syntaxe de requête FTS5 n'est pas interprétée
+        match = " ".join(f'"{token}"' for token in tokens)
+        rows = db.session.execute(
+            text(f"SELECT place_id, bm25({FTS_TABLE}, 0, :title_weight, :description_weight) "
+                 f"AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+                 "ORDER BY rank, place_id LIMIT :limit"),
+            {"match": match, "limit": limit,
+             "title_weight": TITLE_WEIGHT, "description_weight": DESCRIPTION_WEIGHT}
+        ).all()
+        # bm25() est négatif : plus il est petit, plus le lieu est pertinent
+        return [(id_to_string(place_id) if isinstance(place_id, bytes) else place_id, -rank)
+                for place_id, rank in rows]
+
+
+# ---------- index inversé en mémoire ----------
+
+class InvertedIndex(InMemoryIndex, SearchIndex):
+    """
+    Index inversé : pour chaque mot, les lieux qui le contiennent et le
+    nombre d'occurrences dans le titre et dans la description.
+    """
+
+    def _reset(self):
+        self._postings = {}   # mot -> {place_id: (occurrences titre, description)}
+        self._terms = {}      # place_id -> mots du lieu
+        self._lengths = {}    # place_id -> nombre de mots (titre + description)
+        self._total_length = 0
+
+    def _load_rows(self):
+        return db.session.execute(select(Place.id, Place.title, Place.description)).all()
+
+    def _add(self, place_id, title, description):
+        self._remove(place_id)
+        title_tokens, description_tokens = tokenize(title), tokenize(description)
+        counts = {}
+        for position, tokens in enumerate((title_tokens, description_tokens)):
+            for token in tokens:
+                counts.setdefault(token, [0, 0])[position] += 1
+        for token, (in_title, in_description) in counts.items():
+            self._postings.setdefault(token, {})[place_id] = (in_title, in_description)
+        self._terms[place_id] = set(counts)
+        self._lengths[place_id] = len(title_tokens) + len(description_tokens)
+        self._total_length += self._lengths[place_id]
+
+    def _remove(self, place_id):
+        for token in self._terms.pop(place_id, ()):
+            postings = self._postings[token]
+            del postings[place_id]
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._lengths.pop(place_id, 0)
+
+    def index_place(self, place):
+        self._add_after_commit(place.id, place.title, place.description)
+
+    def remove_place(self, place_id):
+        self._remove_after_commit(place_id)
+
+    def search(self, tokens, limit):
+        self._ensure_built()
+        with self._lock:
+            postings = [self._postings.get(token, {}) for token in dict.fromkeys(tokens)]
+            if not postings or not all(postings):
+                return []
+
+            # Candidats : intersection, en partant de la liste la plus courte
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for other in postings[1:]:
+                candidates.intersection_update(other)
+
+            count = len(self._lengths)
+            average_length = self._total_length / count if count else 0
+            scores = []
+            for place_id in candidates:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[place_id]
+                                  / (average_length or 1))
+                score = 0.0
+                for token_postings in postings:
+                    in_title, in_description = token_postings[place_id]
+                    frequency = TITLE_WEIGHT * in_title + DESCRIPTION_WEIGHT * in_description
+                    n = len(token_postings)
+                    idf = math.log((count - n + 0.5) / (n + 0.5) + 1)
+                    score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                scores.append((place_id, score))
+
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:limit]
+
+    def stats(self):
+        with self._lock:
+            return {"backend": type(self).__name__, "built": self._built_at is not None,
+                    "places": len(self._lengths), "terms": len(self._postings)}
+
+
+def build_search_index(config):
+    """
+    Construit l'index selon SEARCH_BACKEND : "fts5", "memory", ou "auto"
+    (FTS5 si la base est SQLite, index inversé en mémoire sinon).
+    """
+    backend = config.get("SEARCH_BACKEND", "auto")
+    if backend == "auto":
+        uri = config.get("SQLALCHEMY_DATABASE_URI") or ""
+        backend = "fts5" if uri.startswith("sqlite") else "memory"
+    if backend == "fts5":
+        return Fts5SearchIndex()
+    if backend == "memory":
+        return InvertedIndex(max_age=config.get("SEARCH_INDEX_MAX_AGE", 300))
+    raise ValueError(f"Unknown SEARCH_BACKEND: {backend}")
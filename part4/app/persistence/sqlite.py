@@ -0,0 +1,116 @@
+"""persistence/sqlite.py
+
+Profils de réglage du moteur SQLite, choisis par SQLITE_PROFILE et
+appliqués par create_app :
+
+- None          : réglages par défaut de SQLite et de SQLAlchemy
+- "production"  : plusieurs workers (processus et threads) sur le même
+  fichier de base
+
+Le profil "production" active :
+- journal_mode=WAL : les lectures ne bloquent plus l'écrivain (et
+  inversement) ; un seul écrivain à la fois
+- synchronous=NORMAL : plus de fsync à chaque COMMIT (seulement aux
+  checkpoints du WAL) ; une coupure de courant peut perdre les dernières
+  transactions, jamais corrompre la base
+- mmap_size, cache_size, temp_store : lectures en mémoire projetée, cache
+  de pages de 64 Mo par connexion, tables temporaires en mémoire
+- busy_timeout : un écrivain attend le verrou au lieu d'échouer avec
+  "database is locked"
+- foreign_keys=ON : contrôle des clés étrangères
+- un pool de connexions dimensionné pour des workers multi-threads
+
+Les PRAGMA sont exécutés à l'ouverture de chaque connexion du pool ;
+SQLITE_PRAGMAS complète ou remplace ceux du profil. Les bases en mémoire
+(tests) ne reçoivent que les PRAGMA, sans options de pool ni WAL.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+SQLITE_PROFILES = {
+    "production": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,   # 256 Mo
+            "cache_size": -64000,             # en Kio (valeur négative) : 64 Mo
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,             # ms
+            "foreign_keys": "ON",
+        },
+        "engine_options": {
+            # Une connexion par thread de worker, plus une réserve
+            "pool_size": 10,
+            "max_overflow": 10,
+            "pool_timeout": 30,
+            # Les connexions passent d'un thread à l'autre via le pool
+            "connect_args": {"check_same_thread": False, "timeout": 5},
+        },
+    },
+}
+
+# PRAGMA propres au fichier de base (sans effet sur une base en mémoire)
+_FILE_ONLY_PRAGMAS = ("journal_mode", "mmap_size")
+
+
+def is_memory_database(url):
+    url = make_url(url)
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def sqlite_settings(config):
+    """
+    Retourne (pragmas, options du moteur) pour la configuration, ou
+    (None, None) si la base n'est pas SQLite ou si aucun réglage n'est
+    demandé. Lève ValueError pour un profil inconnu.
+    """
+    uri = config.get("SQLALCHEMY_DATABASE_URI", "")
+    if not uri or make_url(uri).get_backend_name() != "sqlite":
+        return None, None
+
+    profile_name = config.get("SQLITE_PROFILE")
+    if profile_name is not None and profile_name not in SQLITE_PROFILES:
+        raise ValueError(f"SQLITE_PROFILE must be one of: {', '.join(SQLITE_PROFILES)}")
+    profile = SQLITE_PROFILES.get(profile_name, {})
+
+    pragmas = {**profile.get("pragmas", {}), **config.get("SQLITE_PRAGMAS", {})}
+    options = dict(profile.get("engine_options", {}))
+    if is_memory_database(uri):
+        pragmas = {k: v for k, v in pragmas.items() if k not in _FILE_ONLY_PRAGMAS}
+        options = {}
+    if not pragmas and not options:
+        return None, None
+    return pragmas, options
+
+
+def configure_engine_options(config):
+    """
+    Fusionne les options de pool du profil dans SQLALCHEMY_ENGINE_OPTIONS
+    (avant db.init_app ; les options déjà présentes sont prioritaires).
+    """
+    _, options = sqlite_settings(config)
+    if options:
+        config["SQLALCHEMY_ENGINE_OPTIONS"] = {**options,
+                                               **config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
+
+
+def apply_pragmas(engine, config):
+    """Exécute les PRAGMA du profil à chaque nouvelle connexion du moteur."""
+    pragmas, _ = sqlite_settings(config)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def pragma_values(connection, names):
+    """Valeurs courantes de PRAGMA (vérification et métriques)."""
+    return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
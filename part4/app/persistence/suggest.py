@@ -0,0 +1,122 @@
+"""persistence/suggest.py
+
+Index d'autocomplétion (type-ahead) des titres de lieux et des noms de
+commodités.
+
+Chaque libellé est normalisé (minuscules, sans accents, mots séparés par
+une espace) et inséré dans un tableau trié une fois par mot : « Studio à
+Paris » donne les clés "studio a paris", "a paris" et "paris". Les clés
+commençant par un préfixe forment une tranche contiguë du tableau,
+trouvée par recherche dichotomique (bisect) : la réponse coûte
+O(log n + k), sans requête SQL.
+
+L'index est construit depuis la base à la première utilisation, mis à
+jour après le COMMIT des créations et modifications faites par la
+facade, et reconstruit au plus tard après max_age secondes (écritures
+d'autres processus).
+"""
+
+import bisect
+from sqlalchemy import select
+from app.extensions import db
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.search import tokenize
+from app.persistence.memory_index import InMemoryIndex
+
+# Types de libellés proposés
+SUGGESTION_KINDS = ("place", "amenity")
+
+# Caractère supérieur à tout caractère d'une clé normalisée
+_KEY_END = "\uffff"
+
+
+def normalize(value):
+    """Clé de comparaison d'un libellé ou d'un préfixe."""
+    return " ".join(tokenize(value))
+
+
+class SuggestIndex(InMemoryIndex):
+    """
+    Tableau trié de (clé, type, id) ; les libellés sont gardés à part,
+    par (type, id), avec les clés à retirer lors d'une modification.
+    """
+
+    def _reset(self):
+        self._entries = []
+        self._labels = {}     # (type, id) -> (libellé, clés)
+
+    def _load_rows(self):
+        places = db.session.execute(select(Place.id, Place.title)).all()
+        amenities = db.session.execute(select(Amenity.id, Amenity.name)).all()
+        return ([("place", *row) for row in places]
+                + [("amenity", *row) for row in amenities])
+
+    def _build(self, rows):
+        # Un seul tri plutôt qu'une insertion triée par clé
+        entries = []
+        for kind, entity_id, label in rows:
+            keys = self._keys(label)
+            self._labels[(kind, entity_id)] = (label, keys)
+            entries += [(key, kind, entity_id) for key in keys]
+        self._entries = sorted(entries)
+
+    @staticmethod
+    def _keys(label):
+        words = tokenize(label)
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def _add(self, kind, entity_id, label):
+        self._remove(kind, entity_id)
+        keys = self._keys(label)
+        self._labels[(kind, entity_id)] = (label, keys)
+        for key in keys:
+            bisect.insort(self._entries, (key, kind, entity_id))
+
+    def _remove(self, kind, entity_id):
+        _, keys = self._labels.pop((kind, entity_id), (None, ()))
+        for key in keys:
+            position = bisect.bisect_left(self._entries, (key, kind, entity_id))
+            if position < len(self._entries) and self._entries[position] == (key, kind, entity_id):
+                del self._entries[position]
+
+    # ---------- écriture (appliquée après le COMMIT) ----------
+
+    def index(self, kind, entity_id, label):
+        """Ajoute ou remplace le libellé d'un lieu ou d'une commodité."""
+        self._add_after_commit(kind, entity_id, label)
+
+    def remove(self, kind, entity_id):
+        self._remove_after_commit(kind, entity_id)
+
+    # ---------- lecture ----------
+
+    def suggest(self, prefix, limit, kinds=SUGGESTION_KINDS):
+        """
+        Au plus limit libellés dont un mot commence par prefix, dans l'ordre
+        alphabétique de la partie qui correspond.
+        Retour : liste de {"type", "id", "label"}
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+        self._ensure_built()
+        with self._lock:
+            position = bisect.bisect_left(self._entries, (key,))
+            end = bisect.bisect_left(self._entries, (key + _KEY_END,))
+            results, seen = [], set()
+            for index in range(position, end):
+                _, kind, entity_id = self._entries[index]
+                if kind not in kinds or (kind, entity_id) in seen:
+                    continue
+                seen.add((kind, entity_id))
+                results.append({"type": kind, "id": entity_id,
+                                "label": self._labels[(kind, entity_id)][0]})
+                if len(results) == limit:
+                    break
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {"built": self._built_at is not None,
+                    "labels": len(self._labels), "keys": len(self._entries)}
@@ -0,0 +1,142 @@
+"""persistence/trigram.py
+
+Recherche approximative (tolérante aux fautes de frappe) des titres de
+lieux, par similarité de trigrammes (même principe que pg_trgm).
+
+Un titre est découpé en trigrammes : suites de 3 caractères de chaque mot
+normalisé, complété de deux espaces devant et d'une derrière ("paris" ->
+"  p", " pa", "par", "ari", "ris", "is "). La similarité entre deux titres
+est le rapport entre trigrammes communs et trigrammes distincts des deux
+(indice de Jaccard) : une faute de frappe ne change que quelques
+trigrammes.
+
+L'index associe à chaque trigramme la liste des titres qui le
+contiennent. Une recherche compte, pour chaque titre, les trigrammes
+qu'il partage avec la requête en parcourant les seules listes de ses
+trigrammes ; la similarité exacte s'en déduit avec le nombre de
+trigrammes de chaque titre, sans relire les titres. Pour un seuil s, un
+titre similaire partage au moins ceil(s × |Q|) des |Q| trigrammes de la
+requête et en possède entre s × |Q| et |Q| / s : les autres sont écartés
+avant tout calcul.
+
+Comme les autres index en mémoire (voir memory_index.py), il est
+construit depuis la base à la première utilisation, mis à jour après le
+COMMIT des créations et modifications de lieux, et reconstruit au plus
+tard après max_age secondes.
+"""
+
+import heapq
+import math
+from collections import Counter
+from sqlalchemy import select
+from app.extensions import db
+from app.models.place import Place
+from app.persistence.search import tokenize
+from app.persistence.memory_index import InMemoryIndex
+
+# Seuil de similarité par défaut (valeur par défaut de pg_trgm)
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+
+def trigrams(value):
+    """Ensemble des trigrammes d'un texte."""
+    result = set()
+    for word in tokenize(value):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(first, second):
+    """Similarité (0 à 1) entre deux ensembles de trigrammes."""
+    if not first or not second:
+        return 0.0
+    shared = len(first & second)
+    return shared / (len(first) + len(second) - shared)
+
+
+class TrigramIndex(InMemoryIndex):
+    """
+    Listes de trigrammes -> numéros de ligne des titres.
+
+    Un titre modifié reçoit un nouveau numéro de ligne ; l'ancien est
+    marqué supprimé et ignoré à la lecture (les listes ne sont compactées
+    qu'à la reconstruction).
+    """
+
+    def _reset(self):
+        self._titles = []     # ligne -> (id du lieu, titre), None si supprimée
+        self._sizes = []      # ligne -> nombre de trigrammes du titre
+        self._rows = {}       # id du lieu -> ligne courante
+        self._postings = {}   # trigramme -> lignes
+
+    def _load_rows(self):
+        return db.session.execute(select(Place.id, Place.title)).all()
+
+    def _add(self, place_id, title):
+        self._remove(place_id)
+        row = len(self._titles)
+        grams = trigrams(title)
+        self._titles.append((place_id, title))
+        self._sizes.append(len(grams))
+        self._rows[place_id] = row
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(row)
+
+    def _remove(self, place_id):
+        row = self._rows.pop(place_id, None)
+        if row is not None:
+            self._titles[row] = None
+
+    # ---------- écriture (appliquée après le COMMIT) ----------
+
+    def index_place(self, place):
+        """Ajoute ou remplace le titre d'un lieu."""
+        self._add_after_commit(place.id, place.title)
+
+    def remove_place(self, place_id):
+        self._remove_after_commit(place_id)
+
+    # ---------- lecture ----------
+
+    def search(self, query, limit, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """
+        Au plus limit lieux dont le titre a une similarité d'au moins
+        threshold (0 < threshold <= 1) avec query, du plus au moins proche.
+        Retour : liste de (place_id, similarité)
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        # Tolérance sur les arrondis (0.3 × 10 = 3.0000000000000004)
+        required = max(1, math.ceil(threshold * len(grams) - 1e-9))
+        min_size, max_size = threshold * len(grams) - 1e-9, len(grams) / threshold + 1e-9
+
+        self._ensure_built()
+        with self._lock:
+            # Nombre de trigrammes communs avec chaque titre : comptage des
+            # listes par Counter (boucle en C)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+
+            scored = []
+            for row, count in shared.items():
+                if count < required:
+                    continue
+                size = self._sizes[row]
+                entry = self._titles[row]
+                if entry is None or not min_size <= size <= max_size:
+                    continue
+                score = count / (len(grams) + size - count)
+                if score >= threshold:
+                    scored.append((score, entry[1], entry[0]))
+
+        # Les plus similaires d'abord, puis par titre
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+        return [(place_id, score) for score, _, place_id in best]
+
+    def stats(self):
+        with self._lock:
+            return {"built": self._built_at is not None, "titles": len(self._rows),
+                    "trigrams": len(self._postings)}
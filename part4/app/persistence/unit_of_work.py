@@ -0,0 +1,143 @@
+"""persistence/unit_of_work.py
+
+Unité de travail (unit of work) : regroupe les écritures de plusieurs
+appels de repository dans une seule transaction, validée par un seul COMMIT.
+
+Hors unité de travail, chaque add/update/delete d'un repository valide
+immédiatement (comportement historique). Dans une unité de travail, les
+repositories se contentent de modifier la session : le COMMIT (ou le
+ROLLBACK en cas d'exception) est fait à la sortie du bloc le plus externe.
+
+    with UnitOfWork():
+        repo.add(review)
+        repo.add(place)      # un seul COMMIT pour les deux
+
+Un bloc imbriqué ouvre un SAVEPOINT : s'il lève une exception, ses
+écritures (et ses actions after_commit) sont annulées même si l'appelant
+intercepte l'erreur et que le bloc externe valide.
+"""
+
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+
+# Clé de session.info qui compte les unités de travail imbriquées
+_DEPTH_KEY = "unit_of_work_depth"
+
+# Clé de session.info des actions à exécuter après le COMMIT
+_AFTER_COMMIT_KEY = "after_commit_actions"
+
+
+class UnitOfWork:
+    """
+    Gestionnaire de contexte délimitant une transaction métier.
+
+    Les blocs imbriqués sont fusionnés dans le bloc le plus externe :
+    seul celui-ci valide (ou annule) la transaction. Chaque bloc imbriqué
+    est un SAVEPOINT, annulé seul en cas d'exception.
+    """
+
+    @staticmethod
+    def is_active():
+        """Indique si une unité de travail est en cours sur la session."""
+        return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+    def __enter__(self):
+        info = db.session.info
+        depth = info.get(_DEPTH_KEY, 0)
+        self._savepoint = _begin_savepoint() if depth else None
+        # Actions after_commit notées avant le bloc : conservées s'il échoue
+        self._pending_actions = len(info.get(_AFTER_COMMIT_KEY, []))
+        info[_DEPTH_KEY] = depth + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        info = db.session.info
+        info[_DEPTH_KEY] -= 1
+        if self._savepoint is not None:
+            if exc_type is None:
+                try:
+                    self._savepoint.commit()   # RELEASE SAVEPOINT
+                    return False
+                except Exception:
+                    self._rollback_savepoint()
+                    raise
+            self._rollback_savepoint()
+            return False
+
+        if exc_type is not None:
+            db.session.rollback()
+            return False
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return False
+
+    def _rollback_savepoint(self):
+        if self._savepoint.is_active:
+            self._savepoint.rollback()
+        del db.session.info.get(_AFTER_COMMIT_KEY, [])[self._pending_actions:]
+
+
+def _begin_savepoint():
+    """Ouvre un SAVEPOINT dans la transaction de la session."""
+    connection = db.session.connection()
+    if connection.dialect.name == "sqlite":
+        # pysqlite n'émet BEGIN qu'avant le premier INSERT/UPDATE/DELETE :
+        # sans lui, le SAVEPOINT ouvrirait la transaction et son RELEASE
+        # la validerait avant le COMMIT du bloc externe
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN")
+    return db.session.begin_nested()
+
+
+def commit_unless_in_unit_of_work():
+    """
+    Valide la session, sauf si une unité de travail est en cours
+    (le COMMIT est alors différé à la fin de celle-ci).
+    """
+    if not UnitOfWork.is_active():
+        db.session.commit()
+
+
+def transactional(method):
+    """
+    Décorateur de méthode de la facade : exécute la méthode dans une
+    unité de travail, pour un seul COMMIT par opération métier et un
+    ROLLBACK si elle lève une exception.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with UnitOfWork():
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def after_commit(action, session=None):
+    """
+    Exécute action() après le COMMIT de la transaction en cours, ou
+    l'abandonne en cas de ROLLBACK (de la transaction ou du SAVEPOINT qui
+    l'a enregistrée). Utilisé par les index en mémoire du processus, qui
+    ne doivent refléter que des écritures validées.
+    """
+    session = session if session is not None else db.session
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append(action)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    if session.in_nested_transaction():
+        return   # RELEASE SAVEPOINT : la transaction n'est pas encore validée
+    for action in session.info.pop(_AFTER_COMMIT_KEY, []):
+        action()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session):
+    if session.in_nested_transaction():
+        return   # SAVEPOINT annulé : UnitOfWork retire lui-même ses actions
+    session.info.pop(_AFTER_COMMIT_KEY, None)
@@ -0,0 +1,351 @@
+"""services/cache.py
+
+Cache de lecture (read-through) utilisé par HBnBFacade.
+
+- CacheBackend : interface de stockage clé/valeur avec durée de vie (TTL)
+- LRUCacheBackend : implémentation en mémoire du processus (par défaut),
+  bornée en nombre d'entrées, éviction LRU
+- RedisCacheBackend : implémentation sur un client compatible Redis
+  (redis-py, ou tout objet offrant get/set(ex=)/delete/flushdb), partagée
+  entre les workers
+- NullCacheBackend : désactive le cache
+- EntityCache : couche utilisée par la facade (entités par ID, vues
+  sérialisées, invalidation, compteurs hits/misses)
+
+Les entités ne sont pas mises en cache telles quelles (elles sont liées à
+la session SQLAlchemy d'une requête) : on stocke un instantané de leurs
+colonnes, restauré dans la session courante sans requête SQL.
+"""
+
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.extensions import db
+
+
+class CacheBackend(ABC):
+    """Stockage clé/valeur avec expiration."""
+
+    @abstractmethod
+    def get(self, key):
+        """Retourne la valeur associée à key, ou None si absente/expirée."""
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        """Associe value à key pour ttl secondes (défaut du backend si None)."""
+
+    @abstractmethod
+    def delete(self, key):
+        """Supprime key si elle existe."""
+
+    @abstractmethod
+    def clear(self):
+        """Vide entièrement le cache."""
+
+    def size(self):
+        """Nombre d'entrées stockées, si le backend sait le dire."""
+        return None
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend qui ne stocke rien : chaque lecture est un miss."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    Cache en mémoire du processus, borné à max_size entrées.
+    L'entrée la moins récemment utilisée est évincée en premier ; chaque
+    entrée expire après ttl secondes. Sûr entre threads.
+    """
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+# Nombre de clés supprimées par commande DELETE lors d'un clear() Redis
+CLEAR_BATCH_SIZE = 500
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache partagé sur un serveur compatible Redis. Les valeurs sont
+    sérialisées avec pickle ; les clés sont préfixées par key_prefix.
+    """
+
+    def __init__(self, client, ttl=300, key_prefix="hbnb:cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    def get(self, key):
+        raw = self.client.get(self.key_prefix + key)
+        return None if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.key_prefix + key, pickle.dumps(value),
+                        ex=self.ttl if ttl is None else ttl)
+
+    def delete(self, key):
+        self.client.delete(self.key_prefix + key)
+
+    def clear(self):
+        """Supprime les seules clés du cache (la base peut en contenir d'autres)."""
+        batch = []
+        for key in self.client.scan_iter(match=self.key_prefix + "*", count=CLEAR_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) == CLEAR_BATCH_SIZE:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+def build_cache_backend(config):
+    """
+    Construit le backend décrit par la configuration Flask :
+    - CACHE_TYPE : "memory" (défaut), "redis" ou "null"
+    - CACHE_MAX_SIZE, CACHE_TTL : taille et durée de vie du cache mémoire
+    - CACHE_REDIS_URL : URL du serveur pour CACHE_TYPE = "redis"
+    """
+    cache_type = config.get("CACHE_TYPE", "memory")
+    ttl = config.get("CACHE_TTL", 300)
+    if cache_type == "null":
+        return NullCacheBackend()
+    if cache_type == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_TYPE 'redis' requires the 'redis' package")
+        return RedisCacheBackend(redis.Redis.from_url(config["CACHE_REDIS_URL"]), ttl=ttl)
+    if cache_type == "memory":
+        return LRUCacheBackend(max_size=config.get("CACHE_MAX_SIZE", 10000), ttl=ttl)
+    raise ValueError(f"Unknown CACHE_TYPE: {cache_type}")
+
+
+# Clé de session.info où sont notées les invalidations à rejouer au COMMIT
+_PENDING_KEY = "cache_pending_invalidations"
+
+
+class EntityCache:
+    """
+    Cache des lectures de la facade, organisé en espaces de noms
+    (ex : "user", "place", "place_view").
+
+    Chaque espace a une génération : l'incrémenter rend toutes ses
+    entrées inaccessibles (invalidation globale, ex : le renommage d'une
+    commodité invalide toutes les vues de lieux).
+
+    Les invalidations sont appliquées immédiatement puis rejouées après
+    le COMMIT de la transaction, pour qu'une lecture concurrente faite
+    entre-temps ne remette pas en cache l'état d'avant.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUCacheBackend()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def configure(self, backend):
+        """Remplace le backend (appelé par create_app selon la configuration)."""
+        self.backend = backend
+        self.reset_stats()
+
+    # ---------- compteurs ----------
+
+    def _count(self, namespace, outcome):
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+
+    def stats(self):
+        """Compteurs hits/misses par espace de noms, et taille du backend."""
+        with self._lock:
+            namespaces = {ns: dict(c) for ns, c in self._counters.items()}
+        return {
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "hits": sum(c["hits"] for c in namespaces.values()),
+            "misses": sum(c["misses"] for c in namespaces.values()),
+            "namespaces": namespaces
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters = {}
+
+    def clear(self):
+        self.backend.clear()
+        self.reset_stats()
+
+    # ---------- clés et générations ----------
+
+    def _generation(self, namespace):
+        key = f"generation:{namespace}"
+        generation = self.backend.get(key)
+        if generation is None:
+            # Valeur unique : si le compteur a été évincé, les anciennes
+            # entrées ne redeviennent pas accessibles
+            generation = time.time_ns()
+            self.backend.set(key, generation, ttl=10 ** 9)
+        return generation
+
+    def _key(self, namespace, key):
+        return f"{namespace}:{self._generation(namespace)}:{key}"
+
+    # ---------- lecture ----------
+
+    def get_or_load(self, namespace, key, loader, variant=None, version=None):
+        """
+        Retourne la valeur en cache, ou appelle loader() et met son
+        résultat en cache. None n'est jamais mis en cache.
+
+        variant distingue plusieurs représentations d'une même clé (ex :
+        champs demandés) : elles sont stockées ensemble, et invalidate()
+        sur la clé les supprime toutes.
+
+        version (ex : validateur ETag lu en base) : une entrée mise en cache
+        pour une autre version (écriture d'un autre processus) est ignorée
+        et remplacée, avec toutes ses variantes.
+        """
+        cache_key = self._key(namespace, key)
+        entry = self.backend.get(cache_key)
+        if version is not None:
+            entry = entry[1] if entry is not None and entry[0] == version else None
+        if variant is not None:
+            variants = entry or {}
+            entry = variants.get(variant)
+        if entry is not None:
+            self._count(namespace, "hits")
+            return entry
+
+        self._count(namespace, "misses")
+        value = loader()
+        if value is not None:
+            entry = value if variant is None else {**variants, variant: value}
+            self.backend.set(cache_key, entry if version is None else (version, entry))
+        return value
+
+    def get_entity(self, model, namespace, entity_id, loader, exclude=()):
+        """
+        Lecture d'une entité par ID. Sur un hit, l'entité est reconstruite
+        dans la session courante à partir de l'instantané de ses colonnes,
+        sans requête SQL. Les colonnes listées dans exclude ne sont pas
+        stockées (elles seront chargées à la demande).
+        """
+        if not entity_id:
+            return None
+
+        # Déjà présente dans la session de la requête : rien à faire
+        identity = db.session.identity_map.get((model, (entity_id,), None))
+        if identity is not None:
+            return identity
+
+        cache_key = self._key(namespace, entity_id)
+        values = self.backend.get(cache_key)
+        if values is not None:
+            self._count(namespace, "hits")
+            return self._restore(model, values)
+
+        self._count(namespace, "misses")
+        entity = loader(entity_id)
+        if entity is not None:
+            snapshot = self._snapshot(entity, exclude)
+            if snapshot is not None:
+                self.backend.set(cache_key, snapshot)
+        return entity
+
+    @staticmethod
+    def _snapshot(entity, exclude):
+        state = inspect(entity)
+        if state.modified or not state.persistent:
+            return None  # modifications en cours : rien à mettre en cache
+        return {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict and attr.key not in exclude
+        }
+
+    @staticmethod
+    def _restore(model, values):
+        entity = model(**values)
+        make_transient_to_detached(entity)
+        return db.session.merge(entity, load=False)
+
+    # ---------- invalidation ----------
+
+    def invalidate(self, namespace, key):
+        """Supprime une entrée (maintenant et après le COMMIT)."""
+        self.backend.delete(self._key(namespace, key))
+        self._defer(lambda: self.backend.delete(self._key(namespace, key)))
+
+    def invalidate_namespace(self, namespace):
+        """Rend inaccessibles toutes les entrées d'un espace de noms."""
+        self._bump(namespace)
+        self._defer(lambda: self._bump(namespace))
+
+    def _bump(self, namespace):
+        self.backend.set(f"generation:{namespace}", time.time_ns(), ttl=10 ** 9)
+
+    @staticmethod
+    def _defer(action):
+        db.session.info.setdefault(_PENDING_KEY, []).append(action)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _replay_invalidations(session):
+    """Rejoue les invalidations notées pendant la transaction."""
+    if session.in_nested_transaction():
+        return   # fin d'un SAVEPOINT : rejouées à la fin de la transaction
+    for action in session.info.pop(_PENDING_KEY, []):
+        action()
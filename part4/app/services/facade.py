@@ -5,6 +5,29 @@ from app.models.review import Review
 from app.extensions import db
 from app.persistence.repository import UserRepository
 from app.persistence.repository import PlaceRepository, ReviewRepository, AmenityRepository
+from app.persistence.repository import PLACE_RELATIONS, DEFAULT_REVIEW_SORT
+from app.persistence.repository import PLACE_ORDERS, DEFAULT_PLACE_SORT
+from app.persistence.unit_of_work import UnitOfWork, transactional
+from app.services.cache import EntityCache
+from app.services.passwords import password_hasher
+from app.persistence.geo import encode_geohash, radius_bbox, split_bbox
+from app.persistence.bitmap_index import AmenityBitmapIndex
+from app.persistence.search import InvertedIndex, tokenize
+from app.persistence.suggest import SuggestIndex, SUGGESTION_KINDS
+from app.persistence.trigram import TrigramIndex, DEFAULT_SIMILARITY_THRESHOLD
+from app.persistence.revocation import TokenDenylist
+from app.persistence.refresh_sessions import RefreshSessionStore
+
+# Espaces de noms du cache : entités par ID et vues sérialisées
+USER_CACHE = "user"
+PLACE_CACHE = "place"
+AMENITY_CACHE = "amenity"
+REVIEW_CACHE = "review"
+PLACE_VIEW_CACHE = "place_view"
+
+# Nombre d'avis (les plus récents) inclus dans le détail d'un lieu ; les
+# suivants se lisent sur /reviews/places/<place_id>/reviews
+LATEST_REVIEWS = 5
 
 
 class HBnBFacade:
@@ -13,6 +36,39 @@ class HBnBFacade:
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
+        # Cache de lecture (LRU en mémoire par défaut, remplacé par
+        # create_app selon la configuration CACHE_*)
+        self.cache = EntityCache()
+        # Index bitmap des commodités par lieu (filtre ?amenities=)
+        self.amenity_index = AmenityBitmapIndex()
+        # Index plein texte des lieux (remplacé par create_app selon
+        # SEARCH_BACKEND : FTS5 sur SQLite)
+        self.search_index = InvertedIndex()
+        # Autocomplétion des titres de lieux et noms de commodités
+        self.suggest_index = SuggestIndex()
+        # Trigrammes des titres (recherche tolérante aux fautes de frappe)
+        self.fuzzy_index = TrigramIndex()
+        # Jetons JWT révoqués (filtre de Bloom du processus + table)
+        self.revoked_tokens = TokenDenylist()
+        # Sessions de rafraîchissement (rotation des refresh tokens)
+        self.refresh_sessions = RefreshSessionStore()
+
+    def unit_of_work(self):
+        """
+        Ouvre une unité de travail : toutes les écritures faites dans le bloc
+        (y compris par plusieurs méthodes de la facade) sont validées par un
+        seul COMMIT à la sortie, ou annulées si une exception est levée.
+
+            with facade.unit_of_work():
+                facade.create_amenity(...)
+                facade.update_place(...)
+        """
+        return UnitOfWork()
+
+    def _invalidate_place(self, place_id):
+        """Invalide le lieu et sa vue détaillée (agrégats, champs, commodités)."""
+        self.cache.invalidate(PLACE_CACHE, place_id)
+        self.cache.invalidate(PLACE_VIEW_CACHE, place_id)
 
     # ==========================
     # Gestion de User
@@ -23,8 +79,52 @@ class HBnBFacade:
         """
         Récupère un utilisateur par son identifiant.
         Retourne l'objet User ou None si non trouvé.
+        Lecture via le cache (le hash du mot de passe n'y est pas stocké).
         """
-        return self.user_repo.get(user_id)
+        return self.cache.get_entity(User, USER_CACHE, user_id, self.user_repo.get,
+                                     exclude=("password",))
+
+    def get_user_status(self, user_id):
+        """
+        Retourne is_admin pour un utilisateur existant, None sinon
+        (contrôle des jetons, voir api/v1/authz.py).
+        """
+        return self.user_repo.get_status(user_id)
+
+    # ==========================
+    # Révocation des jetons
+    # ==========================
+
+    @transactional
+    def revoke_token(self, jti, expires_at, user_id=None):
+        """
+        Révoque le jeton jti jusqu'à son expiration expires_at (secondes
+        depuis l'epoch, claim exp).
+        """
+        self.revoked_tokens.revoke(jti, expires_at, user_id)
+
+    def is_token_revoked(self, jti):
+        """Vrai si le jeton jti a été révoqué (appelé à chaque requête JWT)."""
+        return self.revoked_tokens.is_revoked(jti)
+
+    @transactional
+    def start_refresh_session(self, family, user_id, jti, expires_at):
+        """Ouvre une session de rafraîchissement (à la connexion)."""
+        self.refresh_sessions.start(family, user_id, jti, expires_at)
+
+    @transactional
+    def rotate_refresh_token(self, family, jti, new_jti, expires_at):
+        """
+        Remplace le jeton de rafraîchissement jti par new_jti.
+        Retourne False si jti n'est plus le jeton courant de la session
+        (session fermée s'il a déjà été échangé : réutilisation).
+        """
+        return self.refresh_sessions.rotate(family, jti, new_jti, expires_at)
+
+    @transactional
+    def end_refresh_session(self, family):
+        """Ferme une session de rafraîchissement (déconnexion, révocation)."""
+        self.refresh_sessions.end(family)
 
     def get_user_by_id(self, user_id):
         """
@@ -39,12 +139,42 @@ class HBnBFacade:
         """
         return self.user_repo.get_by_email(email)
 
+    @transactional
+    def authenticate(self, email, password):
+        """
+        Vérifie les identifiants d'un utilisateur.
+        Retourne le User si le mot de passe est correct, None sinon.
+
+        Un hachage calculé avec un autre coût que la politique courante
+        (BCRYPT_LOG_ROUNDS) est recalculé avec le mot de passe en clair,
+        seul moment où il est disponible.
+        Lève PasswordHasherBusy si trop de vérifications sont en attente.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+
+        if password_hasher.needs_rehash(user.password):
+            user.password = password_hasher.hash(password)
+            self.user_repo.add(user)
+            password_hasher.record_rehash()
+            self.cache.invalidate(USER_CACHE, user.id)
+        return user
+
     def get_all_users(self):
         """
         Retourne la liste de tous les utilisateurs.
         """
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit, after=None):
+        """
+        Retourne une page d'utilisateurs (pagination par curseur).
+        Retour : (users, next_cursor)
+        """
+        return self.user_repo.get_page(limit, after)
+
+    @transactional
     def create_user(self, user_data):
         """
         Crée un nouvel utilisateur à partir d'un dictionnaire de données.
@@ -74,6 +204,7 @@ class HBnBFacade:
         except (KeyError, TypeError, ValueError) as e:
             raise ValueError(f"Invalid user data: {e}")
 
+    @transactional
     def update_user(self, user_id, update_data):
         """
         Met à jour un utilisateur existant avec les données fournies.
@@ -82,7 +213,7 @@ class HBnBFacade:
         Gère correctement le hachage du mot de passe si modifié.
         Lève une ValueError si l'utilisateur n'existe pas.
         """
-        user = self.user_repo.get(user_id)
+        user = self.get_user(user_id)
         if not user:
             raise ValueError(f"User with ID {user_id} not found")
 
@@ -109,6 +240,10 @@ class HBnBFacade:
 
         user.save()  # met à jour updated_at
         self.user_repo.add(user)  # commit SQLAlchemy
+
+        # Le nom et l'e-mail de l'utilisateur figurent dans les vues de lieux
+        self.cache.invalidate(USER_CACHE, user_id)
+        self.cache.invalidate_namespace(PLACE_VIEW_CACHE)
         return user
 
     """ A activer plus tard
@@ -128,6 +263,7 @@ class HBnBFacade:
     # ==========================
 
     # Méthode placeholder pour récupérer un place par ID
+    @transactional
     def create_place(self, place_data):
         """
         Crée un nouveau lieu à partir d'un dictionnaire de données.
@@ -145,92 +281,313 @@ class HBnBFacade:
             if not owner:
                 raise ValueError("Owner not found")
 
-            # Sécurité : forcer amenities à être une liste
-            raw_amenities = place_data.get("amenities", [])
-            if not isinstance(raw_amenities, list):
-                raise TypeError("amenities must be a list")
-            
-            # Validation explicite via les méthodes du modèle Place
-            validator = Place()  # instance "vide" pour utiliser les validateurs
-            title = validator.validate_title(place_data["title"], "Title")
-            description = validator.validate_description(place_data["description"], "Description")
-            price = validator.validate_price(place_data["price"], "Price")
-            latitude = validator.validate_latitude(place_data.get("latitude"), "Latitude")
-            longitude = validator.validate_longitude(place_data.get("longitude"), "Longitude")
-
-            # Création du lieu
-            place = Place(
-                title=title,
-                description=description,
-                price=price,
-                latitude=latitude,
-                longitude=longitude,
-                image_url=place_data.get("image_url"),
-                user_id=owner.id
-            )
-
-            db.session.add(place)  # ajout à la session
+            # Commodités résolues en une seule requête (erreur si ID inconnu)
+            amenities = self._resolve_amenities(place_data.get("amenities", []))
 
-            # Ajout des commodités si elles sont valides
-            for amenity in raw_amenities:
-                if isinstance(amenity, Amenity):
-                    place.add_amenity(amenity)
-                elif isinstance(amenity, str):
-                    a = self.amenity_repo.get(amenity)
-                    if a:
-                        place.amenities.append(a)
-                else:
-                    raise TypeError(f"Invalid amenity type: {type(amenity)}")
+            # Création du lieu à partir des champs validés
+            place = Place(user_id=owner.id, **self._validate_place_fields(place_data))
+            place.amenities = amenities
 
             self.place_repo.add(place)
+            self.search_index.index_place(place)
+            self.suggest_index.index("place", place.id, place.title)
+            self.fuzzy_index.index_place(place)
             print("PLACE CRÉÉ :", place)
             return place
 
         except (KeyError, TypeError, ValueError) as e:
             raise ValueError(f"Invalid place data: {e}")
 
+    def _resolve_amenities(self, raw_amenities):
+        """
+        Convertit une liste de commodités (objets Amenity ou IDs) en objets
+        Amenity, avec une seule requête (WHERE id IN (...)) pour tous les IDs.
+        L'ordre est conservé et les doublons sont retirés.
+
+        Lève une TypeError si la liste ou un de ses éléments a un type invalide,
+        et une ValueError listant tous les IDs inconnus.
+        """
+        if not isinstance(raw_amenities, list):
+            raise TypeError("amenities must be a list")
+        for amenity in raw_amenities:
+            if not isinstance(amenity, (Amenity, str)):
+                raise TypeError(f"Invalid amenity type: {type(amenity)}")
+
+        found = self.amenity_repo.get_many(a for a in raw_amenities if isinstance(a, str))
+        unknown = [a for a in raw_amenities if isinstance(a, str) and a not in found]
+        if unknown:
+            raise ValueError(f"Unknown amenity id(s): {', '.join(dict.fromkeys(unknown))}")
+
+        resolved = {}
+        for amenity in raw_amenities:
+            amenity = found[amenity] if isinstance(amenity, str) else amenity
+            resolved.setdefault(amenity.id, amenity)
+        return list(resolved.values())
+
+    def _validate_place_fields(self, place_data):
+        """
+        Valide les champs simples d'un lieu via les méthodes du modèle Place.
+        Retourne un dictionnaire prêt à passer au constructeur de Place.
+        Lève KeyError, TypeError ou ValueError si une donnée est invalide.
+        """
+        validator = Place()  # instance "vide" pour utiliser les validateurs
+        return {
+            "title": validator.validate_title(place_data["title"], "Title"),
+            "description": validator.validate_description(place_data["description"], "Description"),
+            "price": validator.validate_price(place_data["price"], "Price"),
+            "latitude": validator.validate_latitude(place_data.get("latitude"), "Latitude"),
+            "longitude": validator.validate_longitude(place_data.get("longitude"), "Longitude"),
+            "image_url": place_data.get("image_url"),
+        }
+
+    @transactional
+    def create_places_bulk(self, items, current_user_id, is_admin=False):
+        """
+        Crée plusieurs lieux en une seule opération.
+
+        - Les propriétaires et les commodités référencés par tout le lot sont
+          chargés en une requête IN chacun.
+        - Les titres déjà utilisés par un propriétaire sont vérifiés en une
+          requête, ainsi que les doublons à l'intérieur du lot.
+        - Un élément invalide est signalé sans empêcher la création des autres.
+
+        Paramètres :
+        - items (list[dict]) : lieux à créer (mêmes champs que create_place)
+        - current_user_id (str) : utilisateur authentifié, propriétaire par défaut
+        - is_admin (bool) : un admin peut préciser owner_id pour chaque lieu
+
+        Retour :
+        - (created, errors) : liste des Place créés, liste de
+          {"index": position dans le lot, "error": message}
+        """
+        def owner_of(item):
+            if is_admin and isinstance(item, dict) and item.get("owner_id"):
+                return item["owner_id"]
+            return current_user_id
+
+        dict_items = [item for item in items if isinstance(item, dict)]
+        owners = self.user_repo.get_many(owner_of(item) for item in dict_items)
+        amenities = self.amenity_repo.get_many(
+            amenity_id
+            for item in dict_items if isinstance(item.get("amenities", []), list)
+            for amenity_id in item.get("amenities", []) if isinstance(amenity_id, str)
+        )
+        taken = self.place_repo.get_owner_titles(
+            owners.keys(),
+            [item["title"].strip() for item in dict_items if isinstance(item.get("title"), str)]
+        )
+
+        created, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise TypeError("Each item must be an object")
+                owner = owners.get(owner_of(item))
+                if not owner:
+                    raise ValueError("Owner not found")
+
+                fields = self._validate_place_fields(item)
+                if (owner.id, fields["title"]) in taken:
+                    raise ValueError("This owner already has a place with the same title")
+
+                amenity_ids = item.get("amenities", [])
+                if not isinstance(amenity_ids, list):
+                    raise TypeError("amenities must be a list")
+                unknown = [a for a in amenity_ids if a not in amenities]
+                if unknown:
+                    raise ValueError(f"Unknown amenity id(s): {', '.join(map(str, unknown))}")
+
+                place = Place(user_id=owner.id, **fields)
+                place.amenities = [amenities[a] for a in dict.fromkeys(amenity_ids)]
+                taken.add((owner.id, fields["title"]))
+                created.append(place)
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({"index": index, "error": f"Invalid place data: {e}"})
+
+        self.place_repo.add_all(created)
+        for place in created:
+            self.search_index.index_place(place)
+            self.suggest_index.index("place", place.id, place.title)
+            self.fuzzy_index.index_place(place)
+        return created, errors
+
     def get_place(self, place_id):
         """
-        Récupère un lieu par son identifiant.
+        Récupère un lieu par son identifiant (lecture via le cache).
         """
-        return self.place_repo.get(place_id)
+        return self.cache.get_entity(Place, PLACE_CACHE, place_id, self.place_repo.get)
 
-    def get_place_by_title(self, title):
+    def get_place_view(self, place_id, serializer, embed=PLACE_RELATIONS, fields=None,
+                       version=None):
+        """
+        Retourne la représentation sérialisée d'un lieu, produite par
+        serializer(place, fields, embed, reviews_page) puis mise en cache
+        (une entrée par combinaison fields/embed) jusqu'à la prochaine
+        écriture qui la concerne. Seules les relations de embed sont
+        chargées ; pour les avis, seuls les LATEST_REVIEWS plus récents
+        (reviews_page = (reviews, next_cursor)).
+        version (get_place_version, déjà lue pour l'ETag) : la vue en cache
+        n'est servie que si elle a été produite pour cette version.
+        Retourne None si le lieu n'existe pas.
+        """
+        def load():
+            relations = [name for name in embed if name != "reviews"]
+            place = self.place_repo.get_with_relations(place_id, relations, fields)
+            if not place:
+                return None
+            reviews_page = None
+            if "reviews" in embed:
+                reviews_page = self.review_repo.get_page_by_place(place_id, LATEST_REVIEWS)
+            return serializer(place, fields, embed, reviews_page)
+
+        variant = f"{','.join(fields or ('*',))}|{','.join(embed)}"
+        return self.cache.get_or_load(PLACE_VIEW_CACHE, place_id, load,
+                                      variant=variant, version=version)
+
+    def get_place_by_title(self, title, embed=PLACE_RELATIONS, fields=None):
         """
         Recherche un lieu par son titre exact (sensible à la casse).
+        Seules les relations de embed (et les champs de fields) sont chargés.
         Retourne l'objet Place ou None si non trouvé.
         """
-        return next(
-            (place for place in self.place_repo.get_all() if place.title ==
-             title),
-            None
-        )
+        return self.place_repo.get_by_title(title, embed, fields)
 
-    def get_all_places(self):
+    def search_places(self, query, limit, embed=PLACE_RELATIONS, fields=None):
+        """
+        Recherche plein texte dans les titres et descriptions : lieux
+        contenant tous les mots de query, du plus au moins pertinent.
+        Retour : [(place, score)]
+        Soulève une ValueError si query ne contient aucun mot.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            raise ValueError("'q' must contain at least one word")
+        ranked = self.search_index.search(tokens, limit)
+        places = self.place_repo.get_many_with_relations(
+            [place_id for place_id, _ in ranked], embed, fields)
+        return [(places[place_id], score) for place_id, score in ranked if place_id in places]
+
+    def search_places_fuzzy(self, query, limit, threshold=DEFAULT_SIMILARITY_THRESHOLD,
+                            embed=PLACE_RELATIONS, fields=None):
         """
-        Retourne la liste de tous les lieux enregistrés.
+        Recherche approximative par titre (tolère les fautes de frappe) :
+        lieux dont le titre a une similarité de trigrammes d'au moins
+        threshold avec query, du plus au moins proche.
+        Retour : [(place, similarité)]
+        Soulève une ValueError si query ne contient aucun mot ou si le
+        seuil n'est pas dans ]0, 1].
         """
-        return self.place_repo.get_all()
+        if not 0 < threshold <= 1:
+            raise ValueError("'threshold' must be greater than 0 and at most 1")
+        if not tokenize(query):
+            raise ValueError("'q' must contain at least one word")
+        ranked = self.fuzzy_index.search(query, limit, threshold)
+        places = self.place_repo.get_many_with_relations(
+            [place_id for place_id, _ in ranked], embed, fields)
+        return [(places[place_id], score) for place_id, score in ranked if place_id in places]
 
-    def get_places_by_user(self, user_id):
+    def suggest(self, prefix, limit, kinds=SUGGESTION_KINDS):
+        """
+        Autocomplétion : au plus limit titres de lieux et noms de
+        commodités dont un mot commence par prefix (sans requête SQL).
+        Retour : liste de {"type", "id", "label"}
+        """
+        return self.suggest_index.suggest(prefix, limit, kinds)
+
+    def get_all_places(self):
+        """
+        Retourne la liste de tous les lieux enregistrés, avec leurs relations
+        (owner, amenities, reviews et auteurs) déjà chargées.
+        """
+        return self.place_repo.get_all_with_relations()
+
+    def get_places_page(self, limit, after=None, embed=PLACE_RELATIONS, fields=None,
+                        min_price=None, max_price=None, sort=DEFAULT_PLACE_SORT,
+                        amenity_ids=()):
+        """
+        Retourne une page de lieux (pagination par curseur), relations de
+        embed préchargées, dont le prix est compris entre min_price et
+        max_price (bornes facultatives) et qui possèdent toutes les
+        commodités de amenity_ids, triée selon sort : "created" (défaut),
+        "price", "-price", "rating" ou "-rating".
+        Retour : (places, next_cursor)
+        Soulève une ValueError si le tri est inconnu, les bornes
+        incohérentes ou une commodité introuvable.
+        """
+        if sort not in PLACE_ORDERS:
+            raise ValueError(f"'sort' must be one of: {', '.join(PLACE_ORDERS)}")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("'min_price' must not exceed 'max_price'")
+
+        place_ids = None
+        if amenity_ids:
+            found = self.amenity_repo.get_many(amenity_ids)
+            unknown = [a for a in amenity_ids if a not in found]
+            if unknown:
+                raise ValueError(f"Unknown amenity id(s): {', '.join(unknown)}")
+            # Intersection des bitmaps : seuls ces lieux sont lus en base
+            place_ids = self.amenity_index.places_with_all(amenity_ids)
+            if not place_ids:
+                return [], None
+        return self.place_repo.get_page_with_relations(limit, after, embed, fields,
+                                                       min_price, max_price, sort,
+                                                       place_ids, amenity_ids)
+
+    def get_places_by_user(self, user_id, embed=PLACE_RELATIONS, fields=None):
         """
         Retourne la liste des lieux appartenant à un utilisateur donné.
         Utile pour afficher tous les logements d’un hôte.
         """
-        return [
-            place for place in self.place_repo.get_all()
-            if place.owner and place.owner.id == user_id
-        ]
+        return self.place_repo.get_by_owner(user_id, embed, fields)
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit, after=None,
+                          embed=PLACE_RELATIONS, fields=None):
+        """
+        Retourne les lieux situés à moins de radius_km du point donné, du
+        plus proche au plus éloigné (pagination par curseur).
+        Retour : ([(place, distance_km)], next_cursor)
+        """
+        boxes = split_bbox(*radius_bbox(latitude, longitude, radius_km))
+        return self.place_repo.get_nearby(latitude, longitude, boxes, limit, after,
+                                          radius_km, embed, fields)
+
+    def get_places_in_bbox(self, bbox, limit, after=None, embed=PLACE_RELATIONS, fields=None):
+        """
+        Retourne les lieux situés dans le rectangle
+        bbox = (min_lon, min_lat, max_lon, max_lat), du plus proche au plus
+        éloigné de son centre (pagination par curseur). Un rectangle dont
+        min_lon > max_lon franchit l'antiméridien.
+        Retour : ([(place, distance_km)], next_cursor)
+        """
+        min_lon, min_lat, max_lon, max_lat = bbox
+        width = max_lon - min_lon if min_lon <= max_lon else max_lon - min_lon + 360
+        center_lon = (min_lon + width / 2 + 180) % 360 - 180
+        center_lat = (min_lat + max_lat) / 2
+        return self.place_repo.get_nearby(center_lat, center_lon, split_bbox(*bbox), limit,
+                                          after, None, embed, fields)
+
+    def backfill_geohashes(self, batch_size=1000):
+        """
+        Calcule le geohash des lieux enregistrés avant l'ajout de la
+        colonne (un COMMIT par lot). Retourne le nombre de lieux mis à jour.
+        """
+        updated = 0
+        while True:
+            with self.unit_of_work():
+                places = self.place_repo.get_missing_geohash(batch_size)
+                for place in places:
+                    place.geohash = encode_geohash(place.latitude, place.longitude)
+            updated += len(places)
+            if len(places) < batch_size:
+                return updated
 
     def get_places_by_owner(self, owner_id):
         """
         Retourne tous les lieux appartenant à un propriétaire donné.
         """
-        return [
-            p for p in self.place_repo.get_all()
-            if hasattr(p, "owner") and p.owner and p.owner.id == owner_id
-        ]
+        return self.place_repo.get_by_owner(owner_id)
 
+    @transactional
     def update_place(self, place_id, update_data):
         """
         Met à jour un lieu existant avec les données fournies.
@@ -242,28 +599,42 @@ class HBnBFacade:
 
         # - Vérification de conflit sur le titre
         if "title" in update_data and update_data["title"] != place.title:
-            for other_place in self.get_places_by_owner(place.owner.id):
-                if other_place.id != place.id and other_place.title == update_data["title"]:
-                    raise ValueError("Title already used by this owner")
+            other_place = self.place_repo.get_by_owner_and_title(place.user_id, update_data["title"])
+            if other_place and other_place.id != place.id:
+                raise ValueError("Title already used by this owner")
 
-        # - Séparation de la liste des amenities, si présente
+        # - Séparation de la liste des amenities, si présente, et résolution
+        #   en une seule requête avant toute modification
         amenities = update_data.pop("amenities", None)
+        if amenities is not None:
+            try:
+                amenities = self._resolve_amenities(amenities)
+            except TypeError as e:
+                raise ValueError(str(e))
 
         # - Mise à jour des autres champs
         place.update(**update_data)
 
-        # - Mise à jour des amenities si fournie
+        # - Mise à jour des amenities si fournie : seules les lignes
+        #   place_amenity ajoutées ou retirées sont écrites
         if amenities is not None:
-            place.amenities.clear()
-            for amenity in amenities:
-                if isinstance(amenity, Amenity):
-                    place.add_amenity(amenity)
-                elif isinstance(amenity, str):
-                    a = self.amenity_repo.get(amenity)
-                    if a:
-                        place.add_amenity(a)
+            wanted_ids = {amenity.id for amenity in amenities}
+            removed = [a for a in place.amenities if a.id not in wanted_ids]
+            current_ids = {amenity.id for amenity in place.amenities}
+            added = [a for a in amenities if a.id not in current_ids]
+
+            for amenity in removed:
+                place.amenities.remove(amenity)
+            place.amenities.extend(added)
+            if removed or added:
+                place.save()  # la modification des commodités compte comme une mise à jour
 
         self.place_repo.add(place)
+        if "title" in update_data or "description" in update_data:
+            self.search_index.index_place(place)
+            self.suggest_index.index("place", place.id, place.title)
+            self.fuzzy_index.index_place(place)
+        self._invalidate_place(place_id)
         return place
 
     """ A activer plus tard
@@ -283,19 +654,49 @@ class HBnBFacade:
     # ==========================
 
     # Gestion des commodités (Amenity)
+    @transactional
     def create_amenity(self, amenity_data):
         """
         Crée une nouvelle commodité.
         """
         amenity = Amenity(**amenity_data)
         self.amenity_repo.add(amenity)
+        self.suggest_index.index("amenity", amenity.id, amenity.name)
         return amenity
 
+    @transactional
+    def create_amenities_bulk(self, items):
+        """
+        Crée plusieurs commodités en une seule opération (un seul COMMIT).
+        Chaque élément doit contenir un champ 'name' valide ; un élément
+        invalide est signalé sans empêcher la création des autres.
+
+        Retour :
+        - (created, errors) : liste des Amenity créées, liste de
+          {"index": position dans le lot, "error": message}
+        """
+        validator = Amenity()
+        created, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise TypeError("Each item must be an object")
+                name = validator.validate_name(item["name"], "Name")
+                created.append(Amenity(name=name))
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({"index": index, "error": f"Invalid amenity data: {e}"})
+
+        self.amenity_repo.add_all(created)
+        for amenity in created:
+            self.suggest_index.index("amenity", amenity.id, amenity.name)
+        return created, errors
+
     def get_amenity(self, amenity_id):
         """
-        Récupère une commodité par son identifiant.
+        Récupère une commodité par son identifiant (lecture via le cache).
         """
-        return self.amenity_repo.get(amenity_id)
+        return self.cache.get_entity(Amenity, AMENITY_CACHE, amenity_id,
+                                     self.amenity_repo.get)
 
     def get_all_amenities(self):
         """
@@ -303,6 +704,14 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit, after=None):
+        """
+        Retourne une page de commodités (pagination par curseur).
+        Retour : (amenities, next_cursor)
+        """
+        return self.amenity_repo.get_page(limit, after)
+
+    @transactional
     def update_amenity(self, amenity_id, update_data):
         """
         Met à jour une commodité existante.
@@ -322,6 +731,11 @@ class HBnBFacade:
         # - Mise à jour dans le repo
         self.amenity_repo.update(amenity_id, update_data)
 
+        self.suggest_index.index("amenity", amenity.id, amenity.name)
+
+        # Le nom de la commodité figure dans les vues de lieux
+        self.cache.invalidate(AMENITY_CACHE, amenity_id)
+        self.cache.invalidate_namespace(PLACE_VIEW_CACHE)
         return amenity
 
     # ==========================
@@ -329,6 +743,7 @@ class HBnBFacade:
     # ==========================
 
     # Création d'un nouvel avis utilisateur
+    @transactional
     def create_review(self, review_data):
         """
         Crée un nouvel avis à partir d'un dictionnaire de données.
@@ -336,24 +751,26 @@ class HBnBFacade:
         """
         try:
             # correspondance avec le champ attendu par Swagger
-            user = self.user_repo.get(review_data["user_id"])
+            user = self.get_user(review_data["user_id"])
             if not user:
                 raise ValueError("User not found")
 
-            place = self.place_repo.get(review_data["place_id"])
+            place = self.get_place(review_data["place_id"])
             if not place:
                 raise ValueError("Place not found")
 
+            rating = Review.validate_rating(review_data["rating"], "Rating")
             review = Review(
                 text=review_data["text"],
-                rating=review_data["rating"],
+                rating=rating,
                 author=user,  # l’attribut dans Review reste "author"
-                place=place
+                place=place   # le backref ajoute aussi la review à place.reviews
             )
 
+            # Agrégats du lieu mis à jour dans le même commit que l'avis
+            place.record_rating_change(added=rating)
             self.review_repo.add(review)
-            place.reviews.append(review)     # synchronisation relationnelle
-            self.place_repo.add(place)    # re-save du lieu avec la review liée
+            self._invalidate_place(place.id)
 
             return {
                 "id": review.id,
@@ -369,11 +786,63 @@ class HBnBFacade:
         except (KeyError, TypeError, ValueError) as e:
             raise ValueError(f"Invalid review data: {e}")
 
+    @transactional
+    def create_reviews_bulk(self, items, user_id):
+        """
+        Crée plusieurs avis d'un même auteur en une seule opération.
+
+        - Les lieux référencés sont chargés en une requête IN.
+        - Les lieux déjà notés par l'auteur sont vérifiés en une requête,
+          ainsi que les doublons à l'intérieur du lot.
+        - Les agrégats de notes des lieux sont mis à jour dans le même COMMIT.
+        - Un élément invalide est signalé sans empêcher la création des autres.
+
+        Retour :
+        - (created, errors) : liste des Review créées, liste de
+          {"index": position dans le lot, "error": message}
+        """
+        user = self.user_repo.get(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        place_ids = [item.get("place_id") for item in items
+                     if isinstance(item, dict) and isinstance(item.get("place_id"), str)]
+        places = self.place_repo.get_many(place_ids)
+        reviewed = self.review_repo.get_reviewed_place_ids(user.id, places.keys())
+
+        created, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise TypeError("Each item must be an object")
+                place = places.get(item.get("place_id"))
+                if not place:
+                    raise ValueError("Place not found")
+                if place.user_id == user.id:
+                    raise ValueError("You cannot review your own place")
+                if place.id in reviewed:
+                    raise ValueError("You have already reviewed this place")
+
+                text = Review.validate_text(item["text"], "Text")
+                rating = Review.validate_rating(item["rating"], "Rating")
+
+                review = Review(text=text, rating=rating, author=user, place=place)
+                place.record_rating_change(added=rating)
+                reviewed.add(place.id)
+                created.append(review)
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({"index": index, "error": f"Invalid review data: {e}"})
+
+        self.review_repo.add_all(created)
+        for place_id in {review.place.id for review in created}:
+            self._invalidate_place(place_id)
+        return created, errors
+
     def get_review(self, review_id):
         """
-        Récupère un avis par son identifiant.
+        Récupère un avis par son identifiant (lecture via le cache).
         """
-        return self.review_repo.get(review_id)
+        return self.cache.get_entity(Review, REVIEW_CACHE, review_id, self.review_repo.get)
 
     def get_all_reviews(self):
         """
@@ -381,6 +850,13 @@ class HBnBFacade:
         """
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, limit, after=None):
+        """
+        Retourne une page d'avis (pagination par curseur).
+        Retour : (reviews, next_cursor)
+        """
+        return self.review_repo.get_page(limit, after)
+
     def get_reviews_by_place(self, place_id):
         """
         Retourne la liste des avis associés à un lieu donné.
@@ -390,17 +866,29 @@ class HBnBFacade:
         if not place:
             raise ValueError("Place not found")
 
-        return [
-            review for review in self.review_repo.get_all()
-            if review.place and review.place.id == place_id
-        ]
+        return self.review_repo.get_by_place(place_id)
+
+    def get_place_reviews_page(self, place_id, limit, after=None, sort=DEFAULT_REVIEW_SORT):
+        """
+        Retourne une page d'avis d'un lieu (pagination par curseur), triée
+        selon sort : "-date" (défaut), "date", "-rating" ou "rating" (validé
+        par l'API, voir parse_review_sort).
+        Retour : (reviews, next_cursor)
+        Soulève une ValueError si le lieu est introuvable ou le curseur invalide.
+        """
+        if not self.get_place(place_id):
+            raise ValueError("Place not found")
+        return self.review_repo.get_page_by_place(place_id, limit, after, sort)
 
+    @transactional
     def update_review(self, review_id, update_data):
         """
         Met à jour le texte et/ou la note d'un avis existant.
         Ne modifie ni l’auteur ni le lieu associé.
         """
-        review = self.get_review(review_id)
+        # Lecture en base (jamais via le cache) : l'ancienne note est
+        # retirée des agrégats du lieu
+        review = self.review_repo.get_for_update(review_id)
         if not review:
             raise ValueError(f"Review with ID {review_id} not found")
 
@@ -409,31 +897,41 @@ class HBnBFacade:
             review.text = review.validate_text(update_data["text"], "Text")
 
         if "rating" in update_data:
+            old_rating = review.rating
             review.rating = review.validate_rating(update_data["rating"],
                                                    "Rating")
+            review.place.record_rating_change(added=review.rating,
+                                              removed=old_rating)
 
-        # Sauvegarde dans le repo
+        # Sauvegarde dans le repo (avis et agrégats du lieu en un commit)
         self.review_repo.add(review)
+        self.cache.invalidate(REVIEW_CACHE, review_id)
+        self._invalidate_place(review.place_id)
 
         return review
 
+    @transactional
     def delete_review(self, review_id):
         """
         Supprime un avis par son identifiant.
         Met aussi à jour la liste des reviews dans l’objet Place lié.
         Soulève une ValueError si la review est introuvable.
         """
-        review = self.get_review(review_id)
+        review = self.review_repo.get_for_update(review_id)
         if not review:
             raise ValueError("Review not found")
 
-        # Nettoyage de la relation dans le Place concerné
+        # Nettoyage de la relation et des agrégats du Place concerné,
+        # validés dans le même commit que la suppression
         place = review.place
-        if place and review in place.reviews:
-            place.reviews.remove(review)
-            self.place_repo.add(place)
+        if place:
+            place.record_rating_change(removed=review.rating)
+            if review in place.reviews:
+                place.reviews.remove(review)
 
         self.review_repo.delete(review_id)
+        self.cache.invalidate(REVIEW_CACHE, review_id)
+        self._invalidate_place(review.place_id)
 
     def get_reviews_by_user(self, user_id):
         """
@@ -444,17 +942,63 @@ class HBnBFacade:
         if not user:
             raise ValueError("User not found")
 
-        return [
-            review for review in self.review_repo.get_all()
-            if review.author and review.author.id == user_id
-        ]
+        return self.review_repo.get_by_user(user_id)
 
     def get_average_rating_for_place(self, place_id):
         """
-        Calcule la moyenne des notes pour un lieu donné.
-        Retourne None si aucun avis.
+        Retourne la moyenne des notes pour un lieu donné (lue dans les
+        agrégats du lieu, sans charger ses avis).
+        Retourne None si aucun avis, soulève une erreur si le lieu est introuvable.
         """
-        reviews = self.get_reviews_by_place(place_id)
-        if not reviews:
-            return None
-        return sum(r.rating for r in reviews) / len(reviews)
+        place = self.place_repo.get(place_id)
+        if not place:
+            raise ValueError("Place not found")
+        return place.average_rating
+
+    def get_rating_distribution_for_place(self, place_id):
+        """
+        Retourne l'histogramme des notes (1 à 5) d'un lieu donné.
+        Soulève une erreur si le lieu est introuvable.
+        """
+        place = self.place_repo.get(place_id)
+        if not place:
+            raise ValueError("Place not found")
+        return place.rating_distribution
+
+    # ==========================
+    # Versions des ressources (requêtes conditionnelles HTTP)
+    # ==========================
+    # Chaque méthode retourne un tuple bon marché à calculer (requête
+    # d'agrégat, sans charger les lignes) qui change dès que la
+    # représentation de la ressource change ; None si elle n'existe pas.
+
+    def get_user_version(self, user_id):
+        return self.user_repo.get_version(user_id)
+
+    def get_users_version(self):
+        return self.user_repo.get_collection_version()
+
+    def get_amenity_version(self, amenity_id):
+        return self.amenity_repo.get_version(amenity_id)
+
+    def get_amenities_version(self):
+        return self.amenity_repo.get_collection_version()
+
+    def get_review_version(self, review_id):
+        return self.review_repo.get_version(review_id)
+
+    def get_reviews_version(self, **filters):
+        """Version des avis, éventuellement restreints (place_id=..., user_id=...)."""
+        return self.review_repo.get_collection_version(**filters)
+
+    def get_place_reviews_version(self, place_id):
+        """Version des avis d'un lieu (auteurs inclus)."""
+        return self.review_repo.get_place_reviews_version(place_id)
+
+    def get_place_version(self, place_id):
+        """Version de la vue détaillée d'un lieu (avis, auteurs, commodités inclus)."""
+        return self.place_repo.get_detail_version(place_id)
+
+    def get_places_version(self):
+        """Version des listes de lieux (propriétaires, commodités et avis inclus)."""
+        return self.place_repo.get_listing_version()
@@ -0,0 +1,144 @@
+"""services/passwords.py
+
+Service de hachage des mots de passe (bcrypt), utilisé par User.
+
+- Le coût (log2 du nombre de tours) vient de BCRYPT_LOG_ROUNDS.
+- Hachages et vérifications s'exécutent dans un pool de processus
+  (PASSWORD_HASH_WORKERS) : une rafale de connexions n'occupe plus les
+  threads des workers HTTP ni leur GIL. Avec 0 processus, le calcul se
+  fait dans le thread appelant (tests, scripts).
+- La file des vérifications est bornée (PASSWORD_HASH_MAX_PENDING) : au-delà,
+  PasswordHasherBusy est levée et la connexion est refusée (503) plutôt
+  que mise en attente sans limite.
+- needs_rehash() signale les hachages dont le coût diffère de la
+  politique : la facade les recalcule à la connexion suivante.
+
+Les compteurs (file courante, pic, refus...) sont exposés par /metrics.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+
+# Coût par défaut (même valeur que Flask-Bcrypt)
+DEFAULT_LOG_ROUNDS = 12
+DEFAULT_MAX_PENDING = 64
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Trop de vérifications en attente : réessayer plus tard."""
+
+
+def hash_cost(hashed):
+    """Coût d'un hachage bcrypt ("$2b$12$...") ou None s'il est illisible."""
+    try:
+        return int(hashed.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """Hachage et vérification bcrypt déportés dans un pool de processus."""
+
+    def __init__(self, rounds=DEFAULT_LOG_ROUNDS, workers=0, max_pending=DEFAULT_MAX_PENDING):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._set_policy(rounds, workers, max_pending)
+
+    def _set_policy(self, rounds, workers, max_pending):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._peak_pending = 0
+        self._counts = {"hashed": 0, "verified": 0, "rejected": 0, "rehashed": 0}
+        self._wait_ms = 0.0
+
+    def configure(self, config):
+        """
+        Applique BCRYPT_LOG_ROUNDS, PASSWORD_HASH_WORKERS (None : un
+        processus par CPU, 0 : pas de pool) et PASSWORD_HASH_MAX_PENDING.
+        """
+        workers = config.get("PASSWORD_HASH_WORKERS")
+        self.shutdown()
+        with self._lock:
+            self._set_policy(config.get("BCRYPT_LOG_ROUNDS", DEFAULT_LOG_ROUNDS),
+                             (os.cpu_count() or 1) if workers is None else workers,
+                             config.get("PASSWORD_HASH_MAX_PENDING", DEFAULT_MAX_PENDING))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _run(self, func, *args, bounded):
+        """Exécute func dans le pool (ou sur place) en tenant la file à jour."""
+        with self._lock:
+            if bounded and self._pending >= self.max_pending:
+                self._counts["rejected"] += 1
+                raise PasswordHasherBusy("Too many password checks in progress")
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+            # Pool créé au premier usage : après le fork des workers gunicorn
+            if self.workers and self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+
+        start = time.perf_counter()
+        try:
+            if executor is None:
+                return func(*args)
+            return executor.submit(func, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._wait_ms += (time.perf_counter() - start) * 1000
+
+    # ---------- API ----------
+
+    def hash(self, password):
+        """Hache password au coût de la politique (file non bornée)."""
+        salt = bcrypt.gensalt(self.rounds)
+        hashed = self._run(bcrypt.hashpw, password.encode("utf-8"), salt, bounded=False)
+        with self._lock:
+            self._counts["hashed"] += 1
+        return hashed.decode("utf-8")
+
+    def verify(self, hashed, password):
+        """
+        Vérifie password contre le hachage stocké.
+        Lève PasswordHasherBusy si la file des vérifications est pleine.
+        """
+        if hash_cost(hashed) is None:
+            return False
+        try:
+            result = self._run(bcrypt.checkpw, password.encode("utf-8"),
+                               hashed.encode("utf-8"), bounded=True)
+        except ValueError:
+            # Hachage stocké corrompu ("Invalid salt")
+            result = False
+        with self._lock:
+            self._counts["verified"] += 1
+        return result
+
+    def needs_rehash(self, hashed):
+        """Vrai si le hachage n'a pas été calculé au coût de la politique."""
+        return hash_cost(hashed) != self.rounds
+
+    def record_rehash(self):
+        with self._lock:
+            self._counts["rehashed"] += 1
+
+    def stats(self):
+        with self._lock:
+            done = self._counts["hashed"] + self._counts["verified"]
+            return {"rounds": self.rounds, "workers": self.workers,
+                    "pending": self._pending, "peak_pending": self._peak_pending,
+                    "max_pending": self.max_pending, **self._counts,
+                    "avg_ms": round(self._wait_ms / done, 1) if done else None}
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,203 @@
+"""services/throttle.py
+
+Limitation des tentatives de connexion par seau à jetons (token bucket),
+évaluée avant toute requête SQL et tout calcul bcrypt.
+
+Chaque clé (adresse IP du client, e-mail visé) possède un seau de
+`burst` jetons, regagnés au rythme d'un jeton toutes les `interval`
+secondes. Une tentative consomme un jeton ; un seau vide la refuse, avec
+le délai avant le prochain jeton (Retry-After).
+
+- RateLimitBackend : interface de stockage des seaux
+- MemoryRateLimitBackend : seaux du processus (par défaut), nombre de clés
+  borné (éviction LRU)
+- RedisRateLimitBackend : seaux partagés entre workers sur un serveur
+  compatible Redis (Redis, Valkey, KeyDB...), mis à jour atomiquement par
+  un script Lua
+- NullRateLimitBackend : désactive la limitation
+- LoginThrottle : règles par IP et par e-mail, compteurs de refus
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class RateLimitBackend(ABC):
+    """Stockage des seaux à jetons."""
+
+    @abstractmethod
+    def take(self, key, burst, rate):
+        """
+        Consomme un jeton du seau key (burst jetons au plus, rate jetons
+        regagnés par seconde).
+        Retour : (accepté, secondes avant le prochain jeton si refusé)
+        """
+
+    def size(self):
+        """Nombre de seaux stockés, si le backend sait le dire."""
+        return None
+
+
+class NullRateLimitBackend(RateLimitBackend):
+    """Backend qui accepte toutes les tentatives."""
+
+    def take(self, key, burst, rate):
+        return True, 0.0
+
+
+def _refill(tokens, updated_at, now, burst, rate):
+    """Jetons disponibles à now dans un seau laissé à tokens à updated_at."""
+    return min(burst, tokens + max(0.0, now - updated_at) * rate)
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Seaux en mémoire du processus, au plus max_keys. Au-delà, le seau
+    utilisé le moins récemment est oublié (il repartira plein). Sûr entre
+    threads.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # clé -> (jetons, horodatage)
+        self._lock = threading.Lock()
+
+    def take(self, key, burst, rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = _refill(tokens, updated_at, now, burst, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def size(self):
+        return len(self._buckets)
+
+
+# Lecture, recharge et consommation en une seule opération côté serveur :
+# plusieurs workers peuvent viser la même clé en même temps
+_TAKE_SCRIPT = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Seaux partagés sur un serveur compatible Redis (client redis-py ou
+    tout objet offrant eval()). Un seau expire une fois redevenu plein.
+    """
+
+    def __init__(self, client, key_prefix="hbnb:throttle:"):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def take(self, key, burst, rate):
+        allowed, tokens = self.client.eval(_TAKE_SCRIPT, 1, self.key_prefix + key,
+                                           burst, rate, time.time())
+        tokens = float(tokens)
+        return bool(allowed), 0.0 if allowed else (1 - tokens) / rate
+
+
+def build_rate_limit_backend(config):
+    """
+    Construit le backend décrit par la configuration Flask :
+    - LOGIN_THROTTLE_BACKEND : "memory" (défaut), "redis" ou "null"
+    - LOGIN_THROTTLE_MAX_KEYS : nombre de seaux du backend mémoire
+    - LOGIN_THROTTLE_REDIS_URL : URL du serveur (défaut : CACHE_REDIS_URL)
+    """
+    backend = config.get("LOGIN_THROTTLE_BACKEND", "memory")
+    if backend == "null":
+        return NullRateLimitBackend()
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("LOGIN_THROTTLE_BACKEND 'redis' requires the 'redis' package")
+        url = config.get("LOGIN_THROTTLE_REDIS_URL") or config["CACHE_REDIS_URL"]
+        return RedisRateLimitBackend(redis.Redis.from_url(url))
+    if backend == "memory":
+        return MemoryRateLimitBackend(config.get("LOGIN_THROTTLE_MAX_KEYS", 100000))
+    raise ValueError(f"Unknown LOGIN_THROTTLE_BACKEND: {backend}")
+
+
+class LoginThrottle:
+    """
+    Règles de limitation des connexions : un seau par adresse IP et un
+    seau par e-mail (normalisé). L'IP est vérifiée d'abord : une attaque
+    répartie sur de nombreux comptes depuis une même adresse est arrêtée
+    sans consommer les jetons des comptes visés.
+    """
+
+    def __init__(self, backend=None, ip_rule=(30, 2), email_rule=(5, 60)):
+        self.backend = backend or MemoryRateLimitBackend()
+        self._lock = threading.Lock()
+        self._set_rules(ip_rule, email_rule)
+
+    def _set_rules(self, ip_rule, email_rule):
+        # (burst, interval) -> (burst, jetons par seconde)
+        self.rules = {"ip": (ip_rule[0], 1 / ip_rule[1]),
+                      "email": (email_rule[0], 1 / email_rule[1])}
+        self._counts = {"allowed": 0, "rejected_ip": 0, "rejected_email": 0}
+
+    def configure(self, config, backend=None):
+        """
+        Applique LOGIN_THROTTLE_IP_BURST/_INTERVAL et
+        LOGIN_THROTTLE_EMAIL_BURST/_INTERVAL (tentatives d'affilée, secondes
+        pour regagner une tentative) et le backend de la configuration.
+        """
+        with self._lock:
+            self.backend = backend or build_rate_limit_backend(config)
+            self._set_rules(
+                (config.get("LOGIN_THROTTLE_IP_BURST", 30),
+                 config.get("LOGIN_THROTTLE_IP_INTERVAL", 2)),
+                (config.get("LOGIN_THROTTLE_EMAIL_BURST", 5),
+                 config.get("LOGIN_THROTTLE_EMAIL_INTERVAL", 60)))
+
+    def check(self, ip, email):
+        """
+        Consomme une tentative pour ip puis pour email.
+        Retour : None si la tentative est acceptée, sinon le nombre de
+        secondes à attendre (entier, au moins 1).
+        """
+        email = email.strip().lower() if isinstance(email, str) else ""
+        for scope, value in (("ip", ip or "unknown"), ("email", email)):
+            burst, rate = self.rules[scope]
+            allowed, retry_after = self.backend.take(f"{scope}:{value}", burst, rate)
+            if not allowed:
+                with self._lock:
+                    self._counts[f"rejected_{scope}"] += 1
+                return max(1, math.ceil(retry_after))
+        with self._lock:
+            self._counts["allowed"] += 1
+        return None
+
+    def stats(self):
+        with self._lock:
+            return {"backend": type(self.backend).__name__, "buckets": self.backend.size(),
+                    **self._counts}
+
+
+login_throttle = LoginThrottle()
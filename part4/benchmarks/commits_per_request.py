@@ -0,0 +1,142 @@
+"""benchmarks/commits_per_request.py
+
+Compte les COMMIT SQL émis par requête HTTP d'écriture, et mesure le coût
+d'une série de créations faites une par une ou regroupées dans une unité
+de travail (facade.unit_of_work()).
+
+Chaque COMMIT correspond à un fsync sous SQLite et à un aller-retour
+réseau sous MySQL : moins il y en a, mieux c'est.
+
+Lancement (depuis part4/) :
+    python -m benchmarks.commits_per_request [nombre_de_créations]
+
+Résultats de référence (SQLite fichier, 200 créations) :
+
+    requête / opération        avant   après
+    POST /reviews              2       1
+    autres écritures HTTP      1       1
+    200 create_amenity()       200     1 (dans facade.unit_of_work())
+                               ~330 ms ~20 ms
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from config import TestingConfig
+
+PASSWORD = "Benchmark123!!"
+
+
+def make_app(database_path):
+    class BenchmarkConfig(TestingConfig):
+        # Fichier réel : le coût d'un COMMIT inclut l'écriture disque
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        JWT_SECRET_KEY = "benchmark-secret-key-of-at-least-32-bytes"
+    return create_app(BenchmarkConfig)
+
+
+class CommitCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(db.session, "after_commit", self._on_commit)
+
+    def _on_commit(self, session):
+        self.count += 1
+
+    def measure(self, func):
+        before = self.count
+        result = func()
+        return result, self.count - before
+
+
+def login(client, email):
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json['access_token']}"}
+
+
+def commits_per_request(app, counter):
+    client = app.test_client()
+    admin = facade.create_user({"first_name": "Admin", "last_name": "HBnB",
+                                "email": "admin@bench.io", "password": PASSWORD,
+                                "is_admin": True})
+    facade.create_user({"first_name": "Guest", "last_name": "HBnB",
+                        "email": "guest@bench.io", "password": PASSWORD})
+    admin_headers = login(client, "admin@bench.io")
+    guest_headers = login(client, "guest@bench.io")
+
+    rows = []
+
+    def run(label, method, url, headers, payload=None):
+        response, commits = counter.measure(
+            lambda: getattr(client, method)(url, json=payload, headers=headers))
+        rows.append((label, response.status_code, commits))
+        return response
+
+    amenity = run("POST /amenities", "post", "/api/v1/amenities/", admin_headers,
+                  {"name": "WiFi"}).json
+    run("PUT /amenities/<id>", "put", f"/api/v1/amenities/{amenity['id']}", admin_headers,
+        {"name": "Fibre"})
+    place = run("POST /places", "post", "/api/v1/places/", admin_headers,
+                {"title": "Bench", "description": "D", "price": 10.0, "latitude": 1.0,
+                 "longitude": 1.0, "amenities": [amenity["id"]]}).json
+    run("PUT /places/<id>", "put", f"/api/v1/places/{place['id']}", admin_headers,
+        {"title": "Bench 2", "amenities": []})
+    review = run("POST /reviews", "post", "/api/v1/reviews/", guest_headers,
+                 {"text": "Nice", "rating": 4, "user_id": "x", "place_id": place["id"]}).json
+    run("PUT /reviews/<id>", "put", f"/api/v1/reviews/{review['id']}", guest_headers,
+        {"text": "Nicer", "rating": 5, "user_id": "x", "place_id": place["id"]})
+    run("DELETE /reviews/<id>", "delete", f"/api/v1/reviews/{review['id']}", guest_headers)
+    run("PUT /users/<id>", "put", f"/api/v1/users/{admin.id}", admin_headers,
+        {"first_name": "Root"})
+    return rows
+
+
+def batched_creations(counter, count):
+    def one_by_one():
+        for i in range(count):
+            facade.create_amenity({"name": f"Single {i}"})
+
+    def grouped():
+        with facade.unit_of_work():
+            for i in range(count):
+                facade.create_amenity({"name": f"Grouped {i}"})
+
+    results = []
+    for label, func in (("une par une", one_by_one), ("unit_of_work()", grouped)):
+        start = time.perf_counter()
+        _, commits = counter.measure(func)
+        results.append((label, commits, time.perf_counter() - start))
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        # Les traces de debug de l'application sont écartées de la sortie
+        with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+            db.create_all()
+            counter = CommitCounter()
+            per_request = commits_per_request(app, counter)
+            batched = batched_creations(counter, count)
+            db.session.remove()
+
+    print("COMMIT par requête d'écriture")
+    for label, status, commits in per_request:
+        print(f"  {label:<24} HTTP {status}  {commits} commit(s)")
+
+    print(f"\n{count} créations de commodités")
+    for label, commits, elapsed in batched:
+        print(f"  {label:<24} {commits:>5} commit(s)  {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
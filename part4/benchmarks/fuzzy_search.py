@@ -0,0 +1,172 @@
+"""benchmarks/fuzzy_search.py
+
+Mesure la recherche approximative par titre (?q=...&fuzzy=true) sur
+500 000 titres de lieux, avec l'index de trigrammes et sans index.
+
+- sans index : similarité de trigrammes calculée contre chaque titre
+  (parcours complet, ce que demanderait une recherche floue sans index)
+- index de trigrammes : TrigramIndex.search() (comptage des trigrammes
+  communs sur les seules listes des trigrammes de la requête)
+
+Les titres combinent un adjectif, un type de logement et deux noms
+propres fictifs tirés de 8 000 ; les recherches sont des titres existants
+dans lesquels une faute de frappe (lettre remplacée, supprimée ou
+inversée) a été introduite.
+
+Lancement (depuis part4/) :
+    python -m benchmarks.fuzzy_search [nombre_de_titres] [nombre_de_requêtes]
+
+Résultats de référence (500 000 titres, 10 requêtes, seuil 0.3, top 10) :
+
+    construction de l'index   ~16 s
+    méthode                   moyenne    p95
+    sans index (parcours)     ~10.9 s    ~12.0 s
+    index de trigrammes       ~158 ms    ~179 ms
+    titre d'origine en tête : 10/10
+"""
+
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+
+from app import create_app
+from app.extensions import db
+from app.models.base import generate_id
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.trigram import TrigramIndex, trigrams, similarity
+from config import TestingConfig
+
+THRESHOLD = 0.3
+TOP_K = 10
+INSERT_BATCH = 50000
+
+ADJECTIVES = ["Charmant", "Grand", "Petit", "Joli", "Cosy", "Lumineux", "Calme", "Vieux",
+              "Moderne", "Rustique", "Spacieux", "Ancien", "Élégant", "Paisible"]
+KINDS = ["studio", "chalet", "appartement", "loft", "villa", "gîte", "maison", "cabane",
+         "duplex", "mas", "moulin", "refuge", "bungalow", "péniche"]
+SYLLABLES = ["ba", "bel", "bo", "ca", "cha", "col", "da", "dor", "fa", "fon", "ga", "gri",
+             "la", "lan", "li", "lu", "ma", "mar", "mo", "na", "nor", "pa", "pel", "ri",
+             "ro", "sa", "sel", "ta", "ti", "tour", "va", "ver", "vi", "zan"]
+VOCABULARY_SIZE = 8000
+
+
+def make_vocabulary(rng):
+    """Noms propres fictifs (lieux-dits, rues, domaines...)."""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize())
+    return sorted(words)
+
+
+def make_app(database_path):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+    return create_app(BenchmarkConfig)
+
+
+def make_title(rng, vocabulary):
+    return (f"{rng.choice(ADJECTIVES)} {rng.choice(KINDS)} "
+            f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}")
+
+
+def add_typo(rng, title):
+    """Introduit une faute de frappe dans un mot du titre."""
+    words = title.split(" ")
+    position = rng.randrange(len(words))
+    word = words[position]
+    if len(word) > 3:
+        i = rng.randrange(1, len(word) - 1)
+        word = rng.choice([
+            word[:i] + rng.choice("aeiourst") + word[i + 1:],   # lettre remplacée
+            word[:i] + word[i + 1:],                            # lettre supprimée
+            word[:i - 1] + word[i] + word[i - 1] + word[i + 1:],  # lettres inversées
+        ])
+    words[position] = word
+    return " ".join(words)
+
+
+def seed(count):
+    owner = User(first_name="Bench", last_name="Owner", email="owner@bench.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+    titles = {}
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, INSERT_BATCH):
+        rows = []
+        for i in range(start, min(start + INSERT_BATCH, count)):
+            place_id = generate_id()
+            titles[place_id] = make_title(rng, vocabulary)
+            rows.append({"id": place_id, "title": titles[place_id], "description": "D",
+                         "price": 10.0, "user_id": owner.id,
+                         "created_at": now, "updated_at": now})
+        db.session.execute(insert(Place), rows)
+        db.session.commit()
+    return titles
+
+
+def scan_search(titles, query):
+    grams = trigrams(query)
+    scored = [(similarity(grams, trigrams(title)), place_id)
+              for place_id, title in titles.items()]
+    scored = [item for item in scored if item[0] >= THRESHOLD]
+    return [place_id for _, place_id in sorted(scored, reverse=True)[:TOP_K]]
+
+
+def measure(func, queries):
+    timings, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(func(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[max(0, int(len(timings) * 0.95) - 1)], results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+            db.create_all()
+            titles = seed(count)
+
+            rng = random.Random(7)
+            targets = rng.sample(sorted(titles), query_count)
+            queries = [add_typo(rng, titles[place_id]) for place_id in targets]
+
+            index = TrigramIndex(max_age=None)
+            start = time.perf_counter()
+            index._ensure_built()
+            built_in = time.perf_counter() - start
+
+            indexed = measure(
+                lambda q: [place_id for place_id, _ in index.search(q, TOP_K, THRESHOLD)],
+                queries)
+            scan = measure(lambda q: scan_search(titles, q), queries)
+            db.session.remove()
+
+    found = sum(result[:1] == [target] for result, target in zip(indexed[2], targets))
+    print(f"{count} titres ; {query_count} requêtes avec faute de frappe, "
+          f"seuil {THRESHOLD}, top {TOP_K}")
+    print(f"  construction de l'index   {built_in:.1f} s")
+    print(f"  {'méthode':<24} {'moyenne':>10} {'p95':>10}")
+    for label, (mean, p95, _) in (("sans index (parcours)", scan), ("index de trigrammes", indexed)):
+        print(f"  {label:<24} {mean:>7.1f} ms {p95:>7.1f} ms")
+    print(f"  titre d'origine en tête : {found}/{query_count}")
+
+
+if __name__ == "__main__":
+    main()
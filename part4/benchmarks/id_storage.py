@@ -0,0 +1,132 @@
+"""benchmarks/id_storage.py
+
+Compare le stockage des clés en texte (36 caractères) et sur 16 octets
+(ID_STORAGE = "binary") : taille des tables et des index de clés, jointure
+avis -> lieux et lectures par identifiant.
+
+Lancement (depuis part4/) :
+    python -m benchmarks.id_storage [nombre_de_lieux] [avis_par_lieu]
+
+Résultats de référence (200 000 lieux, 2 avis par lieu, SQLite fichier) :
+
+    stockage   base       index de clés   jointure   2000 lectures
+    text       ~336 Mo    ~126 Mo         ~158 ms    ~2.97 s
+    binary     ~227 Mo    ~77 Mo          ~162 ms    ~2.76 s
+
+Le gain porte sur la taille (-32 % pour la base, -39 % pour les index de
+clés) : plus de clés par page, donc moins de pages à lire et à garder en
+cache quand la base dépasse la mémoire. Sur une base qui tient en cache,
+jointure et lectures par l'ORM restent du même ordre.
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.extensions import db
+from app.models.base import generate_id
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services import facade
+from config import TestingConfig
+
+INSERT_BATCH = 50000
+LOOKUPS = 2000
+
+
+def make_app(database_path, storage):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        ID_STORAGE = storage
+        CACHE_TYPE = "null"
+    return create_app(BenchmarkConfig)
+
+
+def seed(count, reviews_per_place):
+    owner = User(first_name="Bench", last_name="Owner", email="owner@bench.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+
+    now = datetime.now(timezone.utc)
+    place_ids = []
+    for start in range(0, count, INSERT_BATCH):
+        rows = [{"id": generate_id(), "title": f"Place {i}", "description": "D", "price": 10.0,
+                 "user_id": owner.id, "created_at": now, "updated_at": now}
+                for i in range(start, min(start + INSERT_BATCH, count))]
+        place_ids.extend(row["id"] for row in rows)
+        db.session.execute(insert(Place), rows)
+        db.session.commit()
+
+    rng = random.Random(42)
+    for start in range(0, count * reviews_per_place, INSERT_BATCH):
+        rows = [{"id": generate_id(), "text": "Bien", "rating": 4, "user_id": owner.id,
+                 "place_id": rng.choice(place_ids), "created_at": now, "updated_at": now}
+                for _ in range(start, min(start + INSERT_BATCH, count * reviews_per_place))]
+        db.session.execute(insert(Review), rows)
+        db.session.commit()
+    return place_ids
+
+
+def key_index_size():
+    """Taille des index portant sur des clés (primaires et étrangères)."""
+    return db.session.execute(text(
+        "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'sqlite_autoindex_%' "
+        "OR name LIKE '%\\_id' ESCAPE '\\'"
+    )).scalar()
+
+
+def timed(func, repeat=3):
+    """Meilleur temps (ms) sur repeat exécutions."""
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def run(storage, count, reviews_per_place, tmp):
+    path = os.path.join(tmp, f"{storage}.db")
+    app = make_app(path, storage)
+    with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        db.create_all()
+        place_ids = seed(count, reviews_per_place)
+        db.session.execute(text("VACUUM"))
+        index_size = key_index_size()
+
+        join = timed(lambda: db.session.execute(text(
+            "SELECT COUNT(*) FROM reviews JOIN places ON places.id = reviews.place_id"
+        )).scalar())
+        sample = random.Random(7).sample(place_ids, LOOKUPS)
+        lookups = timed(lambda: [facade.place_repo.get(place_id) for place_id in sample])
+        db.session.remove()
+    return os.path.getsize(path), index_size, join, lookups
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    reviews_per_place = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {storage: run(storage, count, reviews_per_place, tmp)
+                   for storage in ("text", "binary")}
+
+    print(f"{count} lieux, {count * reviews_per_place} avis")
+    print(f"  {'stockage':<9} {'base':>9} {'index de clés':>15} {'jointure':>10} "
+          f"{f'{LOOKUPS} lectures':>14}")
+    for storage, (size, index_size, join, lookups) in results.items():
+        print(f"  {storage:<9} {size / 1e6:>6.1f} Mo {index_size / 1e6:>12.1f} Mo "
+              f"{join:>7.0f} ms {lookups:>11.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
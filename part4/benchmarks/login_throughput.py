@@ -0,0 +1,121 @@
+"""benchmarks/login_throughput.py
+
+Débit des connexions (POST /api/v1/auth/login) pendant une rafale, et
+latence des autres requêtes (GET /api/v1/places/?limit=20) servies en même
+temps, avec bcrypt calculé dans le thread de la requête
+(PASSWORD_HASH_WORKERS = 0) puis dans le pool de processus du service de
+hachage (un processus par CPU).
+
+Lancement (depuis part4/) :
+    python -m benchmarks.login_throughput [threads_de_connexion] [secondes] [coût]
+
+Résultats de référence (8 threads de connexion, 1 thread de lecture,
+10 s, coût 12, machine virtuelle à 1 CPU, 2 exécutions) :
+
+    bcrypt            connexions/s   lecture moyenne   lecture p95
+    thread requête    ~2.9           ~39 ms            ~67 ms
+    pool processus    ~2.1           ~6 ms             ~7.7 ms
+
+Calculé dans les threads de la requête, bcrypt monopolise le processus :
+les autres requêtes attendent ~7 fois plus. Dans le pool, le
+système répartit le CPU entre le processus web et les processus de
+hachage : les lectures restent rapides pendant la rafale. Sur un seul
+CPU le débit des connexions est borné par le coût bcrypt (~300 ms à 12)
+et baisse un peu (échanges entre processus, part du CPU laissée aux
+lectures) ; avec plusieurs CPU, le pool en utilise un par processus.
+"""
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from app.services.passwords import password_hasher
+from config import TestingConfig
+
+PASSWORD = "Bench-Passw0rd!"
+
+
+def make_app(database_path, workers, rounds):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        BCRYPT_LOG_ROUNDS = rounds
+        PASSWORD_HASH_WORKERS = workers
+        PASSWORD_HASH_MAX_PENDING = 1000
+        CACHE_TYPE = "null"
+    return create_app(BenchmarkConfig)
+
+
+def login_loop(client, email, deadline, counts, lock):
+    done = 0
+    while time.monotonic() < deadline:
+        response = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.status_code
+        done += 1
+    with lock:
+        counts["logins"] += done
+
+
+def read_loop(client, deadline, latencies):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        client.get("/api/v1/places/?limit=20")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run(workers, threads, duration, rounds, tmp):
+    app = make_app(os.path.join(tmp, f"bench-{workers}.db"), workers, rounds)
+    with app.app_context():
+        db.create_all()
+        emails = []
+        for i in range(threads):
+            user = facade.create_user({"first_name": "Bench", "last_name": f"User{i}",
+                                       "email": f"user{i}@bench.io", "password": PASSWORD})
+            emails.append(user.email)
+        db.session.remove()
+
+    client = app.test_client()
+    # Démarrage du pool de processus hors mesure
+    client.post("/api/v1/auth/login", json={"email": emails[0], "password": PASSWORD})
+
+    counts, lock, latencies = {"logins": 0}, threading.Lock(), []
+    deadline = time.monotonic() + duration
+    pool = [threading.Thread(target=login_loop, args=(client, email, deadline, counts, lock))
+            for email in emails]
+    pool.append(threading.Thread(target=read_loop, args=(client, deadline, latencies)))
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    password_hasher.shutdown()
+
+    latencies.sort()
+    return (counts["logins"] / duration, statistics.mean(latencies),
+            latencies[int(len(latencies) * 0.95) - 1])
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        results = {label: run(workers, threads, duration, rounds, tmp)
+                   for label, workers in (("thread requête", 0),
+                                          ("pool processus", os.cpu_count() or 1))}
+
+    print(f"{threads} threads de connexion, 1 thread de lecture, {duration:g} s, coût {rounds}")
+    print(f"  {'bcrypt':<16} {'connexions/s':>13} {'lecture moy.':>13} {'lecture p95':>12}")
+    for label, (rate, mean, p95) in results.items():
+        print(f"  {label:<16} {rate:>13.1f} {mean:>10.1f} ms {p95:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""benchmarks/nearby_search.py
+
+Mesure la recherche de lieux autour d'un point (GET /places/nearby) sur
+une base d'un million de lieux répartis sur la France métropolitaine, avec
+et sans l'index geohash.
+
+- sans index : filtre sur le rectangle latitude/longitude englobant le
+  cercle, sans index utilisable (parcours de la table), puis tri par distance
+- avec index : facade.get_places_nearby() (plages de l'index places.geohash)
+
+Lancement (depuis part4/) :
+    python -m benchmarks.nearby_search [nombre_de_lieux] [nombre_de_requêtes]
+
+Résultats de référence (SQLite fichier, 1 000 000 lieux, 50 requêtes,
+rayon 5 km, 20 résultats par page) :
+
+    méthode                 moyenne    p95
+    sans index (scan)       ~281 ms    ~306 ms
+    index geohash           ~5.0 ms    ~9.4 ms
+
+Insertion du jeu de données : ~62 s.
+"""
+
+import contextlib
+import io
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+
+from app import create_app
+from app.extensions import db
+from app.models.base import generate_id
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.geo import encode_geohash, radius_bbox, KM_PER_DEGREE
+from app.services import facade
+from config import TestingConfig
+
+# Zone couverte (France métropolitaine) et paramètres des requêtes
+MIN_LAT, MAX_LAT = 42.3, 51.1
+MIN_LON, MAX_LON = -4.8, 8.2
+RADIUS_KM = 5
+PAGE_SIZE = 20
+INSERT_BATCH = 50000
+
+
+def make_app(database_path):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+    return create_app(BenchmarkConfig)
+
+
+def seed(count):
+    owner = User(first_name="Bench", last_name="Owner", email="owner@bench.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, INSERT_BATCH):
+        rows = []
+        for i in range(start, min(start + INSERT_BATCH, count)):
+            lat = rng.uniform(MIN_LAT, MAX_LAT)
+            lon = rng.uniform(MIN_LON, MAX_LON)
+            rows.append({"id": generate_id(), "title": f"Place {i}", "description": "D",
+                         "price": 10.0, "latitude": lat, "longitude": lon,
+                         "geohash": encode_geohash(lat, lon), "user_id": owner.id,
+                         "created_at": now, "updated_at": now})
+        db.session.execute(insert(Place), rows)
+        db.session.commit()
+
+
+def scan_nearby(latitude, longitude):
+    """Même recherche sans l'index geohash : filtre sur le rectangle seul."""
+    min_lon, min_lat, max_lon, max_lat = radius_bbox(latitude, longitude, RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lat = Place.latitude - latitude
+    d_lon = (Place.longitude - longitude) * cos_lat
+    distance = d_lat * d_lat + d_lon * d_lon
+    return Place.query.filter(
+        Place.latitude.between(min_lat, max_lat),
+        Place.longitude.between(min_lon, max_lon),
+        distance <= (RADIUS_KM / KM_PER_DEGREE) ** 2,
+    ).order_by(distance, Place.id).limit(PAGE_SIZE).all()
+
+
+def indexed_nearby(latitude, longitude):
+    places, _ = facade.get_places_nearby(latitude, longitude, RADIUS_KM, PAGE_SIZE,
+                                         embed=(), fields=("title",))
+    return places
+
+
+def measure(func, points):
+    timings, results = [], []
+    for latitude, longitude in points:
+        db.session.expunge_all()
+        start = time.perf_counter()
+        results.append(len(func(latitude, longitude)))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.95) - 1], results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(7)
+    points = [(rng.uniform(MIN_LAT + 1, MAX_LAT - 1), rng.uniform(MIN_LON + 1, MAX_LON - 1))
+              for _ in range(queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+            db.create_all()
+            start = time.perf_counter()
+            seed(count)
+            seeded_in = time.perf_counter() - start
+            scan = measure(scan_nearby, points)
+            indexed = measure(indexed_nearby, points)
+            db.session.remove()
+
+    assert scan[2] == indexed[2], "les deux méthodes doivent trouver les mêmes lieux"
+    print(f"{count} lieux insérés en {seeded_in:.1f} s ; {queries} requêtes, "
+          f"rayon {RADIUS_KM} km, {statistics.mean(indexed[2]):.1f} résultats en moyenne")
+    print(f"  {'méthode':<22} {'moyenne':>10} {'p95':>10}")
+    for label, (mean, p95, _) in (("sans index (scan)", scan), ("index geohash", indexed)):
+        print(f"  {label:<22} {mean:>8.2f} ms {p95:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""benchmarks/sqlite_concurrency.py
+
+Débit d'un mélange de lectures et d'écritures concurrentes sur une même
+base SQLite fichier, comme sous gunicorn avec plusieurs workers
+multi-threads, avec les réglages par défaut puis SQLITE_PROFILE =
+"production" (voir app/persistence/sqlite.py).
+
+Chaque processus crée sa propre application (son moteur et son pool) ;
+chacun de ses threads enchaîne pendant la durée du test des lectures
+(page de 20 lieux, titre et prix) et, une fois sur WRITE_EVERY, une
+écriture (avis, avec mise à jour des agrégats du lieu, un COMMIT).
+
+Lancement (depuis part4/) :
+    python -m benchmarks.sqlite_concurrency [processus] [threads] [secondes]
+
+Résultats de référence (4 processus × 4 threads, 10 s, 1 écriture pour
+4 opérations, machine virtuelle à 1 CPU, 4 exécutions) :
+
+    profil       lectures/s   écritures/s   "database is locked"
+    défaut       ~230         ~77           0
+    production   ~245         ~82           0
+
+Sur un seul CPU le test est limité par Python (ORM, sérialisation) : le
+gain du profil se limite aux fsync évités par synchronous=NORMAL. Avec
+plusieurs CPU, le WAL laisse en plus les lectures avancer pendant les
+écritures au lieu de les sérialiser sur le verrou de la base.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+from config import TestingConfig
+
+PLACES = 200
+WRITE_EVERY = 4
+PROFILES = (None, "production")
+
+
+def make_app(database_path, profile):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        SQLITE_PROFILE = profile
+        CACHE_TYPE = "null"
+    return create_app(BenchmarkConfig)
+
+
+def seed(app):
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="Bench", last_name="Owner", email="owner@bench.io", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        owner_id = owner.id
+        places, _ = facade.create_places_bulk(
+            [{"title": f"Place {i}", "description": "D", "price": 10.0,
+              "latitude": 45.0, "longitude": 6.0} for i in range(PLACES)], owner_id)
+        place_ids = [place.id for place in places]
+        db.session.remove()
+        return owner_id, place_ids
+
+
+def worker_thread(app, user_id, place_ids, deadline, counts, lock):
+    reads = writes = locked = 0
+    with app.app_context():
+        i = 0
+        while time.monotonic() < deadline:
+            i += 1
+            try:
+                if i % WRITE_EVERY == 0:
+                    facade.create_review({"text": "Bien", "rating": 4, "user_id": user_id,
+                                          "place_id": place_ids[i % len(place_ids)]})
+                    writes += 1
+                else:
+                    facade.get_places_page(20, embed=(), fields=("title", "price"))
+                    reads += 1
+            except OperationalError:
+                # "database is locked" : le verrou n'a pas été obtenu à temps
+                db.session.rollback()
+                locked += 1
+            db.session.remove()
+    with lock:
+        counts["reads"] += reads
+        counts["writes"] += writes
+        counts["locked"] += locked
+
+
+def worker_process(database_path, profile, user_id, place_ids, threads, duration, queue):
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = make_app(database_path, profile)
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+        pool = [threading.Thread(target=worker_thread,
+                                 args=(app, user_id, place_ids, deadline, counts, lock))
+                for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    queue.put(counts)
+
+
+def run(profile, processes, threads, duration, tmp):
+    path = os.path.join(tmp, f"{profile or 'default'}.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        user_id, place_ids = seed(make_app(path, profile))
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=worker_process,
+                               args=(path, profile, user_id, place_ids, threads, duration,
+                                     queue))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    totals = {"reads": 0, "writes": 0, "locked": 0}
+    for _ in workers:
+        for key, value in queue.get().items():
+            totals[key] += value
+    for worker in workers:
+        worker.join()
+    return totals
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {profile: run(profile, processes, threads, duration, tmp)
+                   for profile in PROFILES}
+
+    print(f"{processes} processus × {threads} threads, {duration:g} s, "
+          f"1 écriture pour {WRITE_EVERY} opérations")
+    print(f"  {'profil':<12} {'lectures/s':>11} {'écritures/s':>12} {'locked':>8}")
+    for profile, totals in results.items():
+        print(f"  {profile or 'défaut':<12} {totals['reads'] / duration:>11.0f} "
+              f"{totals['writes'] / duration:>12.0f} {totals['locked']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""benchmarks/token_refresh.py
+
+Coût serveur du renouvellement d'une session quand le jeton d'accès
+expire : nouvelle connexion (POST /api/v1/auth/login, vérification bcrypt)
+ou échange du jeton de rafraîchissement (POST /api/v1/auth/refresh).
+
+Le temps CPU est mesuré dans le processus (PASSWORD_HASH_WORKERS = 0 :
+bcrypt calculé dans le thread de la requête).
+
+Lancement (depuis part4/) :
+    python -m benchmarks.token_refresh [renouvellements] [coût]
+
+Résultats de référence (50 renouvellements, coût 12, base SQLite
+fichier, machine virtuelle à 1 CPU) :
+
+    renouvellement   CPU par appel   durée par appel
+    login            ~345 ms         ~350 ms
+    refresh          ~3 ms           ~3 ms
+
+Avec des jetons d'accès de 5 minutes, une session active toute une
+journée coûte ~290 renouvellements : ~100 s de CPU en se reconnectant,
+~1 s avec /auth/refresh (deux requêtes SQL : rôle de l'utilisateur et
+rotation, un COMMIT).
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from config import TestingConfig
+
+PASSWORD = "Bench-Passw0rd!"
+
+
+def make_app(database_path, rounds):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        BCRYPT_LOG_ROUNDS = rounds
+        LOGIN_THROTTLE_BACKEND = "null"
+        CACHE_TYPE = "null"
+    return create_app(BenchmarkConfig)
+
+
+def measure(call, count):
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(count):
+        call()
+    return ((time.process_time() - cpu) / count * 1000,
+            (time.perf_counter() - wall) / count * 1000)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        app = make_app(os.path.join(tmp, "bench.db"), rounds)
+        with app.app_context():
+            db.create_all()
+            facade.create_user({"first_name": "Bench", "last_name": "User",
+                                "email": "user@bench.io", "password": PASSWORD})
+            db.session.remove()
+
+        client = app.test_client()
+        credentials = {"email": "user@bench.io", "password": PASSWORD}
+
+        def login():
+            response = client.post("/api/v1/auth/login", json=credentials)
+            assert response.status_code == 200, response.status_code
+            return response.json
+
+        tokens = login()
+
+        def refresh():
+            response = client.post("/api/v1/auth/refresh", headers={
+                "Authorization": f"Bearer {tokens['refresh_token']}"})
+            assert response.status_code == 200, response.status_code
+            tokens.update(response.json)
+
+        results = {"login": measure(login, count), "refresh": measure(refresh, count)}
+
+    print(f"{count} renouvellements, coût bcrypt {rounds}")
+    print(f"  {'renouvellement':<15} {'CPU/appel':>10} {'durée/appel':>12}")
+    for label, (cpu, wall) in results.items():
+        print(f"  {label:<15} {cpu:>7.1f} ms {wall:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
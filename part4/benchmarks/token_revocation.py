@@ -0,0 +1,94 @@
+"""benchmarks/token_revocation.py
+
+Coût du contrôle de révocation fait à chaque requête JWT, pour un jeton
+valide, avec N jetons révoqués non expirés : filtre de Bloom du processus
+(facade.is_token_revoked) puis, pour comparaison, requête SQL par
+requête sur la table revoked_tokens (clé primaire).
+
+Lancement (depuis part4/) :
+    python -m benchmarks.token_revocation [jetons_révoqués] [contrôles]
+
+Résultats de référence (filtre dimensionné pour 100 000 jetons à 0,1 %,
+200 000 contrôles, base SQLite fichier, machine virtuelle à 1 CPU) :
+
+    jetons révoqués   filtre de Bloom   requête SQL   faux positifs
+    1 000             ~0.8 µs           ~280 µs       0
+    100 000           ~1.6 µs           ~270 µs       ~0.1 %
+
+Le filtre (175 Ko) évite la requête pour tous les jetons valides sauf
+les faux positifs ; la confirmation exacte n'est faite que pour eux et
+les jetons révoqués. Son coût dépend du remplissage : peu rempli, le
+premier bit lu écarte presque tous les jetons valides ; à pleine
+capacité, il en faut deux en moyenne. Sur cette machine un appel de
+fonction Python vide coûte déjà ~60 ns : sur un CPU courant, le contrôle
+reste sous la microseconde dans le cas courant (peu de jetons révoqués
+non expirés).
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+from sqlalchemy import insert, select
+
+from app import create_app
+from app.extensions import db
+from app.models.revoked_token import RevokedToken
+from app.services import facade
+from config import TestingConfig
+
+
+def make_app(database_path):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        REVOKED_TOKENS_SYNC_INTERVAL = 3600
+        CACHE_TYPE = "null"
+    return create_app(BenchmarkConfig)
+
+
+def per_check_us(check, jtis):
+    start = time.perf_counter()
+    for jti in jtis:
+        check(jti)
+    return (time.perf_counter() - start) / len(jtis) * 1e6
+
+
+def main():
+    revoked = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    checks = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    expires_at = int(time.time()) + 3600
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        app = make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context():
+            db.create_all()
+            db.session.execute(insert(RevokedToken), [
+                {"jti": str(uuid.uuid4()), "expires_at": expires_at, "revoked_at": time.time()}
+                for _ in range(revoked)])
+            db.session.commit()
+
+            facade.is_token_revoked(str(uuid.uuid4()))   # construction du filtre
+            # jti neufs à chaque contrôle, comme ceux lus dans les jetons
+            bloom = per_check_us(facade.is_token_revoked,
+                                 [str(uuid.uuid4()) for _ in range(checks)])
+            stats = facade.revoked_tokens.stats()
+
+            def sql_check(jti):
+                return db.session.execute(
+                    select(RevokedToken.jti).where(RevokedToken.jti == jti,
+                                                   RevokedToken.expires_at > time.time())
+                ).first() is not None
+            sql = per_check_us(sql_check, [str(uuid.uuid4()) for _ in range(checks // 20)])
+
+    print(f"{revoked} jetons révoqués, {checks} contrôles de jetons valides")
+    print(f"  {'contrôle':<16} {'par requête':>12} {'mémoire':>10}")
+    print(f"  {'filtre de Bloom':<16} {bloom:>9.2f} µs {stats['filter']['bytes'] // 1024:>7} Ko")
+    print(f"  {'requête SQL':<16} {sql:>9.2f} µs {'-':>10}")
+    print(f"  faux positifs : {stats['false_positives']} / {checks}")
+
+
+if __name__ == "__main__":
+    main()
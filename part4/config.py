@@ -1,11 +1,112 @@
+from datetime import timedelta
+
+
 class Config:
     SECRET_KEY = "your_secret_key"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Durée des jetons : accès courts, renouvelés sans mot de passe par
+    # POST /api/v1/auth/refresh avec le jeton de rafraîchissement (changé
+    # à chaque renouvellement, session fermée s'il est réutilisé)
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=14)
+
+    # Cache de lecture de la facade : "memory" (LRU du processus),
+    # "redis" (CACHE_REDIS_URL) ou "null" (désactivé)
+    CACHE_TYPE = "memory"
+    CACHE_MAX_SIZE = 10000
+    CACHE_TTL = 300  # secondes
+    CACHE_REDIS_URL = "redis://localhost:6379/0"
+
+    # Index bitmap des commodités (filtre ?amenities=) : reconstruit depuis
+    # la base au plus tard après cette durée (écritures d'autres processus)
+    AMENITY_INDEX_MAX_AGE = 300  # secondes
+
+    # Recherche plein texte des lieux (?q=) : "fts5" (SQLite), "memory"
+    # (index inversé du processus) ou "auto" (fts5 si la base est SQLite)
+    SEARCH_BACKEND = "auto"
+    SEARCH_INDEX_MAX_AGE = 300  # secondes, index "memory" seulement
+
+    # Index d'autocomplétion (/api/v1/suggest), reconstruit depuis la base
+    # au plus tard après cette durée
+    SUGGEST_INDEX_MAX_AGE = 300  # secondes
+
+    # Index de trigrammes des titres (recherche approximative ?fuzzy=true)
+    FUZZY_INDEX_MAX_AGE = 300  # secondes
+
+    # Stockage des clés primaires et étrangères : "text" (36 caractères)
+    # ou "binary" (16 octets). Une base existante se convertit avec
+    # `flask --app run convert-ids binary` avant de changer ce réglage.
+    ID_STORAGE = "text"
+
+    # Réglages du moteur SQLite (voir app/persistence/sqlite.py) : None
+    # (défauts) ou "production" (WAL, synchronous=NORMAL, mmap, cache,
+    # busy_timeout, clés étrangères, pool multi-threads). SQLITE_PRAGMAS
+    # complète ou remplace les PRAGMA du profil.
+    SQLITE_PROFILE = None
+    SQLITE_PRAGMAS = {}
+
+    # Hachage des mots de passe (voir app/services/passwords.py) : coût
+    # bcrypt (les hachages d'un autre coût sont recalculés à la connexion),
+    # processus de calcul (None : un par CPU, 0 : dans le thread de la
+    # requête) et vérifications en attente au-delà desquelles la
+    # connexion répond 503
+    BCRYPT_LOG_ROUNDS = 12
+    PASSWORD_HASH_WORKERS = None
+    PASSWORD_HASH_MAX_PENDING = 64
+
+    # Limitation des tentatives de connexion (voir app/services/throttle.py) :
+    # BURST tentatives d'affilée, puis une de plus toutes les INTERVAL
+    # secondes, par adresse IP et par e-mail. Backend : "memory" (par
+    # processus), "redis" (partagé entre workers, LOGIN_THROTTLE_REDIS_URL
+    # ou CACHE_REDIS_URL) ou "null" (désactivé)
+    LOGIN_THROTTLE_BACKEND = "memory"
+    LOGIN_THROTTLE_MAX_KEYS = 100000
+    LOGIN_THROTTLE_REDIS_URL = None
+    LOGIN_THROTTLE_IP_BURST = 30
+    LOGIN_THROTTLE_IP_INTERVAL = 2  # secondes
+    LOGIN_THROTTLE_EMAIL_BURST = 5
+    LOGIN_THROTTLE_EMAIL_INTERVAL = 60  # secondes
+
+    # Routes protégées (voir app/api/v1/authz.py) : les droits sont lus
+    # dans le JWT signé. Au-delà de 0, l'existence et le rôle de
+    # l'utilisateur sont relus au plus une fois par USER_STATUS_TTL
+    # secondes (délai de prise en compte d'une suppression ou d'une
+    # rétrogradation) ; 0 : les claims font seules foi
+    USER_STATUS_TTL = 30  # secondes
+
+    # Jetons révoqués (voir app/persistence/revocation.py) : filtre de Bloom
+    # dimensionné pour CAPACITY jetons révoqués non expirés au taux de faux
+    # positifs ERROR_RATE, révocations des autres workers relues toutes
+    # les SYNC_INTERVAL secondes, filtre reconstruit sans les jetons
+    # expirés toutes les MAX_AGE secondes
+    REVOKED_TOKENS_CAPACITY = 100000
+    REVOKED_TOKENS_ERROR_RATE = 0.001
+    REVOKED_TOKENS_SYNC_INTERVAL = 2  # secondes
+    REVOKED_TOKENS_MAX_AGE = 300  # secondes
+
+    # Contrôle au démarrage que les tables lues à chaque requête existent
+    # (migrations de SQL/migrations appliquées)
+    CHECK_SCHEMA_ON_STARTUP = True
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///dev.db"
+    # Plusieurs workers (gunicorn) partagent le même fichier de base
+    SQLITE_PROFILE = "production"
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    # Clés étrangères contrôlées comme en production
+    SQLITE_PROFILE = "production"
+    # Hachage rapide et sans pool de processus
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    # Tables créées par les tests (create_all) après create_app
+    CHECK_SCHEMA_ON_STARTUP = False
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,34 @@
+# tests/conftest.py
+
+import pytest
+from app import create_app
+from app.extensions import db
+from config import TestingConfig
+
+
+@pytest.fixture
+def app():
+    """Application Flask configurée sur une base SQLite en mémoire."""
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    """Fabrique d'en-têtes Authorization pour un utilisateur donné."""
+    from flask_jwt_extended import create_access_token
+
+    def make(user):
+        token = create_access_token(identity=str(user.id),
+                                    additional_claims={"is_admin": bool(user.is_admin)})
+        return {"Authorization": f"Bearer {token}"}
+    return make
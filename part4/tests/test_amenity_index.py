@@ -0,0 +1,88 @@
+# tests/test_amenity_index.py
+
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.bitmap_index import AmenityBitmapIndex
+from app.services import facade
+
+
+def seed():
+    owner = User(first_name="Leia", last_name="Organa", email="leia@hbnb.io", password="x")
+    wifi, pool, parking = Amenity(name="WiFi"), Amenity(name="Pool"), Amenity(name="Parking")
+    places = [
+        Place(title="Both", description="D", price=10.0, owner=owner, amenities=[wifi, pool]),
+        Place(title="Wifi only", description="D", price=10.0, owner=owner, amenities=[wifi]),
+        Place(title="All", description="D", price=10.0, owner=owner,
+              amenities=[wifi, pool, parking]),
+        Place(title="None", description="D", price=10.0, owner=owner),
+    ]
+    db.session.add_all([owner, *places])
+    db.session.commit()
+    ids = {"wifi": wifi.id, "pool": pool.id, "parking": parking.id,
+           **{place.title: place.id for place in places}}
+    db.session.expunge_all()
+    return ids
+
+
+def titles(client, *amenity_ids):
+    response = client.get(f"/api/v1/places/?amenities={','.join(amenity_ids)}&fields=title")
+    assert response.status_code == 200
+    return sorted(place["title"] for place in response.json["places"])
+
+
+def test_listing_filters_on_all_requested_amenities(app, client):
+    ids = seed()
+
+    assert titles(client, ids["wifi"]) == ["All", "Both", "Wifi only"]
+    assert titles(client, ids["wifi"], ids["pool"]) == ["All", "Both"]
+    assert titles(client, ids["pool"], ids["parking"], ids["wifi"]) == ["All"]
+
+    assert client.get("/api/v1/places/?amenities=unknown").status_code == 400
+
+
+def test_intersection_does_not_join_place_amenity(app, client):
+    ids = seed()
+    titles(client, ids["wifi"])  # construction de l'index
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        assert titles(client, ids["wifi"], ids["pool"]) == ["All", "Both"]
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert not any("place_amenity" in statement for statement in statements)
+
+
+def test_index_follows_committed_writes_only(app, client):
+    ids = seed()
+    assert titles(client, ids["parking"]) == ["All"]
+
+    facade.update_place(ids["None"], {"amenities": [ids["parking"]]})
+    facade.update_place(ids["All"], {"amenities": [ids["wifi"]]})
+    assert titles(client, ids["parking"]) == ["None"]
+
+    # Modification annulée : l'index n'en garde aucune trace
+    place = db.session.get(Place, ids["Wifi only"])
+    place.amenities.append(db.session.get(Amenity, ids["parking"]))
+    db.session.flush()
+    db.session.rollback()
+    assert titles(client, ids["parking"]) == ["None"]
+
+    db.session.delete(db.session.get(Place, ids["None"]))
+    db.session.commit()
+    assert titles(client, ids["parking"]) == []
+    assert facade.amenity_index.stats()["places"] == 3
+
+
+def test_bulk_build_matches_incremental_updates():
+    pairs = [(f"p{i}", f"a{i % 3}") for i in range(20)] + [("p5", "a0")]
+    built, updated = AmenityBitmapIndex(), AmenityBitmapIndex()
+    built._build(pairs)
+    for pair in pairs:
+        updated._add(*pair)
+    assert built._bitmaps == updated._bitmaps
+    assert built._place_ids == updated._place_ids
@@ -0,0 +1,110 @@
+# tests/test_authorization.py
+
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.services import facade
+from app.api.v1.authz import user_status
+
+
+@pytest.fixture
+def users(app):
+    admin = User(first_name="Admin", last_name="HBnB", email="admin@hbnb.io",
+                 password="x", is_admin=True)
+    owner = User(first_name="Rey", last_name="Skywalker", email="rey@jakku.io", password="x")
+    guest = User(first_name="Finn", last_name="Trooper", email="finn@jakku.io", password="x")
+    db.session.add_all([admin, owner, guest])
+    db.session.commit()
+    return admin, owner, guest
+
+
+@pytest.fixture
+def review(users):
+    admin, owner, guest = users
+    place = Place(title="Hut", description="D", price=10.0, owner=owner)
+    db.session.add(place)
+    db.session.commit()
+    return facade.create_review({"text": "Sandy", "rating": 3, "user_id": guest.id,
+                                 "place_id": place.id})
+
+
+def user_queries(func):
+    """Requêtes SQL sur la table users exécutées par func."""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return result, [s for s in statements if "FROM users" in s]
+
+
+def test_review_writes_trust_claims_without_user_lookup(client, users, review, auth_headers):
+    user_status.configure(0)
+    admin, owner, guest = users
+    payload = {"text": "Windy", "rating": 2, "user_id": guest.id, "place_id": review["place_id"]}
+
+    response, queries = user_queries(lambda: client.put(
+        f"/api/v1/reviews/{review['id']}", json=payload, headers=auth_headers(guest)))
+    assert response.status_code == 200 and queries == []
+
+    response = client.put(f"/api/v1/reviews/{review['id']}", json=payload,
+                          headers=auth_headers(owner))
+    assert response.status_code == 403
+
+    response = client.delete(f"/api/v1/reviews/{review['id']}", headers=auth_headers(admin))
+    assert response.status_code == 200
+
+
+def test_user_status_is_checked_once_per_ttl(client, users, review, auth_headers):
+    user_status.configure(30)
+    admin, owner, guest = users
+    headers = auth_headers(admin)
+
+    _, queries = user_queries(lambda: client.get("/api/v1/metrics/", headers=headers))
+    assert len(queries) == 1
+    _, queries = user_queries(lambda: client.get("/api/v1/metrics/", headers=headers))
+    assert queries == []
+    assert user_status.stats()["hits"] == 1
+
+
+def test_demoted_or_deleted_user_loses_access(client, users, review, auth_headers):
+    user_status.configure(30)
+    admin, owner, guest = users
+    admin_headers, guest_headers = auth_headers(admin), auth_headers(guest)
+    assert client.get("/api/v1/metrics/", headers=admin_headers).status_code == 200
+
+    # Rétrogradation via l'API : le cache du processus est invalidé
+    response = client.put(f"/api/v1/users/{admin.id}", json={"is_admin": False},
+                          headers=admin_headers)
+    assert response.status_code == 200
+    assert client.get("/api/v1/metrics/", headers=admin_headers).status_code == 403
+
+    # Suppression directe en base : refusée une fois le statut relu
+    assert client.delete(f"/api/v1/reviews/{review['id']}",
+                         headers=guest_headers).status_code == 200
+    db.session.delete(db.session.get(User, guest.id))
+    db.session.commit()
+    user_status.invalidate(guest.id)
+    response = client.post("/api/v1/amenities/", json={"name": "WiFi"}, headers=guest_headers)
+    assert response.status_code == 401
+
+
+def test_forbidden_responses_are_not_marshalled(client, users, auth_headers):
+    admin, owner, guest = users
+    place = Place(title="Hut", description="D", price=10.0, owner=owner)
+    db.session.add(place)
+    db.session.commit()
+
+    response = client.post("/api/v1/users/", headers=auth_headers(guest),
+                           json={"first_name": "A", "last_name": "B",
+                                 "email": "ab@hbnb.io", "password": "Long-Passw0rd!"})
+    assert response.status_code == 403
+    assert response.get_json() == {"error": "Admin privileges required"}
+
+    response = client.put(f"/api/v1/places/{place.id}", json={"title": "Mine"},
+                          headers=auth_headers(guest))
+    assert response.status_code == 403
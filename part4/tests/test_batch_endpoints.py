@@ -0,0 +1,109 @@
+# tests/test_batch_endpoints.py
+
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+
+
+@pytest.fixture
+def users(app):
+    admin = User(first_name="Admin", last_name="HBnB", email="admin@hbnb.io",
+                 password="x", is_admin=True)
+    guest = User(first_name="Rey", last_name="Skywalker", email="rey@jakku.io", password="x")
+    db.session.add_all([admin, guest])
+    db.session.commit()
+    return admin, guest
+
+
+def count_statements(func):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+
+def test_amenities_batch_is_admin_only(client, users, auth_headers):
+    admin, guest = users
+    payload = [{"name": "WiFi"}, {"name": ""}, {"name": "Pool"}]
+
+    assert client.post("/api/v1/amenities/batch", json=payload,
+                       headers=auth_headers(guest)).status_code == 403
+
+    response = client.post("/api/v1/amenities/batch", json=payload, headers=auth_headers(admin))
+    assert response.status_code == 207
+    assert [a["name"] for a in response.json["created"]] == ["WiFi", "Pool"]
+    assert response.json["errors"][0]["index"] == 1
+
+
+def test_places_batch_resolves_references_in_bulk(client, users, auth_headers):
+    admin, guest = users
+    amenities = [Amenity(name=f"A{i}") for i in range(5)]
+    db.session.add_all(amenities)
+    db.session.add(Place(title="Taken", description="D", price=1.0, owner=guest))
+    db.session.commit()
+
+    payload = [
+        {"title": f"Place {i}", "description": "D", "price": 10.0 + i,
+         "amenities": [a.id for a in amenities[:i % 5]]}
+        for i in range(50)
+    ]
+    payload += [
+        {"title": "Taken", "description": "D", "price": 1.0},          # titre déjà pris
+        {"title": "Place 0", "description": "D", "price": 1.0},        # doublon du lot
+        {"title": "Bad", "description": "D", "price": 1.0, "amenities": ["nope"]},
+        "not an object",
+    ]
+
+    headers = auth_headers(guest)
+    # Liste des jetons révoqués chargée une fois par processus, hors mesure
+    client.get("/api/v1/auth/protected", headers=headers)
+    response, statements = count_statements(lambda: client.post(
+        "/api/v1/places/batch", json=payload, headers=headers))
+
+    assert response.status_code == 207
+    assert len(response.json["created"]) == 50
+    assert [e["index"] for e in response.json["errors"]] == [50, 51, 52, 53]
+    assert "Unknown amenity" in response.json["errors"][2]["error"]
+    # Le nombre de requêtes ne dépend pas de la taille du lot
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) <= 4
+    assert Place.query.filter_by(user_id=guest.id).count() == 51
+
+
+def test_reviews_batch_updates_aggregates(client, users, auth_headers):
+    admin, guest = users
+    places = [Place(title=f"P{i}", description="D", price=1.0, owner=admin) for i in range(3)]
+    own = Place(title="Mine", description="D", price=1.0, owner=guest)
+    db.session.add_all([*places, own])
+    db.session.commit()
+
+    payload = [
+        {"text": "Good", "rating": 4, "place_id": places[0].id},
+        {"text": "Again", "rating": 2, "place_id": places[0].id},   # déjà noté dans le lot
+        {"text": "Mine", "rating": 5, "place_id": own.id},          # son propre lieu
+        {"text": "Great", "rating": 5, "place_id": places[1].id},
+        {"text": "Bad", "rating": 9, "place_id": places[2].id},     # note invalide
+    ]
+    response = client.post("/api/v1/reviews/batch", json=payload, headers=auth_headers(guest))
+
+    assert response.status_code == 207
+    assert len(response.json["created"]) == 2
+    assert [e["index"] for e in response.json["errors"]] == [1, 2, 4]
+    assert db.session.get(Place, places[0].id).rating_sum == 4
+    assert db.session.get(Place, places[1].id).review_count == 1
+
+
+def test_batch_payload_must_be_a_list(client, users, auth_headers):
+    _, guest = users
+    response = client.post("/api/v1/places/batch", json={"title": "x"}, headers=auth_headers(guest))
+    assert response.status_code == 400
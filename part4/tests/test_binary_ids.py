@@ -0,0 +1,82 @@
+# tests/test_binary_ids.py
+
+import pytest
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.models.types import convert_key_columns
+from app.models.user import User
+from app.services import facade
+from config import TestingConfig
+
+
+def make_app(storage, uri="sqlite://"):
+    class Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+        ID_STORAGE = storage
+    return create_app(Config)
+
+
+def seed():
+    owner = User(first_name="Lando", last_name="Calrissian", email="lando@hbnb.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+    wifi = facade.create_amenity({"name": "Wifi"})
+    place = facade.create_place({"title": "Cloud City", "description": "D", "price": 80.0,
+                                 "latitude": 45.0, "longitude": 6.0, "owner_id": owner.id,
+                                 "amenities": [wifi.id]})
+    return owner.id, place.id, wifi.id
+
+
+def raw_keys(sql):
+    return db.session.execute(text(sql)).all()
+
+
+def test_keys_are_stored_on_16_bytes():
+    app = make_app("binary")
+    with app.app_context():
+        db.create_all()
+        owner_id, place_id, wifi_id = seed()
+        db.session.expunge_all()
+        client = app.test_client()
+
+        assert raw_keys("SELECT typeof(id), length(id) FROM places") == [("blob", 16)]
+        assert raw_keys("SELECT typeof(place_id), typeof(amenity_id) FROM place_amenity") == [
+            ("blob", "blob")]
+
+        # Conversion transparente : l'API ne voit que des chaînes
+        place = client.get(f"/api/v1/places/{place_id}").json
+        assert place["id"] == place_id and place["owner"]["id"] == owner_id
+        assert [a["id"] for a in place["amenities"]] == [wifi_id]
+        listed = client.get(f"/api/v1/places/?limit=1&amenities={wifi_id}").json
+        assert [p["id"] for p in listed["places"]] == [place_id]
+        assert client.get("/api/v1/places/not-a-uuid").status_code == 404
+        found = client.get("/api/v1/places/search?q=cloud&fields=title").json["places"]
+        assert [p["id"] for p in found] == [place_id]
+        db.session.remove()
+
+
+def test_existing_database_is_converted(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'hbnb.db'}"
+    text_app = make_app("text", uri)
+    with text_app.app_context():
+        db.create_all()
+        owner_id, place_id, _ = seed()
+        assert raw_keys("SELECT typeof(user_id) FROM places") == [("text",)]
+
+        assert convert_key_columns(db.engine, db.metadata, "binary") == 6
+        assert convert_key_columns(db.engine, db.metadata, "binary") == 0
+        db.session.remove()
+
+    binary_app = make_app("binary", uri)
+    with binary_app.app_context():
+        assert raw_keys("SELECT typeof(user_id) FROM places") == [("blob",)]
+        assert raw_keys("SELECT typeof(place_id) FROM places_fts") == [("blob",)]
+        client = binary_app.test_client()
+        place = client.get(f"/api/v1/places/{place_id}").json
+        assert place["owner"]["id"] == owner_id
+        found = client.get("/api/v1/places/search?q=cloud&fields=title").json["places"]
+        assert [p["id"] for p in found] == [place_id]
+        with pytest.raises(ValueError):
+            convert_key_columns(db.engine, db.metadata, "octal")
+        db.session.remove()
@@ -0,0 +1,96 @@
+# tests/test_conditional_requests.py
+
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.services import facade
+
+
+def get_counting(client, url, **headers):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return response, statements
+
+
+def test_place_detail_answers_304_until_it_changes(app, client):
+    owner = User(first_name="Han", last_name="Solo", email="han@hbnb.io", password="x")
+    reviewer = User(first_name="Leia", last_name="Organa", email="leia@hbnb.io", password="x")
+    place = Place(title="Falcon", description="D", price=10.0, owner=owner)
+    db.session.add_all([owner, reviewer, place])
+    db.session.commit()
+    url = f"/api/v1/places/{place.id}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"') and first.headers["Last-Modified"]
+
+    # 304 sans charger le lieu : seule la requête de version est exécutée
+    cached, statements = get_counting(client, url, **{"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.data == b""
+    assert len(statements) == 1
+
+    not_modified = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert not_modified.status_code == 304
+
+    facade.create_review({"text": "t", "rating": 5,
+                          "user_id": reviewer.id, "place_id": place.id})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["rating"]["count"] == 1
+
+
+def test_collections_and_resources_carry_validators(app, client):
+    user = User(first_name="Luke", last_name="Sky", email="luke@hbnb.io", password="x")
+    db.session.add_all([user, Amenity(name="Wifi")])
+    db.session.commit()
+
+    for url in ("/api/v1/users/", f"/api/v1/users/{user.id}", "/api/v1/amenities/",
+                "/api/v1/reviews/", "/api/v1/places/"):
+        response = client.get(url)
+        assert response.status_code == 200, url
+        again = client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert again.status_code == 304, url
+
+    # Une nouvelle ligne change la version de la collection, et chaque page
+    # a son propre ETag
+    listing = client.get("/api/v1/amenities/")
+    db.session.add(Amenity(name="Pool"))
+    db.session.commit()
+    assert client.get("/api/v1/amenities/", headers={
+        "If-None-Match": listing.headers["ETag"]}).status_code == 200
+    assert client.get("/api/v1/amenities/?limit=1").headers["ETag"] != listing.headers["ETag"]
+
+    # Ressource inconnue : pas de validateur, 404 inchangé
+    assert client.get("/api/v1/users/unknown").status_code == 404
+
+
+def test_place_detail_body_matches_its_etag_after_an_outside_write(app, client):
+    owner = User(first_name="Han", last_name="Solo", email="han@hbnb.io", password="x")
+    place = Place(title="Falcon", description="D", price=10.0, owner=owner)
+    db.session.add_all([owner, place])
+    db.session.commit()
+    url = f"/api/v1/places/{place.id}"
+    first = client.get(url)
+
+    # Écriture d'un autre worker : le cache de ce processus n'est pas invalidé
+    db.session.execute(text("UPDATE places SET title = 'Millennium Falcon', "
+                            "updated_at = :now WHERE id = :id"),
+                       {"now": datetime.utcnow() + timedelta(seconds=1), "id": place.id})
+    db.session.commit()
+
+    second = client.get(url)
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json["title"] == "Millennium Falcon"
@@ -0,0 +1,66 @@
+# tests/test_dev_database.py
+
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.services import facade
+from config import DevelopmentConfig
+
+DEV_DB = os.path.join(os.path.dirname(__file__), "..", "instance", "dev.db")
+
+
+def boot(tmp_path, *statements):
+    """Application de développement sur une copie de instance/dev.db."""
+    path = tmp_path / "dev.db"
+    shutil.copy(DEV_DB, path)
+    with sqlite3.connect(path) as connection:
+        for statement in statements:
+            connection.execute(statement)
+
+    class Config(DevelopmentConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        PASSWORD_HASH_WORKERS = 0
+        BCRYPT_LOG_ROUNDS = 4
+    with contextlib.redirect_stdout(io.StringIO()):
+        return create_app(Config)
+
+
+def test_dev_database_serves_authenticated_routes(tmp_path):
+    app = boot(tmp_path)
+    with app.app_context():
+        token = create_access_token(identity="someone", additional_claims={"is_admin": False})
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = app.test_client().get("/api/v1/auth/protected",
+                                         headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+
+def test_missing_revoked_tokens_table_fails_at_startup(tmp_path):
+    with pytest.raises(RuntimeError, match="009_revoked_tokens"):
+        boot(tmp_path, "DROP TABLE revoked_tokens")
+
+
+def test_dev_database_supports_login_refresh_and_logout(tmp_path):
+    app = boot(tmp_path)
+    with app.app_context():
+        facade.create_user({"first_name": "Finn", "last_name": "FN-2187",
+                            "email": "finn@dev.io", "password": "Sup3r-Secret-Pass"})
+    client = app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = client.post("/api/v1/auth/login", json={
+            "email": "finn@dev.io", "password": "Sup3r-Secret-Pass"}).json
+        tokens = client.post("/api/v1/auth/refresh", headers={
+            "Authorization": f"Bearer {tokens['refresh_token']}"}).json
+        logout = client.post("/api/v1/auth/logout", headers={
+            "Authorization": f"Bearer {tokens['access_token']}"})
+    assert logout.status_code == 200
+
+
+def test_missing_refresh_sessions_table_fails_at_startup(tmp_path):
+    with pytest.raises(RuntimeError, match="010_refresh_sessions"):
+        boot(tmp_path, "DROP TABLE refresh_sessions")
@@ -0,0 +1,133 @@
+# tests/test_entity_cache.py
+
+import fnmatch
+import time
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.services import facade
+from app.services.cache import LRUCacheBackend, RedisCacheBackend
+
+
+def count_statements(action):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = action()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+
+def test_lru_backend_is_bounded_and_expires():
+    backend = LRUCacheBackend(max_size=2, ttl=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")          # "b" devient la moins récemment utilisée
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+
+    backend.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get("d") is None
+
+
+class DictRedis:
+    """Sous-ensemble des commandes Redis utilisées par RedisCacheBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match, count=None):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+def test_redis_clear_keeps_keys_outside_the_prefix():
+    client = DictRedis()
+    client.set("hbnb:throttle:ip:1.2.3.4", b"bucket")
+    backend = RedisCacheBackend(client)
+    for i in range(1200):
+        backend.set(f"place:{i}", i)
+
+    backend.clear()
+    assert backend.get("place:1") is None
+    assert list(client.data) == ["hbnb:throttle:ip:1.2.3.4"]
+
+
+def test_place_view_is_cached_and_invalidated_by_reviews(app, client):
+    owner = User(first_name="Han", last_name="Solo", email="han@hbnb.io", password="x")
+    reviewer = User(first_name="Leia", last_name="Organa", email="leia@hbnb.io", password="x")
+    place = Place(title="Falcon", description="D", price=10.0, owner=owner)
+    db.session.add_all([owner, reviewer, place])
+    db.session.commit()
+    place_id, reviewer_id = place.id, reviewer.id
+    db.session.expunge_all()
+
+    first = client.get(f"/api/v1/places/{place_id}")
+    assert first.status_code == 200
+    db.session.expunge_all()
+
+    second, statements = count_statements(lambda: client.get(f"/api/v1/places/{place_id}"))
+    assert second.get_json() == first.get_json()
+    # Seule la requête d'agrégat du validateur ETag est exécutée
+    assert len(statements) == 1 and "max(" in statements[0]
+
+    facade.create_review({"text": "t", "rating": 4,
+                          "user_id": reviewer_id, "place_id": place_id})
+    db.session.expunge_all()
+    third = client.get(f"/api/v1/places/{place_id}").get_json()
+    assert third["rating"]["count"] == 1
+    assert len(third["reviews"]) == 1
+
+
+def test_cached_user_is_restored_without_query(app):
+    user = User(first_name="Luke", last_name="Skywalker", email="luke@hbnb.io", password="x")
+    user.hash_password("Str0ng!Passw0rd")
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+    db.session.expunge_all()
+
+    facade.get_user(user_id)           # miss : chargé puis mis en cache
+    db.session.expunge_all()
+    cached, statements = count_statements(lambda: facade.get_user(user_id))
+    assert statements == []
+    assert cached.email == "luke@hbnb.io"
+    # Le hash n'est pas en cache : il est rechargé à la demande
+    assert cached.verify_password("Str0ng!Passw0rd")
+
+    facade.update_user(user_id, {"first_name": "Lucas"})
+    db.session.expunge_all()
+    assert facade.get_user(user_id).first_name == "Lucas"
+
+    stats = facade.cache.stats()["namespaces"]["user"]
+    assert stats["hits"] >= 1 and stats["misses"] >= 2
+
+
+def test_metrics_are_admin_only(client, auth_headers):
+    admin = User(first_name="Ad", last_name="Min", email="admin@hbnb.io",
+                 password="x", is_admin=True)
+    user = User(first_name="Us", last_name="Er", email="user@hbnb.io", password="x")
+    db.session.add_all([admin, user])
+    db.session.commit()
+
+    assert client.get("/api/v1/metrics/", headers=auth_headers(user)).status_code == 403
+    response = client.get("/api/v1/metrics/", headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert {"hits", "misses", "namespaces"} <= set(response.get_json()["cache"])
@@ -0,0 +1,84 @@
+# tests/test_fuzzy_search.py
+
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+from app.persistence.trigram import TrigramIndex, trigrams, similarity
+
+
+def seed():
+    owner = User(first_name="Poe", last_name="Dameron", email="poe@hbnb.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+    ids = {}
+    for title in ("Chalet en montagne", "Chalet au lac", "Studio à Paris", "Villa Marbella"):
+        place = facade.create_place({"title": title, "description": "D", "price": 20.0,
+                                     "latitude": 45.0, "longitude": 6.0,
+                                     "owner_id": owner.id})
+        ids[title] = place.id
+    return ids
+
+
+def fuzzy(client, query, extra=""):
+    response = client.get(f"/api/v1/places/search?q={query}&fuzzy=true&fields=title{extra}")
+    assert response.status_code == 200
+    return [(p["title"], p["score"]) for p in response.json["places"]]
+
+
+def test_similarity_of_trigram_sets():
+    assert sorted(trigrams("Paris")) == ["  p", " pa", "ari", "is ", "par", "ris"]
+    assert similarity(trigrams("Montagne"), trigrams("montagne")) == 1.0
+    assert 0.3 < similarity(trigrams("montagne"), trigrams("montagen")) < 1.0
+
+
+def test_fuzzy_search_tolerates_typos(app, client):
+    seed()
+
+    results = fuzzy(client, "chalett montagn")
+    assert results[0][0] == "Chalet en montagne"
+    assert [score for _, score in results] == sorted((s for _, s in results), reverse=True)
+    assert [title for title, _ in fuzzy(client, "studoi paris")] == ["Studio à Paris"]
+    assert fuzzy(client, "chalet", "&threshold=0.9") == []
+
+    assert client.get("/api/v1/places/search?q=x&fuzzy=true&threshold=0").status_code == 400
+
+
+def test_index_follows_title_updates(app, client):
+    ids = seed()
+    fuzzy(client, "paris")  # construction de l'index
+
+    facade.update_place(ids["Studio à Paris"], {"title": "Loft à Lyon"})
+    assert fuzzy(client, "studio paris") == []
+    assert [title for title, _ in fuzzy(client, "lof lyon")] == ["Loft à Lyon"]
+
+
+def test_candidate_pruning_keeps_every_match(app):
+    """Le filtrage par listes les plus courtes ne perd aucun résultat."""
+    seed()
+    index = TrigramIndex()
+    titles = [title for title, in db.session.query(facade.place_repo.model.title)]
+    for query in ("chalet", "montagne lac", "vila marbela", "paris"):
+        expected = sorted(t for t in titles if similarity(trigrams(query), trigrams(t)) >= 0.3)
+        found = sorted(facade.place_repo.get(place_id).title
+                       for place_id, _ in index.search(query, 100, 0.3))
+        assert found == expected, query
+
+
+def test_rebuild_runs_outside_the_lock_and_keeps_concurrent_updates(app):
+    ids = seed()
+    index = TrigramIndex(max_age=0)
+    index._ensure_built()
+    load_rows = index._load_rows
+
+    def load_during_commit():
+        # Lecteurs non bloqués ; un COMMIT arrive pendant la lecture de la base
+        assert not index._lock.locked()
+        rows = load_rows()
+        index._apply(index._add, "late-id", "Palais de Naboo")
+        return rows
+
+    index._load_rows = load_during_commit
+    index._built_at -= 1   # expiré
+    index._ensure_built()
+    assert [place_id for place_id, _ in index.search("palais naboo", 5)] == ["late-id"]
+    assert index.search("chalet montagne", 1)[0][0] == ids["Chalet en montagne"]
@@ -0,0 +1,61 @@
+# tests/test_login_throttle.py
+
+import time
+from sqlalchemy import event
+from app.extensions import db
+from app.services import facade
+from app.services.passwords import password_hasher
+from app.services.throttle import MemoryRateLimitBackend, login_throttle
+
+PASSWORD = "Sup3r-Secret-Pass"
+
+
+def login(client, email, password="Wrong-Pass-123!", ip="10.0.0.1"):
+    return client.post("/api/v1/auth/login", json={"email": email, "password": password},
+                       environ_base={"REMOTE_ADDR": ip})
+
+
+def test_email_bucket_rejects_before_sql_and_bcrypt(app, client):
+    facade.create_user({"first_name": "Han", "last_name": "Solo",
+                        "email": "han@hbnb.io", "password": PASSWORD})
+    for _ in range(5):
+        assert login(client, "han@hbnb.io").status_code == 401
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    verified = password_hasher.stats()["verified"]
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        # Même compte, autre casse et autre adresse : toujours refusé
+        response = login(client, " HAN@hbnb.io", PASSWORD, ip="10.0.0.2")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+    assert statements == [] and password_hasher.stats()["verified"] == verified
+
+    assert login(client, "leia@hbnb.io").status_code == 401
+    stats = login_throttle.stats()
+    assert (stats["rejected_email"], stats["rejected_ip"], stats["allowed"]) == (1, 0, 6)
+
+
+def test_ip_bucket_is_shared_by_every_account(app, client):
+    login_throttle.configure({**app.config, "LOGIN_THROTTLE_IP_BURST": 3})
+    for i in range(3):
+        assert login(client, f"user{i}@hbnb.io").status_code == 401
+    assert login(client, "user9@hbnb.io").status_code == 429
+    assert login(client, "user9@hbnb.io", ip="10.0.0.2").status_code == 401
+    assert login_throttle.stats()["rejected_ip"] == 1
+
+
+def test_memory_buckets_refill_and_stay_bounded():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    assert backend.take("a", 2, 50)[0] and backend.take("a", 2, 50)[0]
+    allowed, retry_after = backend.take("a", 2, 50)
+    assert not allowed and 0 < retry_after <= 0.02
+    time.sleep(0.03)
+    assert backend.take("a", 2, 50)[0]
+
+    backend.take("b", 2, 50)
+    backend.take("c", 2, 50)
+    assert backend.size() == 2
@@ -0,0 +1,70 @@
+# tests/test_nearby.py
+
+import pytest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.geo import encode_geohash
+from app.services import facade
+
+CITIES = {
+    "Paris": (48.8566, 2.3522),
+    "Versailles": (48.8049, 2.1204),
+    "London": (51.5074, -0.1278),
+    "Suva": (-18.1248, 178.4501),
+    "Apia": (-13.8333, -171.7500),
+}
+
+
+@pytest.fixture
+def places(app):
+    owner = User(first_name="Han", last_name="Solo", email="han@hbnb.io", password="x")
+    db.session.add(owner)
+    for title, (lat, lon) in CITIES.items():
+        db.session.add(Place(title=title, description="D", price=10.0, owner=owner,
+                             latitude=lat, longitude=lon))
+    db.session.add(Place(title="Nowhere", description="D", price=10.0, owner=owner))
+    db.session.commit()
+    return {p.title: p for p in Place.query.all()}
+
+
+def titles(response):
+    assert response.status_code == 200, response.json
+    return [p["title"] for p in response.json["places"]]
+
+
+def test_radius_search_is_ordered_by_distance_and_paginated(places, client):
+    url = "/api/v1/places/nearby?lat=48.85&lon=2.30&radius_km=30&fields=title"
+    response = client.get(url)
+    assert titles(response) == ["Paris", "Versailles"]
+    assert response.json["places"][0]["distance_km"] == pytest.approx(4.0, abs=0.5)
+
+    first = client.get(url + "&limit=1")
+    assert titles(first) == ["Paris"]
+    second = client.get(url + f"&limit=1&after={first.json['next_cursor']}")
+    assert titles(second) == ["Versailles"] and second.json["next_cursor"] is None
+
+    assert titles(client.get("/api/v1/places/nearby?lat=48.85&lon=2.30&radius_km=400")) == [
+        "Paris", "Versailles", "London"]
+
+
+def test_bbox_search_including_the_antimeridian(places, client):
+    assert set(titles(client.get("/api/v1/places/nearby?bbox=-1,48,3,52"))) == {
+        "Paris", "Versailles", "London"}
+    assert titles(client.get("/api/v1/places/nearby?bbox=175,-20,-170,-10")) == ["Suva", "Apia"]
+
+
+def test_geohash_follows_coordinates(places, client):
+    place = places["London"]
+    assert place.geohash == encode_geohash(*CITIES["London"])
+    assert places["Nowhere"].geohash is None
+
+    facade.update_place(place.id, {"latitude": 48.80, "longitude": 2.13})
+    assert place.geohash.startswith("u09")
+    assert "London" in titles(client.get("/api/v1/places/nearby?lat=48.8&lon=2.1&radius_km=5"))
+
+
+@pytest.mark.parametrize("query", ["lat=48&lon=2", "lat=91&lon=2&radius_km=5",
+                                   "lat=48&lon=2&radius_km=5000", "bbox=1,2,3"])
+def test_invalid_search_area(client, query):
+    assert client.get(f"/api/v1/places/nearby?{query}").status_code == 400
@@ -0,0 +1,72 @@
+# tests/test_pagination.py
+
+from datetime import datetime
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.models.place import Place
+
+
+def collect_pages(client, url, key, limit):
+    """Parcourt toutes les pages d'une collection et renvoie les ids vus."""
+    ids, after, pages = [], None, 0
+    while True:
+        query = f"{url}?limit={limit}" + (f"&after={after}" if after else "")
+        response = client.get(query)
+        assert response.status_code == 200
+        ids.extend(item["id"] for item in response.json[key])
+        pages += 1
+        after = response.json["next_cursor"]
+        if not after:
+            return ids, pages
+
+
+def test_amenities_keyset_pages_cover_table_once(app, client):
+    # Plusieurs lignes partagent le même created_at : l'id départage
+    same_time = datetime(2025, 1, 1, 12, 0, 0)
+    amenities = [Amenity(name=f"A{i}", created_at=same_time if i % 3 else datetime(2025, 1, 1, 0, i))
+                 for i in range(25)]
+    db.session.add_all(amenities)
+    db.session.commit()
+
+    ids, pages = collect_pages(client, "/api/v1/amenities/", "amenities", 10)
+
+    expected = [a.id for a in sorted(amenities, key=lambda a: (a.created_at, a.id))]
+    assert ids == expected
+    assert pages == 3
+
+
+def test_places_pagination_returns_next_cursor(app, client):
+    owner = User(first_name="Han", last_name="Solo", email="han@falcon.com", password="x")
+    db.session.add(owner)
+    db.session.add_all([Place(title=f"P{i}", description="D", price=1.0, owner=owner)
+                        for i in range(5)])
+    db.session.commit()
+
+    ids, pages = collect_pages(client, "/api/v1/places/", "places", 2)
+    assert len(set(ids)) == 5
+    assert pages == 3
+
+
+def test_invalid_pagination_parameters(app, client):
+    assert client.get("/api/v1/users/?limit=0").status_code == 400
+    assert client.get("/api/v1/reviews/?limit=abc").status_code == 400
+    assert client.get("/api/v1/places/?after=not-a-cursor").status_code == 400
+
+
+def test_users_and_reviews_pages_are_serialized(app, client):
+    owner = User(first_name="Han", last_name="Solo", email="han@falcon.com", password="x")
+    author = User(first_name="Leia", last_name="Organa", email="leia@rebellion.org", password="x")
+    place = Place(title="Falcon", description="D", price=1.0, owner=owner)
+    db.session.add_all([owner, author, place])
+    db.session.commit()
+    from app.models.review import Review
+    db.session.add(Review(text="Nice", rating=4, author=author, place=place))
+    db.session.commit()
+
+    ids, _ = collect_pages(client, "/api/v1/users/", "users", 1)
+    assert sorted(ids) == sorted([owner.id, author.id])
+
+    response = client.get("/api/v1/reviews/")
+    assert response.status_code == 200
+    assert response.json["reviews"][0]["rating"] == 4
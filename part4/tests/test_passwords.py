@@ -0,0 +1,56 @@
+# tests/test_passwords.py
+
+from app.extensions import db
+from app.services import facade
+from app.services.passwords import PasswordHasher, password_hasher, hash_cost
+
+PASSWORD = "Sup3r-Secret-Pass"
+
+
+def login(client, password=PASSWORD):
+    return client.post("/api/v1/auth/login",
+                       json={"email": "han@hbnb.io", "password": password})
+
+
+def create_user():
+    return facade.create_user({"first_name": "Han", "last_name": "Solo",
+                               "email": "han@hbnb.io", "password": PASSWORD})
+
+
+def test_login_rehashes_when_cost_policy_changes(app, client):
+    user_id = create_user().id
+    assert hash_cost(facade.get_user(user_id).password) == 4
+
+    assert login(client).status_code == 200
+    assert login(client, "Wrong-Pass-123!").status_code == 401
+    assert password_hasher.stats()["rehashed"] == 0
+
+    password_hasher.configure({**app.config, "BCRYPT_LOG_ROUNDS": 5})
+    assert login(client).status_code == 200
+    db.session.expunge_all()
+    assert hash_cost(facade.get_user(user_id).password) == 5
+    assert login(client).status_code == 200
+    assert password_hasher.stats()["rehashed"] == 1
+
+
+def test_login_is_rejected_when_the_queue_is_full(app, client):
+    create_user()
+    password_hasher.configure({**app.config, "PASSWORD_HASH_MAX_PENDING": 0})
+
+    response = login(client)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert password_hasher.stats()["rejected"] == 1
+
+
+def test_process_pool_hashes_and_verifies():
+    hasher = PasswordHasher(rounds=4, workers=2)
+    try:
+        hashed = hasher.hash(PASSWORD)
+        assert hasher.verify(hashed, PASSWORD) and not hasher.verify(hashed, "nope")
+        assert not hasher.verify("not-a-bcrypt-hash", PASSWORD)
+        stats = hasher.stats()
+        assert (stats["hashed"], stats["verified"], stats["pending"]) == (1, 2, 0)
+        assert stats["peak_pending"] == 1
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,67 @@
+# tests/test_place_amenities.py
+
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.services import facade
+
+
+@pytest.fixture
+def owner_and_amenities(app):
+    owner = User(first_name="Lando", last_name="Calrissian", email="lando@bespin.io", password="x")
+    amenities = [Amenity(name=name) for name in ("WiFi", "Pool", "Sauna", "Bar")]
+    db.session.add_all([owner, *amenities])
+    db.session.commit()
+    return owner, amenities
+
+
+def capture_statements(func):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def test_create_place_resolves_amenities_in_one_query(owner_and_amenities):
+    owner, amenities = owner_and_amenities
+    data = {"title": "Cloud City", "description": "D", "price": 50.0,
+            "owner_id": owner.id, "amenities": [a.id for a in amenities]}
+
+    statements = capture_statements(lambda: facade.create_place(data))
+
+    lookups = [s for s in statements if s.startswith("SELECT") and "FROM amenities" in s]
+    assert len(lookups) == 1
+
+
+def test_unknown_amenities_are_all_reported(owner_and_amenities):
+    owner, amenities = owner_and_amenities
+    data = {"title": "Cloud City", "description": "D", "price": 50.0,
+            "owner_id": owner.id, "amenities": [amenities[0].id, "nope-1", "nope-2"]}
+
+    with pytest.raises(ValueError, match="nope-1, nope-2"):
+        facade.create_place(data)
+    # Le lieu invalide n'a pas été enregistré
+    assert facade.get_places_by_owner(owner.id) == []
+
+
+def test_update_place_only_writes_changed_association_rows(owner_and_amenities):
+    owner, (wifi, pool, sauna, bar) = owner_and_amenities
+    place = facade.create_place({"title": "Cloud City", "description": "D", "price": 50.0,
+                                 "owner_id": owner.id, "amenities": [wifi.id, pool.id, sauna.id]})
+
+    statements = capture_statements(
+        lambda: facade.update_place(place.id, {"amenities": [pool.id, sauna.id, bar.id]}))
+
+    writes = [s for s in statements if "place_amenity" in s and not s.startswith("SELECT")]
+    assert len(writes) == 2
+    assert writes[0].startswith("DELETE") or writes[1].startswith("DELETE")
+    assert {a.name for a in place.amenities} == {"Pool", "Sauna", "Bar"}
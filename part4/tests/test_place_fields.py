@@ -0,0 +1,77 @@
+# tests/test_place_fields.py
+
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.services import facade
+
+
+def seed(app):
+    owner = User(first_name="Han", last_name="Solo", email="han@hbnb.io", password="x")
+    author = User(first_name="Leia", last_name="Organa", email="leia@hbnb.io", password="x")
+    place = Place(title="Falcon", description="Fast ship", price=10.0, owner=owner,
+                  amenities=[Amenity(name="Wifi")])
+    db.session.add_all([owner, author, place, Review(text="Great", rating=5, author=author, place=place)])
+    db.session.commit()
+    place_id = place.id
+    db.session.expunge_all()
+    return place_id
+
+
+def get_statements(client, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return response, statements
+
+
+def test_list_fields_skip_relations_and_columns(app, client):
+    seed(app)
+
+    response, statements = get_statements(client, "/api/v1/places/?fields=title,price")
+    assert response.status_code == 200
+    assert response.json["places"][0].keys() == {"id", "title", "price"}
+    # version (ETag) + page de lieux, sans la colonne description ni relation
+    page_query = statements[-1]
+    assert len(statements) == 2
+    assert "description" not in page_query and "JOIN users" not in page_query
+
+    response, statements = get_statements(client, "/api/v1/places/?fields=title,owner")
+    place = response.json["places"][0]
+    assert place["owner"]["first_name"] == "Han"
+    assert "reviews" not in place and "amenities" not in place
+    assert not any("FROM reviews" in s or "place_amenity" in s for s in statements[1:])
+
+
+def test_detail_embed_and_default_representation(app, client):
+    place_id = seed(app)
+
+    full = client.get(f"/api/v1/places/{place_id}").json
+    assert {"owner", "amenities", "reviews", "rating", "description"} <= full.keys()
+
+    light = client.get(f"/api/v1/places/{place_id}?embed=reviews").json
+    assert light["reviews"][0]["user"]["first_name"] == "Leia"
+    assert "owner" not in light and light["description"] == "Fast ship"
+
+    # La mise à jour du lieu invalide toutes ses représentations en cache
+    facade.update_place(place_id, {"title": "Millennium Falcon"})
+    assert client.get(f"/api/v1/places/{place_id}?embed=reviews").json["title"] == "Millennium Falcon"
+    assert client.get(f"/api/v1/places/{place_id}").json["title"] == "Millennium Falcon"
+
+
+def test_unknown_field_or_relation_is_rejected(app, client):
+    place_id = seed(app)
+    assert client.get("/api/v1/places/?fields=password").status_code == 400
+    assert client.get(f"/api/v1/places/{place_id}?embed=bookings").status_code == 400
+    assert client.get("/api/v1/places/search?title=Falcon&fields=price").json == {
+        "id": place_id, "price": 10.0}
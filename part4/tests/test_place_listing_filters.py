@@ -0,0 +1,57 @@
+# tests/test_place_listing_filters.py
+
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+
+PRICES = [40.0, 10.0, 80.0, 25.0, 60.0, 10.0, 95.0]
+
+
+def seed_places():
+    owner = User(first_name="Lando", last_name="Calrissian", email="lando@hbnb.io", password="x")
+    db.session.add(owner)
+    for i, price in enumerate(PRICES):
+        place = Place(title=f"Place {i}", description="D", price=price, owner=owner)
+        if i < 3:
+            place.record_rating_change(added=i + 3)
+        db.session.add(place)
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def collect(client, url):
+    """Parcourt toutes les pages d'une liste de lieux."""
+    places, after = [], None
+    while True:
+        page = client.get(url + (f"&after={after}" if after else "")).json
+        places += page["places"]
+        after = page["next_cursor"]
+        if not after:
+            return places
+
+
+def test_price_range_and_sort_across_pages(app, client):
+    seed_places()
+
+    places = collect(client, "/api/v1/places/?min_price=10&max_price=60&sort=-price"
+                             "&limit=2&fields=title,price")
+    assert [p["price"] for p in places] == [60.0, 40.0, 25.0, 10.0, 10.0]
+    assert set(places[0]) == {"id", "title", "price"}
+
+    ascending = collect(client, "/api/v1/places/?sort=price&limit=3")
+    assert [p["price"] for p in ascending] == sorted(PRICES)
+
+
+def test_sort_by_rating_puts_unrated_places_last(app, client):
+    seed_places()
+
+    places = collect(client, "/api/v1/places/?sort=-rating&limit=2&fields=title")
+    assert [p["title"] for p in places[:3]] == ["Place 2", "Place 1", "Place 0"]
+    assert len(places) == len(PRICES)
+
+
+def test_invalid_listing_parameters(app, client):
+    for query in ("min_price=abc", "max_price=-1", "min_price=50&max_price=10", "sort=name"):
+        response = client.get(f"/api/v1/places/?{query}")
+        assert response.status_code == 400, query
+        assert "error" in response.json
@@ -0,0 +1,60 @@
+# tests/test_place_reviews_page.py
+
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import LATEST_REVIEWS
+
+
+def seed_reviews(count):
+    owner = User(first_name="Han", last_name="Solo", email="han@hbnb.io", password="x")
+    place = Place(title="Falcon", description="D", price=10.0, owner=owner)
+    db.session.add_all([owner, place])
+    db.session.commit()
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        author = User(first_name="Author", last_name=str(i), email=f"a{i}@hbnb.io", password="x")
+        review = Review(text=f"Review {i}", rating=i % 5 + 1, author=author, place=place,
+                        created_at=start + timedelta(minutes=i))
+        place.record_rating_change(added=review.rating)
+        db.session.add_all([author, review])
+    db.session.commit()
+    place_id = place.id
+    db.session.expunge_all()
+    return place_id
+
+
+def test_place_detail_embeds_latest_reviews_only(app, client):
+    place_id = seed_reviews(LATEST_REVIEWS + 3)
+
+    detail = client.get(f"/api/v1/places/{place_id}").json
+    assert [r["text"] for r in detail["reviews"]] == [
+        f"Review {i}" for i in range(LATEST_REVIEWS + 2, 2, -1)]
+    assert detail["rating"]["count"] == LATEST_REVIEWS + 3
+    assert detail["reviews_next_cursor"]
+
+    # La suite reprend exactement après le dernier avis inclus
+    rest = client.get(f"/api/v1/reviews/places/{place_id}/reviews"
+                      f"?after={detail['reviews_next_cursor']}").json
+    assert [r["text"] for r in rest["reviews"]] == ["Review 2", "Review 1", "Review 0"]
+    assert rest["reviews"][0]["user"]["last_name"] == "2"
+    assert rest["next_cursor"] is None
+
+
+def test_place_reviews_sorted_by_rating_across_pages(app, client):
+    place_id = seed_reviews(10)
+    url = f"/api/v1/reviews/places/{place_id}/reviews?sort=-rating&limit=4"
+
+    ratings, after = [], ""
+    while True:
+        page = client.get(url + (f"&after={after}" if after else "")).json
+        ratings += [r["rating"] for r in page["reviews"]]
+        after = page["next_cursor"]
+        if not after:
+            break
+    assert ratings == sorted(ratings, reverse=True) and len(ratings) == 10
+
+    assert client.get(f"/api/v1/reviews/places/{place_id}/reviews?sort=stars").status_code == 400
+    assert client.get("/api/v1/reviews/places/unknown/reviews").status_code == 404
@@ -0,0 +1,67 @@
+# tests/test_place_search.py
+
+import pytest
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+from app.persistence.search import Fts5SearchIndex, InvertedIndex, tokenize
+
+
+@pytest.fixture(params=["fts5", "memory"])
+def search_backend(request, app):
+    """Les deux implémentations doivent donner les mêmes résultats."""
+    facade.search_index = Fts5SearchIndex() if request.param == "fts5" else InvertedIndex()
+    return request.param
+
+
+def seed(client, auth_headers):
+    owner = User(first_name="Rey", last_name="Skywalker", email="rey@hbnb.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+    headers = auth_headers(owner)
+    ids = {}
+    for title, description in [
+        ("Chalet en montagne", "Vue sur les pistes, cheminée"),
+        ("Studio à Paris", "Proche de la montagne Sainte-Geneviève"),
+        ("Villa avec piscine", "Grande maison, jardin et piscine chauffée"),
+    ]:
+        response = client.post("/api/v1/places/", headers=headers, json={
+            "title": title, "description": description, "price": 50.0,
+            "latitude": 45.0, "longitude": 6.0, "amenities": []})
+        assert response.status_code == 201
+        ids[title] = response.json["id"]
+    return ids
+
+
+def search(client, query):
+    response = client.get(f"/api/v1/places/search?q={query}&fields=title")
+    assert response.status_code == 200
+    return [place["title"] for place in response.json["places"]]
+
+
+def test_tokenize_lowercases_and_strips_accents():
+    assert tokenize("Chalet d'Été, vue_lac!") == ["chalet", "d", "ete", "vue", "lac"]
+
+
+def test_search_ranks_title_matches_first(client, auth_headers, search_backend):
+    seed(client, auth_headers)
+
+    assert search(client, "MONTAGNE") == ["Chalet en montagne", "Studio à Paris"]
+    assert search(client, "piscine maison") == ["Villa avec piscine"]
+    assert search(client, "montagne piscine") == []
+    assert client.get("/api/v1/places/search?q=%20!").status_code == 400
+
+
+def test_index_follows_place_updates(client, auth_headers, search_backend):
+    ids = seed(client, auth_headers)
+
+    facade.update_place(ids["Villa avec piscine"], {"title": "Villa à la montagne"})
+    assert "Villa à la montagne" in search(client, "montagne")
+    assert search(client, "avec") == []
+
+    # Écriture annulée : l'index reste inchangé
+    with pytest.raises(ValueError):
+        with facade.unit_of_work():
+            facade.update_place(ids["Studio à Paris"], {"description": "Loft"})
+            raise ValueError("abandon")
+    assert search(client, "genevieve") == ["Studio à Paris"]
@@ -0,0 +1,81 @@
+# tests/test_places_query_count.py
+
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+
+
+def seed_places(count):
+    """
+    Crée `count` lieux, chacun avec un propriétaire, deux commodités
+    et deux avis rédigés par des auteurs différents.
+    """
+    amenities = [Amenity(name=f"Amenity {i}") for i in range(3)]
+    db.session.add_all(amenities)
+
+    for i in range(count):
+        owner = User(first_name="Owner", last_name=str(i),
+                     email=f"owner{i}@hbnb.io", password="x")
+        place = Place(title=f"Place {i}", description="Desc", price=10.0,
+                      owner=owner, amenities=amenities[:2])
+        db.session.add_all([owner, place])
+        for j in range(2):
+            author = User(first_name="Author", last_name=f"{i}-{j}",
+                          email=f"author{i}-{j}@hbnb.io", password="x")
+            db.session.add_all([author, Review(text="Great", rating=5,
+                                               author=author, place=place)])
+    db.session.commit()
+    # On repart d'une session vide : tout doit être rechargé depuis la base
+    db.session.expunge_all()
+
+
+def count_queries(client, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == 200
+    return response, len(statements)
+
+
+def test_place_list_query_count_is_constant(app, client):
+    seed_places(2)
+    response, small = count_queries(client, "/api/v1/places/?limit=100")
+    assert len(response.json["places"]) == 2
+
+    extra = 20
+    for i in range(extra):
+        owner = User(first_name="Extra", last_name=str(i),
+                     email=f"extra{i}@hbnb.io", password="x")
+        db.session.add_all([owner, Place(title=f"Extra {i}", description="D",
+                                         price=5.0, owner=owner)])
+    db.session.commit()
+    db.session.expunge_all()
+
+    response, large = count_queries(client, "/api/v1/places/?limit=100")
+    assert len(response.json["places"]) == 2 + extra
+    assert response.json["places"][0]["reviews"][0]["user"]["first_name"] == "Author"
+
+    # version (ETag), places + owner, amenities, reviews + auteurs
+    assert small == large
+    assert large <= 5
+
+
+def test_places_by_user_and_search_query_count(app, client):
+    seed_places(5)
+    owner = User.query.filter_by(email="owner3@hbnb.io").first()
+    db.session.expunge_all()
+
+    _, by_user = count_queries(client, f"/api/v1/places/user/{owner.id}")
+    _, search = count_queries(client, "/api/v1/places/search?title=Place 3")
+    assert by_user <= 4
+    assert search <= 4
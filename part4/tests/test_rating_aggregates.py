@@ -0,0 +1,99 @@
+# tests/test_rating_aggregates.py
+
+import pytest
+from sqlalchemy import text
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.services import facade
+
+
+@pytest.fixture
+def place_with_reviewers(app):
+    owner = User(first_name="Jabba", last_name="Hutt", email="jabba@tatooine.io", password="x")
+    reviewers = [User(first_name="R", last_name=str(i), email=f"r{i}@hbnb.io", password="x")
+                 for i in range(3)]
+    place = Place(title="Palace", description="D", price=100.0, owner=owner)
+    db.session.add_all([owner, place, *reviewers])
+    db.session.commit()
+    return place, reviewers
+
+
+def test_aggregates_follow_review_lifecycle(place_with_reviewers):
+    place, reviewers = place_with_reviewers
+    assert facade.get_average_rating_for_place(place.id) is None
+
+    created = [
+        facade.create_review({"text": "t", "rating": rating,
+                              "user_id": reviewer.id, "place_id": place.id})
+        for reviewer, rating in zip(reviewers, (5, 4, 4))
+    ]
+    assert place.review_count == 3
+    assert place.rating_sum == 13
+    assert facade.get_rating_distribution_for_place(place.id) == {
+        "1": 0, "2": 0, "3": 0, "4": 2, "5": 1}
+
+    # Changement de note : l'histogramme se déplace, le nombre ne change pas
+    facade.update_review(created[1]["id"], {"rating": 1})
+    assert place.review_count == 3
+    assert place.rating_distribution["1"] == 1
+    assert place.rating_distribution["4"] == 1
+    assert facade.get_average_rating_for_place(place.id) == pytest.approx(10 / 3)
+
+    facade.delete_review(created[0]["id"])
+    assert place.review_count == 2
+    assert place.rating_sum == 5
+    assert place.rating_distribution["5"] == 0
+
+
+def test_average_rating_is_usable_in_sql(place_with_reviewers):
+    place, reviewers = place_with_reviewers
+    facade.create_review({"text": "t", "rating": 2,
+                          "user_id": reviewers[0].id, "place_id": place.id})
+
+    best = Place.query.filter(Place.average_rating >= 2).order_by(Place.average_rating.desc()).all()
+    assert [p.id for p in best] == [place.id]
+
+
+def test_several_changes_before_flush_are_all_counted(app):
+    owner = User(first_name="Lando", last_name="C", email="lando@bespin.io", password="x")
+    place = Place(title="Cloud City", description="D", price=50.0, owner=owner)
+    # Lieu pas encore inséré : les agrégats sont calculés en Python
+    place.record_rating_change(added=4)
+    db.session.add_all([owner, place])
+    db.session.commit()
+
+    # Plusieurs incréments SQL en attente dans le même flush
+    with db.session.no_autoflush:
+        place.record_rating_change(added=5)
+        place.record_rating_change(added=5)
+        place.record_rating_change(added=2, removed=4)
+    db.session.commit()
+
+    assert place.review_count == 3
+    assert place.rating_sum == 12
+    assert place.rating_distribution == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 2}
+
+
+def test_review_writes_ignore_a_stale_cached_review(place_with_reviewers):
+    place, reviewers = place_with_reviewers
+    place_id = place.id
+    created = facade.create_review({"text": "t", "rating": 5,
+                                    "user_id": reviewers[0].id, "place_id": place_id})
+    facade.get_review(created["id"])   # instantané mis en cache (note 5)
+
+    # Un autre worker passe la note à 2 (avis et agrégats)
+    db.session.execute(text("UPDATE reviews SET rating = 2 WHERE id = :id"), {"id": created["id"]})
+    db.session.execute(text("UPDATE places SET rating_sum = 2, rating_count_5 = 0, "
+                            "rating_count_2 = 1 WHERE id = :id"), {"id": place_id})
+    db.session.commit()
+    db.session.expunge_all()
+
+    facade.get_review(created["id"])   # relu depuis le cache : note 5 périmée
+    facade.update_review(created["id"], {"rating": 4})
+    place = db.session.get(Place, place_id)
+    assert place.rating_sum == 4
+    assert place.rating_distribution == {"1": 0, "2": 0, "3": 0, "4": 1, "5": 0}
+
+    facade.delete_review(created["id"])
+    assert place.review_count == 0 and place.rating_sum == 0
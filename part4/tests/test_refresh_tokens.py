@@ -0,0 +1,92 @@
+# tests/test_refresh_tokens.py
+
+import time
+import pytest
+from flask_jwt_extended import decode_token
+from app.extensions import db
+from app.models.refresh_session import RefreshSession
+from app.services import facade
+from app.services.passwords import password_hasher
+
+PASSWORD = "Sup3r-Secret-Pass"
+
+
+@pytest.fixture
+def user(app):
+    return facade.create_user({"first_name": "Leia", "last_name": "Organa",
+                               "email": "leia@hbnb.io", "password": PASSWORD})
+
+
+def login(client):
+    response = client.post("/api/v1/auth/login",
+                           json={"email": "leia@hbnb.io", "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def refresh(client, refresh_token):
+    return client.post("/api/v1/auth/refresh", headers=bearer(refresh_token))
+
+
+def test_login_issues_short_access_and_refresh_tokens(client, user):
+    tokens = login(client)
+    access = decode_token(tokens["access_token"])
+    assert access["exp"] - access["iat"] == 300
+    assert decode_token(tokens["refresh_token"])["family"] == access["family"]
+
+    # Chaque jeton sur sa route uniquement
+    assert client.get("/api/v1/auth/protected",
+                      headers=bearer(tokens["refresh_token"])).status_code == 422
+    assert refresh(client, tokens["access_token"]).status_code == 422
+
+
+def test_refresh_rotates_without_password_check(client, user):
+    tokens = login(client)
+    verified = password_hasher.stats()["verified"]
+
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    assert response.json["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/api/v1/auth/protected",
+                      headers=bearer(response.json["access_token"])).status_code == 200
+    assert refresh(client, response.json["refresh_token"]).status_code == 200
+    assert password_hasher.stats()["verified"] == verified
+    assert facade.refresh_sessions.stats()["rotated"] == 2
+
+
+def test_reused_refresh_token_ends_the_session(client, user):
+    stolen = login(client)["refresh_token"]
+    current = refresh(client, stolen).json["refresh_token"]
+
+    # Ancien jeton rejoué : la session entière est fermée
+    assert refresh(client, stolen).status_code == 401
+    assert refresh(client, current).status_code == 401
+    assert RefreshSession.query.count() == 0
+    assert facade.refresh_sessions.stats()["reuse_detected"] == 1
+
+    # Une autre connexion ouvre une nouvelle session
+    assert refresh(client, login(client)["refresh_token"]).status_code == 200
+
+
+def test_refresh_follows_role_changes_and_logout(client, user):
+    tokens = login(client)
+    facade.update_user(user.id, {"is_admin": True})
+    tokens = refresh(client, tokens["refresh_token"]).json
+    assert decode_token(tokens["access_token"])["is_admin"] is True
+
+    response = client.post("/api/v1/auth/logout", headers=bearer(tokens["access_token"]))
+    assert response.status_code == 200
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_expired_sessions_are_purged(client, user):
+    db.session.add(RefreshSession(id="old", user_id=user.id, current_jti="x",
+                                  expires_at=int(time.time()) - 1))
+    db.session.commit()
+    login(client)
+    assert db.session.get(RefreshSession, "old") is None
+    assert RefreshSession.query.count() == 1
@@ -0,0 +1,59 @@
+# tests/test_sqlite_profile.py
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.review import Review
+from app.models.types import convert_key_columns
+from app.persistence.sqlite import pragma_values
+from config import TestingConfig
+
+PRAGMAS = ("journal_mode", "synchronous", "foreign_keys", "busy_timeout", "cache_size",
+           "mmap_size")
+
+
+def make_app(uri, profile):
+    class Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLITE_PROFILE = profile
+        SQLITE_PRAGMAS = {"busy_timeout": 2000}
+    return create_app(Config)
+
+
+def test_production_profile_tunes_file_databases(tmp_path):
+    app = make_app(f"sqlite:///{tmp_path / 'hbnb.db'}", "production")
+    with app.app_context():
+        with db.engine.connect() as connection:
+            values = pragma_values(connection, PRAGMAS)
+        assert values == {"journal_mode": "wal", "synchronous": 1, "foreign_keys": 1,
+                          "busy_timeout": 2000, "cache_size": -64000,
+                          "mmap_size": 256 * 1024 * 1024}
+        assert db.engine.pool.size() == 10
+
+        # Clés étrangères contrôlées, y compris après une conversion des clés
+        db.create_all()
+        assert convert_key_columns(db.engine, db.metadata, "binary") == 0
+        db.session.add(Review(text="Orphelin", rating=3, user_id="nobody", place_id="nowhere"))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+        db.session.remove()
+
+
+def test_default_profile_and_memory_databases_keep_sqlite_defaults(tmp_path):
+    app = make_app(f"sqlite:///{tmp_path / 'hbnb.db'}", None)
+    with app.app_context():
+        with db.engine.connect() as connection:
+            assert pragma_values(connection, ("journal_mode", "foreign_keys")) == {
+                "journal_mode": "delete", "foreign_keys": 0}
+
+    # Base en mémoire : PRAGMA de connexion seulement, pas de WAL ni de pool
+    app = make_app("sqlite://", "production")
+    with app.app_context():
+        with db.engine.connect() as connection:
+            assert pragma_values(connection, ("journal_mode", "foreign_keys")) == {
+                "journal_mode": "memory", "foreign_keys": 1}
+
+    with pytest.raises(ValueError):
+        make_app("sqlite://", "turbo")
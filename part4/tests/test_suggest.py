@@ -0,0 +1,54 @@
+# tests/test_suggest.py
+
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+
+
+def seed():
+    owner = User(first_name="Finn", last_name="FN-2187", email="finn@hbnb.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+    common = {"description": "D", "price": 20.0, "latitude": 48.8, "longitude": 2.3,
+              "owner_id": owner.id}
+    studio = facade.create_place({"title": "Studio à Paris", **common})
+    facade.create_place({"title": "Parc des Buttes", **common})
+    facade.create_place({"title": "Chalet", **common})
+    facade.create_amenity({"name": "Parking"})
+    return studio.id
+
+
+def labels(client, query):
+    response = client.get(f"/api/v1/suggest?{query}")
+    assert response.status_code == 200
+    return [s["label"] for s in response.json["suggestions"]]
+
+
+def test_suggests_titles_and_amenities_by_word_prefix(app, client):
+    seed()
+
+    # Ordre alphabétique du mot qui correspond : parc, paris, parking
+    assert labels(client, "prefix=PAR") == ["Parc des Buttes", "Studio à Paris", "Parking"]
+    assert labels(client, "prefix=par&limit=2") == ["Parc des Buttes", "Studio à Paris"]
+    assert labels(client, "prefix=par&type=amenity") == ["Parking"]
+    assert labels(client, "prefix=a%20pa") == ["Studio à Paris"]
+
+    assert client.get("/api/v1/suggest?prefix=").status_code == 400
+    assert client.get("/api/v1/suggest?prefix=a&limit=500").status_code == 400
+
+
+def test_index_follows_updates_without_sql(app, client):
+    studio_id = seed()
+    labels(client, "prefix=x")  # construction de l'index
+
+    facade.update_place(studio_id, {"title": "Loft à Lyon"})
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        assert labels(client, "prefix=l") == ["Loft à Lyon"]
+        assert labels(client, "prefix=paris") == []
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert statements == []
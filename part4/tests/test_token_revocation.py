@@ -0,0 +1,105 @@
+# tests/test_token_revocation.py
+
+import time
+import uuid
+import pytest
+from sqlalchemy import event
+from flask_jwt_extended import decode_token
+from app.extensions import db
+from app.models.user import User
+from app.models.revoked_token import RevokedToken
+from app.persistence.bloom import BloomFilter
+from app.services import facade
+
+
+@pytest.fixture
+def users(app):
+    admin = User(first_name="Admin", last_name="HBnB", email="admin@hbnb.io",
+                 password="x", is_admin=True)
+    guest = User(first_name="Rey", last_name="Skywalker", email="rey@jakku.io", password="x")
+    db.session.add_all([admin, guest])
+    db.session.commit()
+    return admin, guest
+
+
+def protected(client, headers):
+    return client.get("/api/v1/auth/protected", headers=headers).status_code
+
+
+def test_logout_revokes_only_the_current_token(client, users, auth_headers):
+    admin, guest = users
+    first, second = auth_headers(guest), auth_headers(guest)
+
+    assert client.post("/api/v1/auth/logout", headers=first).status_code == 200
+    assert protected(client, first) == 401
+    assert client.delete("/api/v1/reviews/x", headers=first).status_code == 401
+    assert protected(client, second) == 200
+    # Déconnexion répétée : le jeton est déjà refusé
+    assert client.post("/api/v1/auth/logout", headers=first).status_code == 401
+
+
+def test_admin_revokes_any_token(client, users, auth_headers):
+    admin, guest = users
+    guest_headers = auth_headers(guest)
+    token = guest_headers["Authorization"].split()[1]
+
+    assert client.post("/api/v1/auth/revoke", json={"token": token},
+                       headers=guest_headers).status_code == 403
+    assert client.post("/api/v1/auth/revoke", json={"token": "not.a.jwt"},
+                       headers=auth_headers(admin)).status_code == 400
+    response = client.post("/api/v1/auth/revoke", json={"token": token},
+                           headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert protected(client, guest_headers) == 401
+
+
+def test_valid_tokens_are_checked_without_sql(client, users, auth_headers):
+    admin, guest = users
+    client.post("/api/v1/auth/logout", headers=auth_headers(admin))
+    headers = auth_headers(guest)
+    assert protected(client, headers) == 200
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        assert protected(client, headers) == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert statements == []
+    stats = facade.revoked_tokens.stats()
+    assert stats["filter"]["count"] == 1 and stats["filter_hits"] == 0
+
+
+def test_other_process_revocations_and_expiry(client, users, auth_headers):
+    admin, guest = users
+    headers = auth_headers(guest)
+    assert protected(client, headers) == 200
+
+    # Révocation écrite par un autre processus : visible à la synchronisation
+    claims = decode_token(headers["Authorization"].split()[1])
+    db.session.add(RevokedToken(jti=claims["jti"], user_id=guest.id,
+                                expires_at=claims["exp"], revoked_at=time.time()))
+    db.session.commit()
+    assert protected(client, headers) == 200
+    facade.revoked_tokens._next_sync = 0
+    assert protected(client, headers) == 401
+
+    # Révocation expirée : purgée à la révocation suivante
+    db.session.add(RevokedToken(jti="expired", expires_at=int(time.time()) - 1,
+                                revoked_at=time.time() - 60))
+    db.session.commit()
+    facade.revoke_token(str(uuid.uuid4()), time.time() + 60)
+    assert db.session.get(RevokedToken, "expired") is None
+    assert RevokedToken.query.count() == 2
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    keys = [str(uuid.uuid4()) for _ in range(5000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    others = sum(str(uuid.uuid4()) in bloom for _ in range(20000))
+    assert others / 20000 < 0.03
+    assert bloom.stats()["bytes"] < 6500
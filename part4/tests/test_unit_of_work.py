@@ -0,0 +1,72 @@
+# tests/test_unit_of_work.py
+
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.services import facade
+
+
+@pytest.fixture
+def commits(app):
+    """Liste qui reçoit une entrée à chaque COMMIT de la session."""
+    seen = []
+
+    def on_commit(session):
+        if not session.in_nested_transaction():   # RELEASE SAVEPOINT exclu
+            seen.append(session)
+
+    event.listen(db.session, "after_commit", on_commit)
+    yield seen
+    event.remove(db.session, "after_commit", on_commit)
+
+
+def test_single_call_still_commits_immediately(commits):
+    facade.create_amenity({"name": "WiFi"})
+    assert len(commits) == 1
+
+
+def test_unit_of_work_issues_one_commit(commits):
+    with facade.unit_of_work():
+        for name in ("WiFi", "Pool", "Sauna"):
+            facade.create_amenity({"name": name})
+        assert commits == []
+
+    assert len(commits) == 1
+    assert Amenity.query.count() == 3
+
+
+def test_nested_units_commit_once_at_outermost_exit(commits):
+    with facade.unit_of_work():
+        with facade.unit_of_work():
+            facade.create_amenity({"name": "WiFi"})
+        assert commits == []
+    assert len(commits) == 1
+
+
+def test_exception_rolls_back_the_whole_unit(commits):
+    with pytest.raises(RuntimeError):
+        with facade.unit_of_work():
+            facade.create_amenity({"name": "WiFi"})
+            raise RuntimeError("boom")
+
+    assert commits == []
+    assert Amenity.query.count() == 0
+
+
+def test_caught_failure_in_nested_unit_is_rolled_back(commits):
+    owner = User(first_name="Lando", last_name="Calrissian", email="lando@bespin.io", password="x")
+    db.session.add(owner)
+    db.session.commit()
+    place = facade.create_place({"title": "Cloud City", "description": "D",
+                                 "price": 50.0, "owner_id": owner.id})
+
+    with facade.unit_of_work():
+        facade.create_amenity({"name": "WiFi"})
+        with pytest.raises(ValueError):
+            facade.update_place(place.id, {"title": "Changed", "price": -5})
+
+    db.session.expire_all()
+    assert facade.get_place(place.id).title == "Cloud City"
+    assert Amenity.query.count() == 1
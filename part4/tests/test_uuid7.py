@@ -0,0 +1,35 @@
+# tests/test_uuid7.py
+
+import time
+import uuid
+from app.extensions import db
+from app.models.base import generate_id
+from app.models.user import User
+
+
+def test_generated_ids_are_time_ordered_uuid7():
+    before_ms = time.time_ns() // 1_000_000
+    ids = [generate_id() for _ in range(5000)]
+    after_ms = time.time_ns() // 1_000_000
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    for value in (ids[0], ids[-1]):
+        parsed = uuid.UUID(value)
+        assert parsed.version == 7 and parsed.variant == uuid.RFC_4122
+        # Horodatage (48 premiers bits), avancé d'au plus quelques ms par le compteur
+        assert before_ms <= parsed.int >> 80 <= after_ms + 5
+
+
+def test_existing_uuid4_ids_remain_valid(app, client):
+    legacy_id = str(uuid.uuid4())
+    user = User(first_name="Rey", last_name="Skywalker", email="rey@hbnb.io", password="x")
+    user.id = legacy_id
+    db.session.add(user)
+    db.session.commit()
+    recent = User(first_name="Ben", last_name="Solo", email="ben@hbnb.io", password="x")
+    db.session.add(recent)
+    db.session.commit()
+
+    assert uuid.UUID(recent.id).version == 7
+    assert client.get(f"/api/v1/users/{legacy_id}").json["email"] == "rey@hbnb.io"